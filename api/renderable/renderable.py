@@ -26,6 +26,11 @@ When the _render function is called, the template input data produced by
 _render_data is passed to the corresponding template (in the above example,
 this is ``tmpl.html``) and dumped to the given location (``foo/index.html``).
 
+If a schedule callback has been set (the app sets one for each renderable
+task), the _render function instead passes its arguments to the callback, and
+the templates are rendered later by calling _render_internal directly. This
+allows repeated render requests to be coalesced into a single render.
+
 For golden tests, the rendered templates are dumped to a specified location
 within the ``filefairy`` (current) repository.
 """
@@ -60,6 +65,7 @@ class Renderable():
         super(Renderable, self).__init__(**kwargs)
 
         self.environment = e
+        self.schedule = None
 
     @abstractstatic
     def _href():
@@ -73,6 +79,13 @@ class Renderable():
         return []
 
     def _render(self, **kwargs):
+        if self.schedule is not None:
+            self.schedule(**kwargs)
+            return Response()
+
+        return self._render_internal(**kwargs)
+
+    def _render_internal(self, **kwargs):
         date = timestamp(kwargs['date'])
         test = kwargs.get('test')
         log = kwargs.get('log', True)
@@ -83,25 +96,8 @@ class Renderable():
 
         for html, subtitle, tmpl, context in data:
             try:
-                current = self._href() if test else self._get_current(html)
-                m = None if current == '/fairylab/' else menu(current)
-
-                subtitle = ' » ' + subtitle if subtitle else ''
-                title = self._title() + subtitle
-
-                styles = get_styles(context)
-                tmpl = self.environment.get_template(tmpl)
-                ts = tmpl.stream(
-                    dict(context,
-                         menu=m,
-                         styles=styles,
-                         title=title,
-                         date=date))
-
-                root = FILEFAIRY_DIR if test else FAIRYLAB_DIR
-                path = os.path.join(root, html)
-                self._mkdirs(path.rsplit('/', 1)[0])
-                ts.dump(path)
+                self._render_page(self.environment, html, subtitle, tmpl,
+                                  context, date, test)
             except Exception:
                 if log:
                     _logger.log(logging.WARNING,
@@ -110,6 +106,38 @@ class Renderable():
 
         return Response()
 
+    @classmethod
+    def _render_page(cls, e, html, subtitle, tmpl, context, date, test):
+        """Renders a single template and dumps it to the given location.
+
+        This does not depend on instance state, so that pages can also be
+        rendered by worker processes which do not have a task instance.
+
+        Args:
+            e: The jinja2 Environment.
+            html: The location of the rendered template.
+            subtitle: The page subtitle.
+            tmpl: The template name.
+            context: The template input data.
+            date: The display timestamp.
+            test: Whether to dump the template for a golden test.
+        """
+        current = cls._href() if test else cls._get_current(html)
+        m = None if current == '/fairylab/' else menu(current)
+
+        subtitle = ' » ' + subtitle if subtitle else ''
+        title = cls._title() + subtitle
+
+        styles = get_styles(context)
+        tmpl = e.get_template(tmpl)
+        ts = tmpl.stream(
+            dict(context, menu=m, styles=styles, title=title, date=date))
+
+        root = FILEFAIRY_DIR if test else FAIRYLAB_DIR
+        path = os.path.join(root, html)
+        cls._mkdirs(path.rsplit('/', 1)[0])
+        ts.dump(path)
+
     @staticmethod
     def _get_current(html):
         if html.endswith('index.html'):
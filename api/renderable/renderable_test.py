@@ -223,6 +223,20 @@ class RenderableTest(unittest.TestCase):
         stream_.assert_has_calls(STREAM_CALLS)
         self.log_.assert_has_calls(log_calls)
 
+    @mock.patch.object(FakeRenderable, '_render_internal')
+    def test_render__scheduled(self, _render_internal_):
+        schedule_ = mock.Mock()
+
+        renderable = self.create_renderable(jinja2.Environment(loader=LDR))
+        renderable.schedule = schedule_
+        actual = renderable._render(date=THEN)
+        expected = Response()
+        self.assertEqual(actual, expected)
+
+        schedule_.assert_called_once_with(date=THEN)
+        _render_internal_.assert_not_called()
+        self.log_.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
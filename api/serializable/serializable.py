@@ -5,18 +5,40 @@
 This base class configures a JSON data file for the task, and exposes functions
 for performing read and write operations on the file, as well as archiving the
 file data.
+
+Writes are written behind. The _write function marks the data dirty, and the
+file is only rewritten once the task's write interval (zero by default) has
+passed since it was last written. Any remaining dirty data is written by the
+_flush function, which the app calls periodically, before notifying other tasks
+or reloading the task, and at shutdown. Tasks with large data files can also
+opt into a compact (non-indented) encoding.
+
+The data is written under the lock, which is reentrant so that _write can be
+called while it is held. A task whose data is changed from more than one
+thread (e.g. from a background thread, while the app flushes from the main
+thread) makes those changes under the lock too, so that a flush never encodes
+data in the middle of a change.
+
+The _read function always loads the file. Other tasks read the data through
+common.io_, which the app points at this task's _snapshot function once it is
+installed. A snapshot is a deep copy of the data taken under the lock, which is
+shared by readers until the data is next written.
 """
 
 import abc
+import copy
 import os
 import re
 import sys
+import threading
+import time
 
 _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(re.sub(r'/api/serializable', '', _path))
 
-from common.io_.io_ import read_data  # noqa
+from common.io_.io_ import load_data  # noqa
 from common.io_.io_ import write_data  # noqa
+from types_.response.response import Response  # noqa
 
 DATA_DIR = re.sub(r'/api/serializable', '', _path) + '/resources/data'
 
@@ -28,12 +50,47 @@ class Serializable():
         super(Serializable, self).__init__(**kwargs)
 
         self.data = self._read()
+        self.dirty = False
+        self.flushed = 0
+        self.lock = threading.RLock()
+        self.revision = 0
+        self.snapshot = None
+
+    def _compact(self):
+        return False
 
     def _data_name(self):
         return self.__class__.__name__.lower()
 
+    def _write_interval(self):
+        return 0
+
+    def _flush(self, *args, **kwargs):
+        force = kwargs.get('force', False)
+        with self.lock:
+            if not self.dirty:
+                return Response()
+
+            if force or time.time() - self.flushed >= self._write_interval():
+                write_data(self._data_name(),
+                           self.data,
+                           compact=self._compact())
+                self.dirty = False
+                self.flushed = time.time()
+
+        return Response()
+
+    def _snapshot(self):
+        with self.lock:
+            if self.snapshot is None or self.snapshot[0] != self.revision:
+                self.snapshot = (self.revision, copy.deepcopy(self.data))
+            return self.snapshot[1]
+
     def _read(self, *args, **kwargs):
-        return read_data(self._data_name())
+        return load_data(self._data_name())
 
     def _write(self, *args, **kwargs):
-        write_data(self._data_name(), self.data)
+        with self.lock:
+            self.dirty = True
+            self.revision += 1
+        self._flush()
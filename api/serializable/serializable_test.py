@@ -5,6 +5,7 @@
 import os
 import re
 import sys
+import threading
 import unittest
 import unittest.mock as mock
 
@@ -23,12 +24,30 @@ class FakeSerializable(Serializable):
         super(FakeSerializable, self).__init__(**kwargs)
 
 
+class FakeWriteBehind(FakeSerializable):
+    def __init__(self, **kwargs):
+        super(FakeWriteBehind, self).__init__(**kwargs)
+
+    def _compact(self):
+        return True
+
+    def _data_name(self):
+        return 'fakeserializable'
+
+    def _write_interval(self):
+        return 60
+
+
 class SerializableTest(unittest.TestCase):
     def setUp(self):
         patch_open = mock.patch('common.io_.io_.open', create=True)
         self.addCleanup(patch_open.stop)
         self.mock_open = patch_open.start()
 
+        patch_replace = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(patch_replace.stop)
+        self.mock_replace = patch_replace.start()
+
     def init_mocks(self, data):
         mo = mock.mock_open(read_data=dumps(data))
         self.mock_handle = mo()
@@ -38,9 +57,9 @@ class SerializableTest(unittest.TestCase):
         self.mock_open.reset_mock()
         self.mock_handle.write.reset_mock()
 
-    def create_serializable(self, data):
+    def create_serializable(self, data, clazz=FakeSerializable):
         self.init_mocks(data)
-        serializable = FakeSerializable()
+        serializable = clazz()
 
         self.assertEqual(serializable.data, data)
         self.mock_open.assert_called_once_with(_DATA, 'r')
@@ -65,6 +84,22 @@ class SerializableTest(unittest.TestCase):
         self.mock_open.assert_called_once_with(_DATA, 'r')
         self.mock_handle.write.assert_not_called()
 
+    def test_snapshot(self):
+        old = {'a': 1, 'b': [True]}
+        serializable = self.create_serializable(old)
+
+        snapshot = serializable._snapshot()
+        self.assertEqual(snapshot, old)
+        self.assertIsNot(snapshot['b'], serializable.data['b'])
+        self.assertIs(serializable._snapshot(), snapshot)
+
+        serializable.data['b'].append(False)
+        self.assertEqual(serializable._snapshot(), {'a': 1, 'b': [True]})
+
+        serializable._write()
+        new = {'a': 1, 'b': [True, False]}
+        self.assertEqual(serializable._snapshot(), new)
+
     def test_write(self):
         old = {'a': 1, 'b': True}
         serializable = self.create_serializable(old)
@@ -73,10 +108,89 @@ class SerializableTest(unittest.TestCase):
         serializable.data['b'] = False
 
         serializable._write()
+        self.assertFalse(serializable.dirty)
 
         new = {'a': 2, 'b': False}
-        self.mock_open.assert_called_once_with(_DATA, 'w')
+        self.mock_open.assert_called_once_with(_DATA + '.tmp', 'w')
         self.mock_handle.write.assert_called_once_with(dumps(new) + '\n')
+        self.mock_replace.assert_called_once_with(_DATA + '.tmp', _DATA)
+
+    def test_write__locked(self):
+        old = {'a': 1, 'b': True}
+        serializable = self.create_serializable(old)
+
+        def _change():
+            with serializable.lock:
+                serializable.data['a'] = 2
+                serializable._write()
+
+        thread_ = threading.Thread(target=_change)
+        thread_.start()
+        thread_.join(timeout=5)
+        self.assertFalse(thread_.is_alive())
+
+        new = {'a': 2, 'b': True}
+        self.mock_handle.write.assert_called_once_with(dumps(new) + '\n')
+
+    @mock.patch('api.serializable.serializable.time.time')
+    def test_write__behind(self, time_):
+        time_.return_value = 1000
+
+        old = {'a': 1, 'b': True}
+        serializable = self.create_serializable(old, clazz=FakeWriteBehind)
+
+        serializable.data['a'] = 2
+        serializable._write()
+        self.assertEqual(serializable.flushed, 1000)
+
+        serializable.data['b'] = False
+        serializable._write()
+        self.assertTrue(serializable.dirty)
+
+        new = {'a': 2, 'b': True}
+        self.mock_open.assert_called_once_with(_DATA + '.tmp', 'w')
+        self.mock_handle.write.assert_called_once_with(
+            dumps(new, compact=True) + '\n')
+
+        self.reset_mocks()
+        self.init_mocks(old)
+
+        time_.return_value = 1059
+        serializable._flush()
+        self.assertTrue(serializable.dirty)
+        self.mock_open.assert_not_called()
+
+        time_.return_value = 1060
+        serializable._flush()
+        self.assertFalse(serializable.dirty)
+
+        new = {'a': 2, 'b': False}
+        self.mock_open.assert_called_once_with(_DATA + '.tmp', 'w')
+        self.mock_handle.write.assert_called_once_with(
+            dumps(new, compact=True) + '\n')
+
+    @mock.patch('api.serializable.serializable.time.time')
+    def test_flush__force(self, time_):
+        time_.return_value = 1000
+
+        old = {'a': 1, 'b': True}
+        serializable = self.create_serializable(old, clazz=FakeWriteBehind)
+        serializable.flushed = 1000
+
+        serializable._flush(force=True)
+        self.mock_open.assert_not_called()
+
+        serializable.data['a'] = 2
+        serializable._write()
+        self.mock_open.assert_not_called()
+
+        serializable._flush(force=True)
+        self.assertFalse(serializable.dirty)
+
+        new = {'a': 2, 'b': True}
+        self.mock_open.assert_called_once_with(_DATA + '.tmp', 'w')
+        self.mock_handle.write.assert_called_once_with(
+            dumps(new, compact=True) + '\n')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Common (non-reloadable) util methods for the persistent game index.
+
+The index holds the summary fields of every parsed game (everything needed for
+line scores and standings, but not the events or box score lines), keyed by
+game number. Each entry also records the modification time and size of the
+game file it was read from. An entry whose game file has since changed is
+re-read from the game file, so the index never needs to be explicitly cleared.
+
+The index is written to the git-ignored cache directory, and is rewritten under
+a lock on the games directory, since games are parsed by concurrent processes.
+"""
+
+import fcntl
+import json
+import os
+import re
+import sys
+
+_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(re.sub(r'/common/games', '', _path))
+
+from common.json_.json_ import loads  # noqa
+
+GAMES_DIR = re.sub(r'/common/games', '/resources/games', _path)
+CACHE_DIR = re.sub(r'/common/games', '/resources/cache', _path)
+GAMES_INDEX = os.path.join(CACHE_DIR, 'games.index')
+
+INDEX_KEYS = ['ballpark', 'date', 'num', 'recap']
+INDEX_KEYS += [
+    p + '_pitcher' for p in ['away', 'home', 'losing', 'saving', 'winning']
+]
+INDEX_KEYS += [
+    t + s for t in ['away', 'home'] for s in
+    ['_errors', '_hits', '_homeruns', '_line', '_record', '_runs', '_team']
+]
+
+_cache = {'stat': None, 'index': {}}
+
+
+class _Lock(object):
+    def __enter__(self):
+        self.fd = os.open(GAMES_DIR, os.O_RDONLY)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *args):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+
+
+def _entry(data, stat):
+    entry = {k: data.get(k) for k in INDEX_KEYS}
+    entry.update({
+        'events': bool(data.get('events')),
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+    })
+    return entry
+
+
+def _fresh(entry, stat):
+    if not entry:
+        return False
+    return entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size
+
+
+def _game_path(num):
+    return os.path.join(GAMES_DIR, num + '.json')
+
+
+def _read_index():
+    try:
+        stat = os.stat(GAMES_INDEX)
+    except OSError:
+        return {}
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _cache['stat'] != key:
+        _cache['index'] = loads(GAMES_INDEX)
+        _cache['stat'] = key
+    return _cache['index']
+
+
+def _write_index(entries):
+    with _Lock():
+        index = dict(_read_index())
+        index.update(entries)
+
+        os.makedirs(os.path.dirname(GAMES_INDEX), exist_ok=True)
+        tmp = GAMES_INDEX + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(json.dumps(index, sort_keys=True) + '\n')
+        os.replace(tmp, GAMES_INDEX)
+
+        stat = os.stat(GAMES_INDEX)
+        _cache['index'] = index
+        _cache['stat'] = (stat.st_mtime_ns, stat.st_size)
+
+
+def get_games(nums=None):
+    """Gets the index entries for the given game numbers.
+
+    Entries which are missing from the index, or whose game file has changed
+    since it was indexed, are read from the game file and then written back.
+
+    Args:
+        nums: The list of game numbers. Defaults to every parsed game.
+
+    Returns:
+        A mapping of game numbers to index entries.
+    """
+    if nums is None:
+        nums = [
+            name[:-5] for name in sorted(os.listdir(GAMES_DIR))
+            if name.endswith('.json')
+        ]
+
+    index = _read_index()
+
+    games, stale = {}, {}
+    for num in nums:
+        try:
+            stat = os.stat(_game_path(num))
+        except OSError:
+            continue
+
+        entry = index.get(num)
+        if _fresh(entry, stat):
+            games[num] = entry
+            continue
+
+        data = loads(_game_path(num))
+        if not data:
+            continue
+
+        games[num] = stale[num] = _entry(data, stat)
+
+    if stale:
+        _write_index(stale)
+
+    return games
+
+
+def put_game(data):
+    """Indexes a game which was just written to the games directory.
+
+    Args:
+        data: The parsed game data.
+    """
+    stat = os.stat(_game_path(data['num']))
+    _write_index({data['num']: _entry(data, stat)})
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for games.py."""
+
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+import unittest.mock as mock
+
+_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(re.sub(r'/common/games', '', _path))
+
+from common.games import games  # noqa
+from common.games.games import get_games  # noqa
+from common.games.games import put_game  # noqa
+from common.test.test import get_testdata  # noqa
+
+TESTDATA = get_testdata()
+TESTDATA_DIR = re.sub(r'/common/games', '/common/test/testdata', _path)
+
+
+def _entry(num):
+    data = json.loads(TESTDATA[num + '.json'])
+    entry = {k: data.get(k) for k in games.INDEX_KEYS}
+    entry['events'] = bool(data['events'])
+    return entry
+
+
+def _strip(entries):
+    return {
+        num: {k: v
+              for k, v in entry.items() if k not in ['mtime', 'size']}
+        for num, entry in entries.items()
+    }
+
+
+class GamesTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+
+        self.games_dir = tmpdir.name
+        self.games_index = os.path.join(tmpdir.name, 'cache', 'games.index')
+        for name, value in [('GAMES_DIR', self.games_dir),
+                            ('GAMES_INDEX', self.games_index),
+                            ('_cache', {'stat': None, 'index': {}})]:
+            patch = mock.patch.object(games, name, value)
+            self.addCleanup(patch.stop)
+            patch.start()
+
+        for num in ['2449', '2469']:
+            shutil.copy(os.path.join(TESTDATA_DIR, num + '.json'),
+                        self.games_dir)
+
+        loads_patch = mock.patch.object(games, 'loads', wraps=games.loads)
+        self.addCleanup(loads_patch.stop)
+        self.loads_ = loads_patch.start()
+
+    def expected(self, nums):
+        return {n: _entry(n) for n in nums}
+
+    def path(self, num):
+        return os.path.join(self.games_dir, num + '.json')
+
+    def test_get_games__indexed(self):
+        get_games()
+        self.loads_.reset_mock()
+
+        actual = get_games(['2449', '2469'])
+        self.assertEqual(_strip(actual), self.expected(['2449', '2469']))
+
+        self.loads_.assert_not_called()
+
+    def test_get_games__missing(self):
+        actual = get_games(['2449', '2476'])
+        self.assertEqual(_strip(actual), self.expected(['2449']))
+
+    def test_get_games__modified(self):
+        get_games()
+        self.loads_.reset_mock()
+
+        stat = os.stat(self.path('2449'))
+        os.utime(self.path('2449'), ns=(stat.st_atime_ns,
+                                        stat.st_mtime_ns + 1000))
+
+        actual = get_games()
+        self.assertEqual(_strip(actual), self.expected(['2449', '2469']))
+
+        self.loads_.assert_called_once_with(self.path('2449'))
+
+    def test_get_games__nums_none(self):
+        with open(os.path.join(self.games_dir, '2449.checkpoint'), 'w') as f:
+            f.write('{}\n')
+
+        actual = get_games()
+        self.assertEqual(_strip(actual), self.expected(['2449', '2469']))
+
+        with open(self.games_index) as f:
+            index = json.loads(f.read())
+        self.assertEqual(_strip(index), self.expected(['2449', '2469']))
+
+    def test_put_game(self):
+        data = json.loads(TESTDATA['2449.json'])
+        data['events'] = ['change_batter P24322']
+        put_game(data)
+
+        actual = get_games(['2449'])
+        expected = {'2449': dict(_entry('2449'), events=True)}
+        self.assertEqual(_strip(actual), expected)
+
+        self.loads_.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
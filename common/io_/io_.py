@@ -1,6 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Common (non-reloadable) util methods for reading and writing data."""
+"""Common (non-reloadable) util methods for reading and writing data.
+
+Data files are also read by tasks other than the one which owns them (e.g. the
+standings page reads the statsplus scores). To avoid re-parsing a file on every
+such read, the app registers each task as the owner of its data, and reads are
+then served from a snapshot of the owner's data, which the owner copies under
+its lock and reuses until its data is next written. Data without a registered
+owner is parsed once and cached, until the file's modification time or size
+changes.
+"""
 
 import json
 import os
@@ -14,6 +23,39 @@ from common.json_.json_ import dumps  # noqa
 
 DATA_DIR = re.sub(r'/common/io_', '', _path) + '/resources/data'
 
+_cache = {}
+_owners = {}
+
+
+def _filename(name):
+    return os.path.join(DATA_DIR, name, 'data.json')
+
+
+def load_data(name):
+    """Loads data from a specified file, bypassing the owner and cache.
+
+    Args:
+        name: The lowercase name of the data directory to read from.
+    Returns:
+        The loaded data.
+    """
+    with open(_filename(name), 'r') as f:
+        return json.loads(f.read())
+
+
+def register_data(name, owner):
+    """Registers the in-process owner of a specified data file.
+
+    Subsequent reads of the data are served from the owner's snapshot, which
+    reflects writes that have not yet been flushed to the file.
+
+    Args:
+        name: The lowercase name of the data directory.
+        owner: The object which holds the data, and provides its snapshots.
+    """
+    _owners[name] = owner
+    _cache.pop(name, None)
+
 
 def read_data(name, key=None):
     """Reads data from a specified file.
@@ -21,24 +63,48 @@ def read_data(name, key=None):
     If the data key is provided, returns the specific corresponding value.
     Otherwise, returns all of the read data.
 
+    The returned data may be shared with other readers, so it must be treated
+    as read-only.
+
     Args:
         name: The lowercase name of the data directory to read from.
         key: The optional data key to read.
     Returns:
         The read data.
     """
-    filename = os.path.join(DATA_DIR, name, 'data.json')
-    with open(filename, 'r') as f:
-        data = json.loads(f.read())
+    if name in _owners:
+        data = _owners[name]._snapshot()
         return data if key is None else data[key]
 
+    try:
+        stat = os.stat(_filename(name))
+    except OSError:
+        stat = None
 
-def write_data(name, data):
+    if stat is None:
+        data = load_data(name)
+    else:
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if name not in _cache or _cache[name][0] != stamp:
+            _cache[name] = (stamp, load_data(name))
+        data = _cache[name][1]
+
+    return data if key is None else data[key]
+
+
+def write_data(name, data, compact=False):
     """Writes data to a specified file.
+
+    The data is written to a temporary file, which then replaces the file, so
+    that readers never see a partially written file.
+
     Args:
         name: The lowercase name of the data directory to write to.
         data: The data to write.
+        compact: Whether to write the data without indentation.
     """
-    filename = os.path.join(DATA_DIR, name, 'data.json')
-    with open(filename, 'w') as f:
-        f.write(dumps(data) + '\n')
+    filename = _filename(name)
+    tmp = filename + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write(dumps(data, compact=compact) + '\n')
+    os.replace(tmp, filename)
@@ -4,26 +4,48 @@
 
 import os
 import re
+import shutil
 import sys
+import tempfile
 import unittest
 import unittest.mock as mock
 
 _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(re.sub(r'/common/io_', '', _path))
 
+from common.io_ import io_  # noqa
+from common.io_.io_ import load_data  # noqa
 from common.io_.io_ import read_data  # noqa
+from common.io_.io_ import register_data  # noqa
 from common.io_.io_ import write_data  # noqa
 from common.json_.json_ import dumps  # noqa
 
 DATA_DIR = re.sub(r'/common/io_', '', _path) + '/resources/data'
 
 
+class FakeOwner(object):
+    def __init__(self, data):
+        self.data = data
+
+    def _snapshot(self):
+        return dict(self.data)
+
+
 class IoTest(unittest.TestCase):
     def setUp(self):
+        for name in ['_cache', '_owners']:
+            patch = mock.patch.object(io_, name, {})
+            self.addCleanup(patch.stop)
+            patch.start()
+
         open_patch = mock.patch('common.io_.io_.open', create=True)
         self.addCleanup(open_patch.stop)
         self.open_ = open_patch.start()
 
+        replace_patch = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(replace_patch.stop)
+        self.replace_ = replace_patch.start()
+
     def init_mocks(self, data):
         mo = mock.mock_open(read_data=dumps(data))
         self.open_handle_ = mo()
@@ -40,6 +62,50 @@ class IoTest(unittest.TestCase):
         self.open_.assert_called_once_with(filename, 'r')
         self.open_handle_.write.assert_not_called()
 
+    def test_load_data(self):
+        data = {'a': 1}
+        self.init_mocks(data)
+
+        register_data('foo', FakeOwner({'a': 2}))
+        actual = load_data('foo')
+        self.assertEqual(actual, data)
+
+        filename = os.path.join(DATA_DIR, 'foo', 'data.json')
+        self.open_.assert_called_once_with(filename, 'r')
+
+    def test_read_data__owner(self):
+        owner = FakeOwner({'a': 1})
+        register_data('foo', owner)
+
+        owner.data['a'] = 2
+        data = read_data('foo')
+        self.assertEqual(data, {'a': 2})
+        self.assertIsNot(data, owner.data)
+
+        self.open_.assert_not_called()
+
+    def test_read_data__cached(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        os.makedirs(os.path.join(tmpdir.name, 'foo'))
+        filename = os.path.join(tmpdir.name, 'foo', 'data.json')
+        shutil.copy(os.devnull, filename)
+
+        self.open_.side_effect = [
+            mock.mock_open(read_data=dumps({'a': 1})).return_value,
+            mock.mock_open(read_data=dumps({'a': 23})).return_value,
+        ]
+
+        with mock.patch.object(io_, 'DATA_DIR', tmpdir.name):
+            self.assertEqual(read_data('foo', 'a'), 1)
+            self.assertEqual(read_data('foo', 'a'), 1)
+            self.assertEqual(self.open_.call_count, 1)
+
+            with open(filename, 'w') as f:
+                f.write('modified')
+            self.assertEqual(read_data('foo', 'a'), 23)
+            self.assertEqual(self.open_.call_count, 2)
+
     def test_write_data(self):
         data = {'a': 1}
         self.init_mocks(data)
@@ -48,8 +114,21 @@ class IoTest(unittest.TestCase):
         write_data('foo', new)
 
         filename = os.path.join(DATA_DIR, 'foo', 'data.json')
-        self.open_.assert_called_once_with(filename, 'w')
+        self.open_.assert_called_once_with(filename + '.tmp', 'w')
         self.open_handle_.write.assert_called_once_with(dumps(new) + '\n')
+        self.replace_.assert_called_once_with(filename + '.tmp', filename)
+
+    def test_write_data__compact(self):
+        data = {'a': 1}
+        self.init_mocks(data)
+
+        new = {'a': 2, 'b': [3]}
+        write_data('foo', new, compact=True)
+
+        filename = os.path.join(DATA_DIR, 'foo', 'data.json')
+        self.open_.assert_called_once_with(filename + '.tmp', 'w')
+        self.open_handle_.write.assert_called_once_with('{"a":2,"b":[3]}\n')
+        self.replace_.assert_called_once_with(filename + '.tmp', filename)
 
 
 if __name__ == '__main__':
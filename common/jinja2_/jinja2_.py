@@ -1,25 +1,72 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Common (non-reloadable) util methods for jinja2 template rendering."""
+"""Common (non-reloadable) util methods for jinja2 template rendering.
+
+The environment is created once per process and shared by everything which
+renders templates in that process, so each template is compiled at most once
+(and again only if the template file changes). Compiled templates are also
+written to a bytecode cache directory, so that new processes (e.g. after a
+restart, or the worker processes which render live sim pages) load them from
+disk instead of compiling them again.
+"""
 
 import jinja2
 import os
 import re
 
 _path = os.path.dirname(os.path.abspath(__file__))
+_root = re.sub(r'/common/jinja2_', '', _path)
+_environment = None
 
+CACHE_DIR = os.path.join(_root, 'resources/cache/jinja2')
+TEMPLATES_DIR = os.path.join(_root, 'resources/templates')
 
-def env():
-    """Returns a jinja2 Environment for Fairylab template rendering.
 
-    Returns:
-        The jinja2 Environment.
-    """
-    root = re.sub(r'/common/jinja2_', '', _path)
-    ldr = jinja2.FileSystemLoader(root + '/resources/templates')
+def _bytecode_cache():
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+    except OSError:
+        return None
+
+    return jinja2.FileSystemBytecodeCache(CACHE_DIR)
+
+
+def _create(bytecode_cache=True):
+    ldr = jinja2.FileSystemLoader(TEMPLATES_DIR)
     ext = ['jinja2.ext.do']
+    bcc = _bytecode_cache() if bytecode_cache else None
 
     return jinja2.Environment(loader=ldr,
+                              bytecode_cache=bcc,
                               extensions=ext,
                               trim_blocks=True,
                               lstrip_blocks=True)
+
+
+def compile_templates(environment):
+    """Compiles every template ahead of time.
+
+    Args:
+        environment: The jinja2 Environment.
+
+    Returns:
+        The number of templates compiled.
+    """
+    names = environment.list_templates()
+    for name in names:
+        environment.get_template(name)
+
+    return len(names)
+
+
+def env():
+    """Returns the shared jinja2 Environment for Fairylab template rendering.
+
+    Returns:
+        The jinja2 Environment.
+    """
+    global _environment
+    if _environment is None:
+        _environment = _create()
+
+    return _environment
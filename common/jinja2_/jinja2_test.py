@@ -5,24 +5,51 @@
 import os
 import re
 import sys
+import tempfile
 import unittest
+import unittest.mock as mock
 
 _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(re.sub(r'/common/jinja2_', '', _path))
 
+from common.jinja2_ import jinja2_  # noqa
+from common.jinja2_.jinja2_ import compile_templates  # noqa
 from common.jinja2_.jinja2_ import env  # noqa
 
 
 class Jinja2Test(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+
+        self.cache_dir = os.path.join(tmpdir.name, 'jinja2')
+        for name, value in [('CACHE_DIR', self.cache_dir),
+                            ('_environment', None)]:
+            patch = mock.patch.object(jinja2_, name, value)
+            self.addCleanup(patch.stop)
+            patch.start()
+
+    def test_compile_templates(self):
+        environment = env()
+
+        root = re.sub(r'/common/jinja2_', '', _path)
+        templates = os.listdir(os.path.join(root, 'resources/templates'))
+        actual = compile_templates(environment)
+        self.assertEqual(actual, len(templates))
+        self.assertEqual(len(os.listdir(self.cache_dir)), len(templates))
+
     def test_env(self):
         environment = env()
 
         root = re.sub(r'/common/jinja2_', '', _path)
         templates = os.path.join(root, 'resources/templates')
         self.assertEqual(environment.loader.searchpath, [templates])
+        self.assertEqual(environment.bytecode_cache.directory, self.cache_dir)
         self.assertEqual(environment.trim_blocks, True)
         self.assertEqual(environment.lstrip_blocks, True)
 
+        self.assertIs(env(), environment)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -18,17 +18,23 @@ class Encoder(json.JSONEncoder):
             return ''
 
 
-def dumps(data):
+def dumps(data, compact=False):
     """Convenience wrapper around json.dumps.
 
     Sorts, indents, and uses safe encoder when dumping arbitrary data.
 
     Args:
         data: Dictionary to dump as safe, pretty-printed JSON string.
+        compact: Whether to dump without indentation or whitespace instead.
 
     Returns:
         The JSON string.
     """
+    if compact:
+        return json.dumps(data,
+                          separators=(',', ':'),
+                          sort_keys=True,
+                          cls=Encoder)
     return json.dumps(data, indent=2, sort_keys=True, cls=Encoder)
 
 
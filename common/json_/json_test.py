@@ -34,6 +34,13 @@ class JsonTest(unittest.TestCase):
 
         self.mock_log.assert_not_called()
 
+    def test_dumps__with_compact(self):
+        actual = dumps({'c': 1, 'b': [False], 'a': 'foo'}, compact=True)
+        expected = '{"a":"foo","b":[false],"c":1}'
+        self.assertEqual(actual, expected)
+
+        self.mock_log.assert_not_called()
+
     def test_dumps__with_thrown_exception(self):
         actual = dumps({'a': FakeObject()})
         expected = '{\n  "a": ""\n}'
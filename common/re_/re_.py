@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Common (non-reloadable) util methods for regular expressions."""
+"""Common (non-reloadable) util methods for regular expressions.
 
+Patterns are compiled once and kept in a bounded LRU cache, so the wrappers do
+not recompile a pattern to count its groups on every call. Callers in hot loops
+can also hold a precompiled pattern at module level and pass it in directly.
+"""
+
+import functools
 import re
 
+CACHE_SIZE = 1024
+
 
 def _strip(s):
     if s is None:
@@ -11,8 +19,13 @@ def _strip(s):
     return s.strip()
 
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile(pattern):
+    return re.compile(pattern)
+
+
 def _transform(pattern, match, group):
-    groups = re.compile(pattern).groups
+    groups = pattern.groups
 
     if not match:
         return [None] * groups if groups > 1 and not group else None
@@ -27,6 +40,32 @@ def _transform(pattern, match, group):
     return [] if group else match.group()
 
 
+def cache_info():
+    """Returns the hit and miss counters of the compiled pattern cache.
+
+    Returns:
+        A functools named tuple of hits, misses, maxsize and currsize.
+    """
+    return _compile.cache_info()
+
+
+def compile(pattern):
+    """Compiles pattern, or returns the cached compilation of pattern.
+
+    The returned object can be held at module level and passed to any of the
+    other wrappers in place of the pattern string.
+
+    Args:
+        pattern: The regular expression pattern to compile.
+
+    Returns:
+        The compiled pattern.
+    """
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return _compile(pattern)
+
+
 def findall(pattern, string):
     """Convenience wrapper around re.findall which returns all matches.
 
@@ -35,14 +74,15 @@ def findall(pattern, string):
     group, or a list of strings (or None) if pattern has multiple groups.
 
     Args:
-        pattern: The regular expression pattern to match.
+        pattern: The regular expression pattern (or compiled pattern) to match.
         string: The string to scan for the pattern.
 
     Returns:
         The list of matched group(s) of pattern within string.
     """
-    groups = re.compile(pattern).groups
-    match = re.findall(pattern, string)
+    pattern = compile(pattern)
+    groups = pattern.groups
+    match = pattern.findall(string)
 
     if groups > 1:
         return [[_strip(g) for g in m] for m in match]
@@ -58,13 +98,14 @@ def match(pattern, string):
     at least one pattern group, or an empty list if pattern has no groups.
 
     Args:
-        pattern: The regular expression pattern to match.
+        pattern: The regular expression pattern (or compiled pattern) to match.
         string: The string to scan for the pattern.
 
     Returns:
         The re.match matches of pattern within string.
     """
-    return _transform(pattern, re.match(pattern, string), True)
+    pattern = compile(pattern)
+    return _transform(pattern, pattern.match(string), True)
 
 
 def search(pattern, string):
@@ -75,10 +116,11 @@ def search(pattern, string):
     single pattern group, or a list of strings if pattern has multiple groups.
 
     Args:
-        pattern: The regular expression pattern to match.
+        pattern: The regular expression pattern (or compiled pattern) to match.
         string: The string to scan for the pattern.
 
     Returns:
         The re.search matches of pattern within string.
     """
-    return _transform(pattern, re.search(pattern, string), False)
+    pattern = compile(pattern)
+    return _transform(pattern, pattern.search(string), False)
@@ -10,12 +10,36 @@ import unittest
 _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(re.sub(r'/common/re_', '', _path))
 
+from common.re_.re_ import _compile  # noqa
+from common.re_.re_ import cache_info  # noqa
+from common.re_.re_ import compile  # noqa
 from common.re_.re_ import findall  # noqa
 from common.re_.re_ import match  # noqa
 from common.re_.re_ import search  # noqa
 
 
 class ReTest(unittest.TestCase):
+    def setUp(self):
+        _compile.cache_clear()
+
+    def test_cache_info(self):
+        search(r'\d(\D)\d', '1a2b3c4d')
+        search(r'\d(\D)\d', '1a2b3c4d')
+        match(r'(\d)\D(\d)', '1a2b3c4d')
+
+        info = cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 2))
+
+    def test_compile(self):
+        pattern = compile(r'(\d)\D(\d)')
+        self.assertIs(compile(r'(\d)\D(\d)'), pattern)
+        self.assertIs(compile(pattern), pattern)
+
+        expected = [['1', '2'], ['3', '4']]
+        self.assertEqual(findall(pattern, '1a2b3c4d'), expected)
+        self.assertEqual(match(pattern, '1a2b3c4d'), ['1', '2'])
+        self.assertEqual(search(pattern, 'ab3c4d'), ['3', '4'])
+
     def test_findall__empty_multiple_group(self):
         actual = findall(r'(\d)\D(\d)', '1234abcd')
         expected = []
@@ -9,6 +9,7 @@ from functools import partial
 
 _path = os.path.dirname(os.path.abspath(__file__))
 _reference = None
+_repls = {}
 sys.path.append(re.sub(r'/tasks/news', '', _path))
 
 from common.elements.elements import anchor  # noqa
@@ -26,6 +27,12 @@ def repl(f, m):
     return f(m.group(0))
 
 
+def get_repl(f):
+    if f not in _repls:
+        _repls[f] = partial(repl, f)
+    return _repls[f]
+
+
 def substitute(repl, text):
     if _reference is None:
         return text
@@ -66,7 +73,7 @@ def player_to_link_sub(text):
     Returns:
         The substituted text.
     """
-    return substitute(partial(repl, player_to_link), text)
+    return substitute(get_repl(player_to_link), text)
 
 
 def player_to_name(e):
@@ -90,7 +97,7 @@ def player_to_name_sub(text):
     Returns:
         The substituted text.
     """
-    return substitute(partial(repl, player_to_name), text)
+    return substitute(get_repl(player_to_name), text)
 
 
 def player_to_number(e):
@@ -131,7 +138,7 @@ def player_to_shortname_sub(text):
     Returns:
         The substituted text.
     """
-    return substitute(partial(repl, player_to_shortname), text)
+    return substitute(get_repl(player_to_shortname), text)
 
 
 def player_to_starter(e):
@@ -157,7 +164,7 @@ def player_to_starter_sub(text):
     Returns:
         The substituted text.
     """
-    return substitute(partial(repl, player_to_starter), text)
+    return substitute(get_repl(player_to_starter), text)
 
 
 def player_to_team(e):
@@ -184,6 +191,18 @@ def player_to_throws(e):
     return get_attribute(e, 3, 'R')
 
 
+def get_digest():
+    if _reference is None:
+        return ''
+    return _reference.get_digest()
+
+
+def get_version():
+    if _reference is None:
+        return 0
+    return _reference.get_version()
+
+
 def put_players(players):
     if _reference is not None:
         _reference.put_players(players)
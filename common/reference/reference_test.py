@@ -13,6 +13,8 @@ sys.path.append(re.sub(r'/common/reference', '', _path))
 
 from common.datetime_.datetime_ import datetime_datetime_pst  # noqa
 from common.elements.elements import anchor  # noqa
+from common.reference.reference import get_digest  # noqa
+from common.reference.reference import get_version  # noqa
 from common.reference.reference import player_to_bats  # noqa
 from common.reference.reference import player_to_link  # noqa
 from common.reference.reference import player_to_link_sub  # noqa
@@ -122,6 +124,18 @@ class ReferenceTest(unittest.TestCase):
             actual = player_to_throws(num)
             self.assertEqual(actual, expected)
 
+    @mock.patch.object(Reference, 'get_digest')
+    def test_get_digest(self, get_digest_):
+        get_digest_.return_value = 'abc'
+        self.assertEqual(get_digest(), 'abc')
+        get_digest_.assert_called_once_with()
+
+    @mock.patch.object(Reference, 'get_version')
+    def test_get_version(self, get_version_):
+        get_version_.return_value = 3
+        self.assertEqual(get_version(), 3)
+        get_version_.assert_called_once_with()
+
     @mock.patch.object(Reference, 'put_players')
     def test_put_players(self, put_players_):
         put_players(['P123', 'P456', 'P789'])
@@ -1,17 +1,169 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import hashlib
 import logging
+import os
 import requests
+import threading
+import time
 
+_local = threading.local()
 _logger = logging.getLogger('filefairy')
 
+BACKOFF = 1
+CHUNK_SIZE = 1 << 20
 
-def get(url):
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code == requests.codes.ok:
-            return r.text
-    except Exception:
-        _logger.log(logging.WARNING, 'Handled warning.', exc_info=True)
-    return ''
+
+def _session():
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        _local.session = session
+    return session
+
+
+def _request(url, retries, **kwargs):
+    ok = [requests.codes.ok, requests.codes.not_modified]
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(BACKOFF * 2**(attempt - 1))
+        try:
+            r = _session().get(url, timeout=10, **kwargs)
+            if r.status_code in ok:
+                return r
+            if r.status_code < 500:
+                break
+        except Exception:
+            _logger.log(logging.WARNING, 'Handled warning.', exc_info=True)
+    return None
+
+
+def get(url, retries=0):
+    """Convenience wrapper around a pooled requests.Session.get.
+
+    Each thread keeps its own session, so repeated requests to the same host
+    reuse the underlying connection. Failed requests (exceptions or server
+    errors) are retried with exponential backoff.
+
+    Args:
+        url: The url to request.
+        retries: The number of times to retry a failed request.
+
+    Returns:
+        The response text if the request was successful, otherwise empty.
+    """
+    r = _request(url, retries)
+    if r is None or r.status_code != requests.codes.ok:
+        return ''
+    return r.text
+
+
+def get_conditional(url, validator=None, retries=0):
+    """Conditionally request a url, given the validator of a prior response.
+
+    The stored ETag and Last-Modified values are sent as request headers. If
+    the server does not honor them, the content hash is compared instead.
+
+    Args:
+        url: The url to request.
+        validator: The validator returned by a previous call, if any.
+        retries: The number of times to retry a failed request.
+
+    Returns:
+        A tuple of the response text and the new validator. The text is None
+        if the content is unchanged, and empty if the request failed.
+    """
+    validator = validator or {}
+
+    headers = {}
+    if validator.get('etag'):
+        headers['If-None-Match'] = validator['etag']
+    if validator.get('modified'):
+        headers['If-Modified-Since'] = validator['modified']
+
+    r = _request(url, retries, headers=headers)
+    if r is None:
+        return '', {}
+    if r.status_code == requests.codes.not_modified:
+        return None, validator
+
+    text = r.text
+    new = {'hash': hashlib.sha1(text.encode('utf-8')).hexdigest()}
+    if r.headers.get('ETag'):
+        new['etag'] = r.headers['ETag']
+    if r.headers.get('Last-Modified'):
+        new['modified'] = r.headers['Last-Modified']
+
+    if new['hash'] == validator.get('hash'):
+        return None, new
+    return text, new
+
+
+def _total(r, size):
+    if r.status_code == requests.codes.partial_content:
+        return int(r.headers['Content-Range'].rsplit('/', 1)[1])
+    if r.headers.get('Content-Length'):
+        return size + int(r.headers['Content-Length'])
+    return None
+
+
+def download(url, filename, retries=0, progress=None):
+    """Download a url to a file, resuming interrupted transfers.
+
+    The response is streamed in chunks to a temporary ``.part`` file, which is
+    renamed to the given filename once the expected number of bytes has been
+    received. Failed attempts are retried with exponential backoff, and each
+    retry resumes the partial file with an HTTP Range request.
+
+    Args:
+        url: The url to download.
+        filename: The path to write the downloaded file to.
+        retries: The number of times to retry a failed attempt.
+        progress: Optional callback, passed the bytes received so far and the
+            expected total (or None, if the server did not send a length).
+
+    Returns:
+        True if the download completed and its size was verified.
+    """
+    part = filename + '.part'
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(BACKOFF * 2**(attempt - 1))
+
+        size = os.path.getsize(part) if os.path.isfile(part) else 0
+        headers = {'Range': 'bytes={}-'.format(size)} if size else {}
+        try:
+            with _session().get(
+                    url, headers=headers, stream=True, timeout=10) as r:
+                if r.status_code == requests.codes.ok:
+                    size = 0
+                elif r.status_code == requests.codes.range_not_satisfiable:
+                    complete = '*/{}'.format(size)
+                    if r.headers.get('Content-Range', '').endswith(complete):
+                        os.replace(part, filename)
+                        return True
+                    os.remove(part)
+                    continue
+                elif r.status_code != requests.codes.partial_content:
+                    if r.status_code < 500:
+                        break
+                    continue
+
+                total = _total(r, size)
+                with open(part, 'ab' if size else 'wb') as f:
+                    for chunk in r.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        size += len(chunk)
+                        if progress:
+                            progress(size, total)
+
+            if total is None or size == total:
+                os.replace(part, filename)
+                return True
+            if size > total:
+                os.remove(part)
+        except Exception:
+            _logger.log(logging.WARNING, 'Handled warning.', exc_info=True)
+
+    return False
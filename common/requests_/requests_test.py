@@ -5,30 +5,46 @@ import logging
 import os
 import re
 import sys
+import tempfile
 import unittest
 import unittest.mock as mock
 
 _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(re.sub(r'/common/requests_', '', _path))
+from common.requests_.requests_ import download  # noqa
 from common.requests_.requests_ import get  # noqa
+from common.requests_.requests_ import get_conditional  # noqa
+
+from common.test.test import serve  # noqa
+
+HASH = '0ec6d150549780250a9772c06b619bcc46a0e560'
 
 
 class RequestsTest(unittest.TestCase):
+    def setUp(self):
+        session_patch = mock.patch('common.requests_.requests_._session')
+        self.addCleanup(session_patch.stop)
+        self.session_ = session_patch.start()
+        self.get_ = self.session_.return_value.get
+
+        sleep_patch = mock.patch('common.requests_.requests_.time.sleep')
+        self.addCleanup(sleep_patch.stop)
+        self.sleep_ = sleep_patch.start()
+
     @mock.patch('common.requests_.requests_._logger.log')
-    @mock.patch('common.requests_.requests_.requests.get')
-    def test_get__error(self, mock_get, mock_log):
-        mock_get.return_value.status_code = 403
+    def test_get__error(self, mock_log):
+        self.get_.return_value.status_code = 403
 
-        actual = get('http://url')
+        actual = get('http://url', retries=2)
         self.assertEqual(actual, '')
 
         mock_log.assert_not_called()
-        mock_get.assert_called_once_with('http://url', timeout=10)
+        self.get_.assert_called_once_with('http://url', timeout=10)
+        self.sleep_.assert_not_called()
 
     @mock.patch('common.requests_.requests_._logger.log')
-    @mock.patch('common.requests_.requests_.requests.get')
-    def test_get__exception(self, mock_get, mock_log):
-        mock_get.side_effect = Exception()
+    def test_get__exception(self, mock_log):
+        self.get_.side_effect = Exception()
 
         actual = get('http://url')
         self.assertEqual(actual, '')
@@ -36,20 +52,195 @@ class RequestsTest(unittest.TestCase):
         mock_log.assert_called_once_with(logging.WARNING,
                                          'Handled warning.',
                                          exc_info=True)
-        mock_get.assert_called_once_with('http://url', timeout=10)
+        self.get_.assert_called_once_with('http://url', timeout=10)
+        self.sleep_.assert_not_called()
 
     @mock.patch('common.requests_.requests_._logger.log')
-    @mock.patch('common.requests_.requests_.requests.get')
-    def test_get__ok(self, mock_get, mock_log):
+    def test_get__ok(self, mock_log):
         expected = 'response'
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.text = expected
+        self.get_.return_value.status_code = 200
+        self.get_.return_value.text = expected
 
         actual = get('http://url')
         self.assertEqual(actual, expected)
 
         mock_log.assert_not_called()
-        mock_get.assert_called_once_with('http://url', timeout=10)
+        self.get_.assert_called_once_with('http://url', timeout=10)
+        self.sleep_.assert_not_called()
+
+    @mock.patch('common.requests_.requests_._logger.log')
+    def test_get__retries(self, mock_log):
+        expected = 'response'
+        error = mock.Mock(status_code=503)
+        ok = mock.Mock(status_code=200, text=expected)
+        self.get_.side_effect = [Exception(), error, ok]
+
+        actual = get('http://url', retries=2)
+        self.assertEqual(actual, expected)
+
+        mock_log.assert_called_once_with(logging.WARNING,
+                                         'Handled warning.',
+                                         exc_info=True)
+        self.get_.assert_has_calls([mock.call('http://url', timeout=10)] * 3)
+        self.sleep_.assert_has_calls([mock.call(1), mock.call(2)])
+
+    def test_get_conditional__changed(self):
+        self.get_.return_value.status_code = 200
+        self.get_.return_value.text = 'response'
+        self.get_.return_value.headers = {
+            'ETag': '"abc"',
+            'Last-Modified': 'Sat, 26 Oct 1985 06:02:00 GMT'
+        }
+
+        validator = {'etag': '"xyz"', 'hash': 'def'}
+        actual = get_conditional('http://url', validator)
+        expected = ('response', {
+            'etag': '"abc"',
+            'hash': HASH,
+            'modified': 'Sat, 26 Oct 1985 06:02:00 GMT'
+        })
+        self.assertEqual(actual, expected)
+
+        headers = {'If-None-Match': '"xyz"'}
+        self.get_.assert_called_once_with(
+            'http://url', timeout=10, headers=headers)
+
+    def test_get_conditional__failed(self):
+        self.get_.return_value.status_code = 404
+
+        actual = get_conditional('http://url', None)
+        self.assertEqual(actual, ('', {}))
+
+        self.get_.assert_called_once_with(
+            'http://url', timeout=10, headers={})
+
+    def test_get_conditional__hash(self):
+        self.get_.return_value.status_code = 200
+        self.get_.return_value.text = 'response'
+        self.get_.return_value.headers = {}
+
+        validator = {'hash': HASH}
+        actual = get_conditional('http://url', validator)
+        self.assertEqual(actual, (None, validator))
+
+        self.get_.assert_called_once_with(
+            'http://url', timeout=10, headers={})
+
+    def test_get_conditional__not_modified(self):
+        self.get_.return_value.status_code = 304
+
+        validator = {'modified': 'Sat, 26 Oct 1985 06:02:00 GMT'}
+        actual = get_conditional('http://url', validator)
+        self.assertEqual(actual, (None, validator))
+
+        headers = {'If-Modified-Since': 'Sat, 26 Oct 1985 06:02:00 GMT'}
+        self.get_.assert_called_once_with(
+            'http://url', timeout=10, headers=headers)
+
+
+class DownloadTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+
+        self.src = os.path.join(tmpdir.name, 'src')
+        self.dst = os.path.join(tmpdir.name, 'dst')
+        os.mkdir(self.src)
+        os.mkdir(self.dst)
+
+        self.body = bytes(range(256)) * 64
+        with open(os.path.join(self.src, 'file.zip'), 'wb') as f:
+            f.write(self.body)
+
+        chunk_patch = mock.patch('common.requests_.requests_.CHUNK_SIZE', 1024)
+        self.addCleanup(chunk_patch.stop)
+        chunk_patch.start()
+
+        sleep_patch = mock.patch('common.requests_.requests_.time.sleep')
+        self.addCleanup(sleep_patch.stop)
+        self.sleep_ = sleep_patch.start()
+
+    def assertDownloaded(self, filename):
+        with open(filename, 'rb') as f:
+            self.assertEqual(f.read(), self.body)
+        self.assertFalse(os.path.exists(filename + '.part'))
+
+    def test_download__complete(self):
+        server = serve(self, self.src)
+        filename = os.path.join(self.dst, 'file.zip')
+        progress = mock.Mock()
+
+        url = server.url + '/file.zip'
+        actual = download(url, filename, progress=progress)
+        self.assertTrue(actual)
+
+        self.assertDownloaded(filename)
+        self.assertEqual(progress.call_count, 16)
+        progress.assert_called_with(16384, 16384)
+        self.sleep_.assert_not_called()
+
+    @mock.patch('common.requests_.requests_._logger.log')
+    def test_download__missing(self, mock_log):
+        server = serve(self, self.src)
+        filename = os.path.join(self.dst, 'missing.zip')
+
+        actual = download(server.url + '/missing.zip', filename, retries=2)
+        self.assertFalse(actual)
+
+        self.assertFalse(os.path.exists(filename))
+        mock_log.assert_not_called()
+        self.sleep_.assert_not_called()
+
+    def test_download__partial(self):
+        server = serve(self, self.src)
+        filename = os.path.join(self.dst, 'file.zip')
+        with open(filename + '.part', 'wb') as f:
+            f.write(self.body[:10000])
+        progress = mock.Mock()
+
+        url = server.url + '/file.zip'
+        actual = download(url, filename, progress=progress)
+        self.assertTrue(actual)
+
+        self.assertDownloaded(filename)
+        self.assertEqual(progress.call_args_list[0], mock.call(11024, 16384))
+        progress.assert_called_with(16384, 16384)
+
+    def test_download__partial_complete(self):
+        server = serve(self, self.src)
+        filename = os.path.join(self.dst, 'file.zip')
+        with open(filename + '.part', 'wb') as f:
+            f.write(self.body)
+
+        actual = download(server.url + '/file.zip', filename)
+        self.assertTrue(actual)
+
+        self.assertDownloaded(filename)
+
+    @mock.patch('common.requests_.requests_._logger.log')
+    def test_download__resume(self, mock_log):
+        server = serve(self, self.src, drops=2)
+        filename = os.path.join(self.dst, 'file.zip')
+
+        actual = download(server.url + '/file.zip', filename, retries=2)
+        self.assertTrue(actual)
+
+        self.assertDownloaded(filename)
+        self.assertEqual(server.drops, 0)
+        self.sleep_.assert_has_calls([mock.call(1), mock.call(2)])
+
+    @mock.patch('common.requests_.requests_._logger.log')
+    def test_download__retries_exhausted(self, mock_log):
+        server = serve(self, self.src, drops=3)
+        filename = os.path.join(self.dst, 'file.zip')
+
+        actual = download(server.url + '/file.zip', filename, retries=1)
+        self.assertFalse(actual)
+
+        self.assertFalse(os.path.exists(filename))
+        with open(filename + '.part', 'rb') as f:
+            self.assertEqual(f.read(), self.body[:12288])
+        self.sleep_.assert_called_once_with(1)
 
 
 if __name__ == '__main__':
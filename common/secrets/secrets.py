@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Common (non-reloadable) util methods for secret strings."""
+
+import re
+
+
+def filefairy():
+    return 'filefairy-token'
+
+
+def secrets_sub(s):
+    _ = {filefairy(): 'filefairy'}
+    pattern = '|'.join(list(_.keys()))
+    return re.sub(pattern, lambda m: _.get(m.group()), s)
@@ -39,6 +39,15 @@ def call_service(service, method, fargs, *args, **kwargs):
     return getattr(_services[service], method)(*fargs, *args, **kwargs)
 
 
+def has_service(service):
+    """Checks whether the specified service has been loaded.
+
+    Args:
+        service: The service name.
+    """
+    return service in _services
+
+
 def mock_service_for_test(service, method, mock):
     m = types.ModuleType(service, None)
     m.__file__ = service + '.py'
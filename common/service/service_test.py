@@ -13,6 +13,8 @@ _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(re.sub(r'/common/service', '', _path))
 
 from common.service.service import call_service  # noqa
+from common.service.service import has_service  # noqa
+from common.service.service import mock_service_for_test  # noqa
 from common.service.service import reload_services  # noqa
 
 
@@ -59,6 +61,12 @@ class ServiceTest(unittest.TestCase):
         mock_import.assert_not_called()
         mock_listdirs.assert_not_called()
 
+    def test_has_service(self):
+        self.assertFalse(has_service('b'))
+
+        mock_service_for_test('b', 'foo', mock.Mock())
+        self.assertTrue(has_service('b'))
+
 
 if __name__ == '__main__':
     unittest.main()
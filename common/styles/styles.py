@@ -1,6 +1,18 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Common (non-reloadable) util methods for team information."""
+"""Common (non-reloadable) util methods for collecting page styles.
+
+Styles are requested by ``css-style-*`` tokens in the template context. The
+context is walked once, and each string containing a token is rewritten once,
+with the tokens stripped of their ``css-style-`` prefix (or, for base styles,
+removed entirely).
+
+Since the walk rewrites the context in place, a fragment which is reused across
+renders (e.g. a cached line score table) no longer contains any tokens after
+its first render. Such fragments are wrapped with ``immutable``, and the styles
+found in them are stored on the wrapper and reused instead of walking them
+again. The styles therefore live exactly as long as the fragment itself.
+"""
 
 import os
 import re
@@ -11,8 +23,6 @@ sys.path.append(re.sub(r'/common/styles', '', _path))
 
 from common.elements.elements import media  # noqa
 from common.elements.elements import ruleset  # noqa
-from common.re_.re_ import findall  # noqa
-from common.re_.re_ import search  # noqa
 
 BASE_STYLES = {
     'badge-pitch': [
@@ -323,44 +333,48 @@ BASE_STYLES = {
 }
 
 
-def _find_base_style(pattern, context):
-    ret = False
+STYLE_PATTERN = re.compile(r'(\s?)css-style-(?:(' + '|'.join(BASE_STYLES) +
+                           r')(?=\s|"|$)(\s?)|([a-z]+)-([0-9]+)([a-z]+))?')
 
-    is_dict = isinstance(context, dict)
-    is_list = isinstance(context, list)
-    if is_dict or is_list:
-        items = context.items() if is_dict else enumerate(context)
-        for key, value in items:
-            if isinstance(value, str) and search(pattern, value):
-                context[key] = _rewrite_context(pattern, value)
-                ret = True
-            if _find_base_style(pattern, value):
-                ret = True
 
-    return ret
+class _ImmutableDict(dict):
+    __slots__ = ('found', )
 
 
-GENERATED_PATTERN = r'css-style-([a-z]+)-([0-9]+)([a-z]+)'
+class _ImmutableList(list):
+    __slots__ = ('found', )
 
 
-def _find_generated_style(found, generated, context):
+def _collect(context, names, generated):
     is_dict = isinstance(context, dict)
-    is_list = isinstance(context, list)
-    if is_dict or is_list:
-        items = context.items() if is_dict else enumerate(context)
-        for key, value in items:
-            if isinstance(value, str):
-                for attr, val, unit in findall(GENERATED_PATTERN, value):
-                    selector = '.' + attr + '-' + val + unit
-                    if selector not in found:
-                        rule = '{}: {}{}'.format(_get_attr(attr),
-                                                 _get_val(val),
-                                                 _get_unit(unit))
-                        r = ruleset(selector, [rule])
-                        found.add(selector)
-                        generated.append((attr, unit, int(val), r))
-                context[key] = re.sub(r'css-style-', '', value)
-            _find_generated_style(found, generated, value)
+    items = context.items() if is_dict else enumerate(context)
+    for key, value in items:
+        if isinstance(value, str):
+            if 'css-style-' in value:
+                context[key] = _rewrite(value, names, generated)
+        elif isinstance(value, (dict, list)):
+            _collect_fragment(value, names, generated)
+
+
+def _collect_fragment(fragment, names, generated):
+    if not isinstance(fragment, (_ImmutableDict, _ImmutableList)):
+        _collect(fragment, names, generated)
+        return
+
+    found = fragment.found
+    if found is None:
+        found = (set(), {})
+        _collect(fragment, *found)
+        fragment.found = found
+
+    names.update(found[0])
+    generated.update(found[1])
+
+
+def _generate(attr, val, unit):
+    selector = '.' + attr + '-' + val + unit
+    rule = '{}: {}{}'.format(_get_attr(attr), _get_val(val), _get_unit(unit))
+    return (attr, unit, int(val), ruleset(selector, [rule]))
 
 
 def _get_attr(attr):
@@ -388,27 +402,60 @@ def _get_val(val):
     return val
 
 
-def _rewrite_context(pattern, value):
-    value = re.sub(r'"' + pattern + r'\s?', r'"', value)
-    value = re.sub(r'^' + pattern + r'\s?', r'', value)
-    value = re.sub(r'\s?' + pattern + r'"', r'"', value)
-    value = re.sub(r'\s?' + pattern + r'$', r'', value)
-    return re.sub(pattern + r' ', r'', value)
+def _rewrite(value, names, generated):
+    def _repl(m):
+        space, name, after, attr, val, unit = m.groups()
+        if name:
+            names.add(name)
+            return space if after else ''
+
+        if attr:
+            token = attr + '-' + val + unit
+            if token not in generated:
+                generated[token] = _generate(attr, val, unit)
+            return space + token
+
+        return space
+
+    return STYLE_PATTERN.sub(_repl, value)
+
+
+def immutable(fragment):
+    """Wraps a context fragment which is reused unchanged across renders.
+
+    The styles found in the fragment the first time that it is collected are
+    stored on the wrapper, and are reused when the fragment is collected again.
+
+    Args:
+        fragment: The dict or list context fragment.
+
+    Returns:
+        A shallow copy of the fragment, which remembers its styles.
+    """
+    if isinstance(fragment, (_ImmutableDict, _ImmutableList)):
+        return fragment
+
+    if isinstance(fragment, dict):
+        wrapped = _ImmutableDict(fragment)
+    else:
+        wrapped = _ImmutableList(fragment)
+
+    wrapped.found = None
+    return wrapped
 
 
 def get_styles(context):
     extra_styles = context.pop('styles', [])
 
+    names = set()
+    generated = {}
+    _collect(context, names, generated)
+
     styles = []
     for name in BASE_STYLES:
-        pattern = r'css-style-' + name
-        if _find_base_style(pattern, context):
+        if name in names:
             styles += BASE_STYLES[name]
 
-    found = set()
-    generated = []
-    _find_generated_style(found, generated, context)
-
-    styles += [g[3] for g in sorted(generated)]
+    styles += [g[3] for g in sorted(generated.values())]
     styles += extra_styles
     return styles
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for styles.py."""
+
+import os
+import re
+import sys
+import unittest
+
+_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(re.sub(r'/common/styles', '', _path))
+
+from common.elements.elements import ruleset  # noqa
+from common.styles.styles import BASE_STYLES  # noqa
+from common.styles.styles import get_styles  # noqa
+from common.styles.styles import immutable  # noqa
+
+EXTRA = ruleset('.extra', ['color: #000000'])
+H_58PX = ruleset('.h-58px', ['height: 58px'])
+PR_075REM = ruleset('.pr-075rem', ['padding-right: .75rem'])
+W_24PX = ruleset('.w-24px', ['width: 24px'])
+W_50PCT = ruleset('.w-50pct', ['width: 50%'])
+
+
+class StylesTest(unittest.TestCase):
+    def test_get_styles(self):
+        context = {
+            'a': 'css-style-score-tag',
+            'b': ['x css-style-w-24px css-style-jersey y'],
+            'c': {
+                'd': '<div class="css-style-jersey css-style-h-58px">',
+                'e': ['css-style-pr-075rem', 'css-style-w-24px'],
+            },
+            'f': ('css-style-w-50pct', ),
+            'styles': [EXTRA],
+        }
+
+        actual = get_styles(context)
+        expected = BASE_STYLES['jersey'] + BASE_STYLES['score-tag']
+        expected += [H_58PX, PR_075REM, W_24PX, EXTRA]
+        self.assertEqual(actual, expected)
+
+        expected = {
+            'a': '',
+            'b': ['x w-24px y'],
+            'c': {
+                'd': '<div class="h-58px">',
+                'e': ['pr-075rem', 'w-24px'],
+            },
+            'f': ('css-style-w-50pct', ),
+        }
+        self.assertEqual(context, expected)
+
+    def test_get_styles__immutable(self):
+        table = immutable({'clazz': 'css-style-badge-team css-style-w-50pct'})
+
+        actual = get_styles({'tables': [table]})
+        expected = BASE_STYLES['badge-team'] + [W_50PCT]
+        self.assertEqual(actual, expected)
+        self.assertEqual(table, {'clazz': 'w-50pct'})
+
+        actual = get_styles({'tables': [table]})
+        self.assertEqual(actual, expected)
+
+    def test_get_styles__immutable_list(self):
+        rows = immutable(['css-style-score-tag', 'css-style-pr-075rem'])
+
+        actual = get_styles({'rows': rows})
+        expected = BASE_STYLES['score-tag'] + [PR_075REM]
+        self.assertEqual(actual, expected)
+        self.assertEqual(rows, ['', 'pr-075rem'])
+
+        self.assertIs(immutable(rows), rows)
+        actual = get_styles({'rows': [immutable(['x']), rows]})
+        self.assertEqual(actual, expected)
+
+    def test_get_styles__mutable(self):
+        table = {'clazz': 'css-style-badge-team css-style-w-50pct'}
+
+        actual = get_styles({'tables': [table]})
+        expected = BASE_STYLES['badge-team'] + [W_50PCT]
+        self.assertEqual(actual, expected)
+
+        actual = get_styles({'tables': [table]})
+        expected = []
+        self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,10 +3,13 @@
 """Common (non-reloadable) util methods for testing other modules."""
 
 import abc
+import functools
+import http.server
 import importlib
 import os
 import re
 import sys
+import threading
 import unittest
 import unittest.mock as mock
 
@@ -58,6 +61,75 @@ class Suite(object):
                 m.mock_handle.write.assert_called_once_with(m.write)
 
 
+class RangeHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves files with support for single ``bytes=N-`` Range requests.
+
+    While the server's ``drops`` count is positive, each response sends only
+    half of its body before closing the connection.
+    """
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().do_GET()
+
+        with open(path, 'rb') as f:
+            body = f.read()
+
+        total = len(body)
+        match = re.match(r'bytes=(\d+)-$', self.headers.get('Range', ''))
+        start = int(match.group(1)) if match else 0
+        if match and start >= total:
+            self.send_response(416)
+            self.send_header('Content-Range', 'bytes */{}'.format(total))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(206 if match else 200)
+        if match:
+            content_range = 'bytes {}-{}/{}'.format(start, total - 1, total)
+            self.send_header('Content-Range', content_range)
+        self.send_header('Content-Length', str(total - start))
+        self.end_headers()
+
+        body = body[start:]
+        if self.server.drops:
+            self.server.drops -= 1
+            body = body[:len(body) // 2]
+            self.close_connection = True
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(case, directory, handler=RangeHandler, drops=0):
+    """Serves a directory over HTTP for the duration of a test case.
+
+    Args:
+        case: The test case, which stops the server during cleanup.
+        directory: The directory to serve.
+        handler: The request handler class.
+        drops: The number of responses to cut off halfway through.
+
+    Returns:
+        The server, whose ``url`` attribute is the base url of the directory.
+    """
+    handler = functools.partial(handler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.drops = drops
+    server.url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    case.addCleanup(thread.join)
+    case.addCleanup(server.server_close)
+    case.addCleanup(server.shutdown)
+
+    return server
+
+
 class Test(unittest.TestCase):
     @abc.abstractmethod
     def init_mocks(self):
@@ -83,7 +155,7 @@ def _gen_golden(case, _cls, _pkg, _pth, _read, **kwargs):
         mock_render.return_value = [(golden, subtitle, tmpl, context)]
 
         renderable = _cls(**kwargs)
-        renderable._render(date=date, test=True)
+        renderable._render_internal(date=date, test=True)
 
     return test_golden
 
@@ -18,6 +18,13 @@ e.g. network issues hindering an HTTP requesting task.
 For error log statements, the message is displayed in a special area of the
 Fairylab page until the module which triggered the error is reloaded. Once the
 module is reloaded, any error logs attributed to it are cleared from history.
+
+Displayed logs are kept in a bounded buffer for each day, so that a burst of
+log statements cannot grow the history without limit. Once a day's buffer is
+full, each new log statement displaces the oldest one. Logging never renders
+or writes synchronously. The page render is handed to the app's render
+scheduler (when one is set), which coalesces a burst of log statements into a
+single render, and the data file is written behind on the write interval.
 """
 
 import copy
@@ -47,6 +54,8 @@ from common.elements.elements import row  # noqa
 from common.elements.elements import table  # noqa
 from common.re_.re_ import search  # noqa
 from common.secrets.secrets import secrets_sub  # noqa
+from common.service.service import call_service  # noqa
+from common.service.service import has_service  # noqa
 from common.slack.slack import chat_post_message  # noqa
 from common.slack.slack import files_upload  # noqa
 from types_.notify.notify import Notify  # noqa
@@ -55,6 +64,10 @@ from types_.response.response import Response  # noqa
 LINK = 'https://github.com/brunner/filefairy/blob/master/'
 DATA_DIR = re.sub(r'/impl/dashboard', '', _path) + '/resources/data/dashboard'
 
+LOG_CAPACITY = 1000
+STATS = [('scoreboard', 'line_score_stats', 'Line Score Cache')]
+WRITE_INTERVAL = 60
+
 
 class Dashboard(Renderable, Runnable, Serializable):
     """Logging framework for all tasks and the main app."""
@@ -62,9 +75,11 @@ class Dashboard(Renderable, Runnable, Serializable):
         """Create a Dashboard object.
 
         Attributes:
+            stats: Mapping of table titles to statistics reported by the app.
             warnings: List of handled warning logs and their count.
         """
         super(Dashboard, self).__init__(**kwargs)
+        self.stats = {}
         self.warnings = []
 
     @staticmethod
@@ -79,6 +94,9 @@ class Dashboard(Renderable, Runnable, Serializable):
         dashboard_html = self.get_dashboard_html(**kwargs)
         return [('dashboard/index.html', '', 'dashboard.html', dashboard_html)]
 
+    def _write_interval(self):
+        return WRITE_INTERVAL
+
     def _notify_internal(self, **kwargs):
         notify = kwargs['notify']
         if notify == Notify.FILEFAIRY_DAY:
@@ -86,19 +104,20 @@ class Dashboard(Renderable, Runnable, Serializable):
         return Response()
 
     def cleanup(self, **kwargs):
-        data = self.data
-        original = copy.deepcopy(data)
-
         d = kwargs['date'] - datetime.timedelta(days=3)
         rounded = datetime_datetime_pst(d.year, d.month, d.day)
 
-        for date in list(data['logs'].keys()):
-            if decode_datetime(date) <= rounded:
-                data['logs'].pop(date, None)
+        expired = []
+        with self.lock:
+            for date in sorted(self.data['logs']):
+                if decode_datetime(date) > rounded:
+                    break
+                self.data['logs'].pop(date)
+                expired.append(date)
 
         self.warnings = []
 
-        if data != original:
+        if expired:
             self._write()
             self._render(**dict(kwargs, log=False))
 
@@ -140,9 +159,11 @@ class Dashboard(Renderable, Runnable, Serializable):
         rounded = datetime_datetime_pst(d.year, d.month, d.day)
 
         date = encode_datetime(rounded)
-        if date not in self.data['logs']:
-            self.data['logs'][date] = []
-        self.data['logs'][date].append(record)
+        with self.lock:
+            logs = self.data['logs'].setdefault(date, [])
+            logs.append(record)
+            if len(logs) > LOG_CAPACITY:
+                del logs[:len(logs) - LOG_CAPACITY]
 
         self._render(date=d, log=False)
         self._write()
@@ -167,15 +188,37 @@ class Dashboard(Renderable, Runnable, Serializable):
             warning['date'] = d
             self.warnings.append(warning)
 
+    def put_stats(self, head_content, stats):
+        self.stats[head_content] = stats
+
     def get_dashboard_html(self, **kwargs):
-        ret = {'logs': []}
+        ret = {'logs': [], 'stats': []}
+
+        for service, method, head_content in STATS:
+            if not has_service(service):
+                continue
+
+            stats = call_service(service, method, ())
+            t = self.create_stats_table(head_content, stats)
+            ret['stats'].append(t)
 
-        for date in sorted(self.data['logs']):
+        for head_content in sorted(self.stats):
+            stats = self.stats[head_content]
+            t = self.create_stats_table(head_content, stats)
+            ret['stats'].append(t)
+
+        with self.lock:
+            history = {
+                date: list(logs)
+                for date, logs in self.data['logs'].items()
+            }
+
+        for date in sorted(history):
             d = decode_datetime(date)
             head_content = d.strftime('%A, %B %-d{}, %Y').format(suffix(d.day))
 
             body = []
-            logs = self.data['logs'][date]
+            logs = history[date]
             for record in sorted(logs, key=self.sort_records):
                 link = self.get_record_link(record)
                 title = self.get_record_title(record)
@@ -223,6 +266,22 @@ class Dashboard(Renderable, Runnable, Serializable):
             body=body,
             foot=foot)
 
+    @staticmethod
+    def create_stats_table(head_content, stats):
+        body = []
+        for name in sorted(stats):
+            body.append(row(cells=[
+                cell(content=name.capitalize()),
+                cell(content=str(stats[name]))
+            ]))
+
+        return table(
+            clazz='border mb-3',
+            hcols=[col(clazz='font-weight-bold text-dark', colspan='2')],
+            bcols=[col(), col(clazz='text-right css-style-w-75px')],
+            head=[row(cells=[cell(content=head_content)])],
+            body=body)
+
     @staticmethod
     def get_record_line(record):
         lineno = record['lineno']
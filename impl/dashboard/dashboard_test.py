@@ -93,6 +93,10 @@ class DashboardTest(Test):
         self.addCleanup(open_patch.stop)
         self.open_ = open_patch.start()
 
+        replace_patch = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(replace_patch.stop)
+        self.replace_ = replace_patch.start()
+
     def init_mocks(self, data):
         mo = mock.mock_open(read_data=dumps(data))
         self.open_handle_ = mo()
@@ -119,6 +123,7 @@ class DashboardTest(Test):
         data = {'logs': {}}
         dashboard = self.create_dashboard(data)
 
+        self.assertEqual(dashboard.stats, {})
         self.assertFalse(len(dashboard.warnings))
         self.assertNotCalled(self.chat_post_message_, self.files_upload_,
                              self.open_handle_.write)
@@ -182,6 +187,19 @@ class DashboardTest(Test):
         self.open_handle_.write.assert_called_once_with(dumps(new_data) + '\n')
         self.assertNotCalled(self.chat_post_message_, self.files_upload_)
 
+    @mock.patch.object(Dashboard, '_render')
+    def test_cleanup__unexpired(self, _render_):
+        new_date = encode_datetime(DATE_10260000)
+        error = create_record(PATH, 123, 'ERROR', 'foo', '...', DATE_10260602)
+
+        old_data = {'logs': {new_date: [error]}}
+        dashboard = self.create_dashboard(old_data)
+        dashboard.cleanup(date=DATE_10260602)
+
+        self.assertEqual(dashboard.data, old_data)
+        self.assertNotCalled(_render_, self.chat_post_message_,
+                             self.files_upload_, self.open_handle_.write)
+
     @mock.patch('impl.dashboard.dashboard.os.getcwd')
     @mock.patch.object(Dashboard, 'emit_warning')
     @mock.patch.object(Dashboard, 'emit_log')
@@ -302,6 +320,23 @@ class DashboardTest(Test):
         self.open_handle_.write.assert_called_once_with(dumps(new_data) + '\n')
         self.assertNotCalled(self.chat_post_message_, self.files_upload_)
 
+    @mock.patch('impl.dashboard.dashboard.LOG_CAPACITY', 2)
+    @mock.patch.object(Dashboard, '_render')
+    def test_emit_log__full(self, _render_):
+        new = encode_datetime(DATE_10260000)
+        error = create_record(PATH, 123, 'ERROR', 'foo', '...', DATE_10260602)
+        info = create_record(PATH, 456, 'INFO', 'bar', '', DATE_10260602)
+
+        old_data = {'logs': {new: [error, info]}}
+        record = create_record(PATH, 789, 'INFO', 'baz', '', DATE_10260602)
+        dashboard = self.create_dashboard(old_data)
+        dashboard.emit_log(record)
+
+        new_data = {'logs': {new: [info, record]}}
+        _render_.assert_called_once_with(date=DATE_10260602, log=False)
+        self.open_handle_.write.assert_called_once_with(dumps(new_data) + '\n')
+        self.assertNotCalled(self.chat_post_message_, self.files_upload_)
+
     @mock.patch.object(Dashboard, 'emit_alert')
     def test_emit_warning__alert(self, emit_alert_):
         data = {'logs': {}}
@@ -344,7 +379,10 @@ class DashboardTest(Test):
         self.assertNotCalled(emit_alert_, self.chat_post_message_,
                              self.open_handle_.write, self.files_upload_)
 
-    def test_get_dashboard_html(self):
+    @mock.patch('impl.dashboard.dashboard.has_service')
+    def test_get_dashboard_html(self, has_service_):
+        has_service_.return_value = False
+
         old = encode_datetime(DATE_10250000)
         new = encode_datetime(DATE_10260000)
         path = '/home/pi/filefairy/path/to/module.py'
@@ -395,11 +433,50 @@ class DashboardTest(Test):
                 ])
         ]
         actual = dashboard.get_dashboard_html(date=DATE_10260602)
-        expected = {'logs': logs}
+        expected = {'logs': logs, 'stats': []}
         self.assertEqual(actual, expected)
         self.assertNotCalled(self.chat_post_message_, self.files_upload_,
                              self.open_handle_.write)
 
+    @mock.patch('impl.dashboard.dashboard.has_service')
+    @mock.patch('impl.dashboard.dashboard.call_service')
+    def test_get_dashboard_html__stats(self, call_service_, has_service_):
+        call_service_.return_value = {'hits': 3, 'misses': 1}
+        has_service_.return_value = True
+
+        dashboard = self.create_dashboard({'logs': {}})
+        dashboard.put_stats('Gameday Renders', {'renders': 2})
+
+        stats = [
+            table(clazz='border mb-3',
+                  hcols=[col(clazz='font-weight-bold text-dark', colspan='2')],
+                  bcols=[col(), col(clazz='text-right css-style-w-75px')],
+                  head=[row(cells=[cell(content='Line Score Cache')])],
+                  body=[
+                      row(cells=[cell(content='Hits'),
+                                 cell(content='3')]),
+                      row(cells=[cell(content='Misses'),
+                                 cell(content='1')])
+                  ]),
+            table(clazz='border mb-3',
+                  hcols=[col(clazz='font-weight-bold text-dark', colspan='2')],
+                  bcols=[col(), col(clazz='text-right css-style-w-75px')],
+                  head=[row(cells=[cell(content='Gameday Renders')])],
+                  body=[
+                      row(cells=[cell(content='Renders'),
+                                 cell(content='2')])
+                  ])
+        ]
+        actual = dashboard.get_dashboard_html(date=DATE_10260602)
+        expected = {'logs': [], 'stats': stats}
+        self.assertEqual(actual, expected)
+
+        call_service_.assert_called_once_with('scoreboard',
+                                              'line_score_stats', ())
+        has_service_.assert_called_once_with('scoreboard')
+        self.assertNotCalled(self.chat_post_message_, self.files_upload_,
+                             self.open_handle_.write)
+
     def test_get_record_link(self):
         link = 'https://github.com/brunner/filefairy/blob/master/'
         path = '/home/pi/filefairy/path/to/module.py'
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import copy
+import functools
 import json
 import importlib
 import logging
@@ -19,10 +20,13 @@ sys.path.append(re.sub(r'/impl/filefairy', '', _path))
 from api.messageable.messageable import Messageable  # noqa
 from api.runnable.runnable import Runnable  # noqa
 from api.renderable.renderable import Renderable  # noqa
+from api.serializable.serializable import Serializable  # noqa
 from common.datetime_.datetime_ import datetime_now  # noqa
 from common.datetime_.datetime_ import encode_datetime  # noqa
 from common.datetime_.datetime_ import timestamp  # noqa
 from common.elements.elements import sitelinks  # noqa
+from common.io_.io_ import register_data  # noqa
+from common.jinja2_.jinja2_ import compile_templates  # noqa
 from common.jinja2_.jinja2_ import env  # noqa
 from common.messageable.messageable import messageable  # noqa
 from common.os_.os_ import listdirs  # noqa
@@ -38,6 +42,83 @@ from types_.response.response import Response  # noqa
 
 TASKS_DIR = re.sub(r'/impl/filefairy', '/tasks', _path)
 
+COMPILE_TEMPLATES = True
+
+RENDER_DEBOUNCE = 5
+RENDER_WAIT = 30
+
+
+class RenderScheduler(object):
+    """Coalesce render requests into at most one render per task per cycle.
+
+    A task is marked dirty whenever it requests a render. A dirty task becomes
+    due once it has gone a debounce window without further requests, or once
+    it has been dirty for the maximum wait, so that a long stream of requests
+    (e.g. while a sim is being parsed) still renders periodically.
+    """
+    def __init__(self, debounce, wait):
+        """Create a RenderScheduler object.
+
+        Args:
+            debounce: Seconds without requests before a dirty task is due.
+            wait: Maximum seconds that a dirty task can wait before it is due.
+
+        Attributes:
+            debounce: Seconds without requests before a dirty task is due.
+            dirty: Mapping of dirty tasks to their latest render arguments.
+            lock: Synchronize marking from the background thread.
+            stats: Mapping of tasks to their render counts and latencies.
+            wait: Maximum seconds that a dirty task can wait before it is due.
+        """
+        self.debounce = debounce
+        self.dirty = {}
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.wait = wait
+
+    def _stats(self, t):
+        if t not in self.stats:
+            self.stats[t] = {'renders': 0, 'requests': 0, 'total': 0, 'max': 0}
+        return self.stats[t]
+
+    def mark(self, t, **kwargs):
+        now = time.time()
+        with self.lock:
+            first = self.dirty.get(t, {}).get('first', now)
+            self.dirty[t] = {'first': first, 'last': now, 'kwargs': kwargs}
+            self._stats(t)['requests'] += 1
+
+    def due(self, force=False):
+        now = time.time()
+        with self.lock:
+            ts = [
+                t for t, d in sorted(self.dirty.items())
+                if force or now - d['last'] >= self.debounce
+                or now - d['first'] >= self.wait
+            ]
+            return [(t, self.dirty.pop(t)['kwargs']) for t in ts]
+
+    def record(self, t, elapsed):
+        with self.lock:
+            stats = self._stats(t)
+            stats['renders'] += 1
+            stats['total'] += elapsed
+            stats['max'] = max(stats['max'], elapsed)
+
+    def get_stats(self, t):
+        with self.lock:
+            stats = dict(self._stats(t))
+
+        renders = stats.pop('renders')
+        total = stats.pop('total')
+        average = total / renders if renders else 0
+        stats.update({
+            'average': '{:.1f}ms'.format(average * 1000),
+            'max': '{:.1f}ms'.format(stats['max'] * 1000),
+            'renders': renders,
+        })
+        return stats
+
 
 class Filefairy(Messageable, Renderable):
     """The main app implementation."""
@@ -51,6 +132,7 @@ class Filefairy(Messageable, Renderable):
             keep_running: Coordinate shutdown of the various threads.
             lock: Synchronize some thread behavior.
             original: Backup copy of date, to determine when it changes.
+            renders: Scheduler which coalesces render requests.
             runners: List of Runnable instances belonging to the app.
             sleep: Duration to wait between repetitive task calls.
             threads: List of queued Thread instances to run in the background.
@@ -67,11 +149,15 @@ class Filefairy(Messageable, Renderable):
         self.keep_running = True
         self.original = date
         self.renderables_ = []
+        self.renders = RenderScheduler(RENDER_DEBOUNCE, RENDER_WAIT)
         self.runners = {'dashboard': d, 'reference': r}
         self.sleep = 2  # TODO: change back to 60 after finishing refactors.
         self.threads = []
         self.ws = None
 
+        self.schedule = functools.partial(self.renders.mark, 'filefairy')
+        d.schedule = functools.partial(self.renders.mark, 'dashboard')
+
     @staticmethod
     def _href():
         return '/fairylab/'
@@ -90,6 +176,7 @@ class Filefairy(Messageable, Renderable):
     @messageable
     def reboot(self, *args, **kwargs):
         _logger.log(logging.DEBUG, 'Rebooting filefairy.')
+        self.try_all('_flush', force=True)
         os.execv(sys.executable, ['python3'] + sys.argv)
 
     @messageable
@@ -141,10 +228,29 @@ class Filefairy(Messageable, Renderable):
             t.daemon = True
             t.start()
 
+    def flush(self, force=False):
+        """Renders each task which is due, at most once per call.
+
+        Args:
+            force: Whether to render every dirty task, even if not yet due.
+        """
+        for t, kwargs in self.renders.due(force):
+            start = time.time()
+            if t == 'filefairy':
+                self._render_internal(**kwargs)
+            else:
+                self.try_(t, '_render_internal', **kwargs)
+            self.renders.record(t, time.time() - start)
+
+            stats = self.renders.get_stats(t)
+            self.runners['dashboard'].put_stats(t.capitalize() + ' Renders',
+                                                stats)
+
     def handle_response(self, t, response, **kwargs):
         if response.notify:
             self.date = kwargs['date']
             self.runners[t].date = kwargs['date']
+            self.try_(t, '_flush', force=True)
         for notify in response.notify:
             if notify != Notify.BASE:
                 self.try_all('_notify', **dict(kwargs, notify=notify))
@@ -160,6 +266,11 @@ class Filefairy(Messageable, Renderable):
                 runargs['e'] = self.environment
 
             self.runners[t] = runnable(**runargs)
+            if t in self.renderables_:
+                schedule = functools.partial(self.renders.mark, t)
+                self.runners[t].schedule = schedule
+            if isinstance(self.runners[t], Serializable):
+                register_data(self.runners[t]._data_name(), self.runners[t])
         except Exception:
             _logger.log(logging.ERROR, 'Disabled ' + t + '.', exc_info=True)
             return False
@@ -179,6 +290,8 @@ class Filefairy(Messageable, Renderable):
         clazz = t.capitalize()
         package = 'tasks.{}.{}'.format(t, t)
 
+        self.try_(t, '_flush', force=True)
+
         if package in sys.modules:
             sys.modules.pop(package, None)
 
@@ -207,6 +320,7 @@ class Filefairy(Messageable, Renderable):
     def run(self):
         date = datetime_now()
         self.try_all('_run', date=date)
+        self.try_all('_flush', date=date)
 
         if self.day != date.day:
             notify = Notify.FILEFAIRY_DAY
@@ -221,6 +335,8 @@ class Filefairy(Messageable, Renderable):
             #     self.try_('git', '_notify', notify=notify, date=date)
             self.original = self.date
 
+        self.flush()
+
     def setup(self, *args, **kwargs):
         self.reload_services()
 
@@ -229,6 +345,7 @@ class Filefairy(Messageable, Renderable):
 
         self.setup_all(*args, **kwargs)
         self._render(**kwargs)
+        self.flush(force=True)
 
     def setup_all(self, *args, **kwargs):
         self.try_all('_setup', **kwargs)
@@ -251,6 +368,9 @@ class Filefairy(Messageable, Renderable):
             time.sleep(self.sleep)
             count += 1
 
+        self.flush(force=True)
+        self.try_all('_flush', force=True)
+
         if self.ws:
             self.ws.close()
 
@@ -288,6 +408,8 @@ class Filefairy(Messageable, Renderable):
 def main():
     date = datetime_now()
     e = env()
+    if COMPILE_TEMPLATES:
+        compile_templates(e)
     dashboard = Dashboard(date=date, e=e)
     reference = Reference(date=date)
 
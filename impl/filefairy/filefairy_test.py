@@ -28,6 +28,7 @@ from common.test.test import Test  # noqa
 from common.test.test import main  # noqa
 from impl.dashboard.dashboard import Dashboard  # noqa
 from impl.filefairy.filefairy import Filefairy  # noqa
+from impl.filefairy.filefairy import RenderScheduler  # noqa
 from impl.reference.reference import Reference  # noqa
 from types_.debug.debug import Debug  # noqa
 from types_.notify.notify import Notify  # noqa
@@ -117,6 +118,10 @@ class FilefairyTest(Test):
         self.addCleanup(open_patch.stop)
         self.open_ = open_patch.start()
 
+        replace_patch = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(replace_patch.stop)
+        self.replace_ = replace_patch.start()
+
     def init_mocks(self, data):
         mo = mock.mock_open(read_data=dumps(data))
         self.open_.side_effect = [mo.return_value]
@@ -164,6 +169,13 @@ class FilefairyTest(Test):
         self.assertIsNone(filefairy.ws)
         self.assertNotCalled(self.log_)
 
+        dashboard._render(date=DATE_10260602, log=False)
+        self.assertEqual(filefairy.renders.due(force=True),
+                         [('dashboard', {
+                             'date': DATE_10260602,
+                             'log': False
+                         })])
+
     @mock.patch.object(Filefairy, 'get_home_html')
     def test_render_data(self, get_home_html_):
         home_html = {'external': []}
@@ -293,6 +305,63 @@ class FilefairyTest(Test):
         thread_.assert_called_once_with(target=filefairy.ws.run_forever)
         self.assertNotCalled(self.log_)
 
+    @mock.patch('impl.filefairy.filefairy.time.time')
+    @mock.patch.object(Filefairy, 'try_')
+    @mock.patch.object(Filefairy, '_render_internal')
+    def test_flush(self, _render_internal_, try_, time_):
+        time_.side_effect = [100, 101, 102, 107, 107, 107.25, 107.25, 107.25]
+
+        dashboard = self.create_dashboard(DATE_10260602)
+        reference = self.create_reference(DATE_10260602)
+        filefairy = self.create_filefairy(DATE_10260602, dashboard, reference)
+        filefairy.runners['faketask'] = self.create_task(DATE_10260602)
+        filefairy.runners['faketask'].schedule = functools.partial(
+            filefairy.renders.mark, 'faketask')
+
+        filefairy._render(date=DATE_10260602)
+        filefairy.runners['faketask']._render(date=DATE_10260602)
+        filefairy.runners['faketask']._render(date=DATE_10260604)
+        filefairy.flush()
+
+        _render_internal_.assert_called_once_with(date=DATE_10260602)
+        try_.assert_called_once_with('faketask',
+                                     '_render_internal',
+                                     date=DATE_10260604)
+        self.assertEqual(filefairy.renders.dirty, {})
+        self.assertEqual(
+            dashboard.stats, {
+                'Faketask Renders': {
+                    'average': '250.0ms',
+                    'max': '250.0ms',
+                    'renders': 1,
+                    'requests': 2
+                },
+                'Filefairy Renders': {
+                    'average': '0.0ms',
+                    'max': '0.0ms',
+                    'renders': 1,
+                    'requests': 1
+                },
+            })
+        self.assertNotCalled(self.log_)
+
+    @mock.patch('impl.filefairy.filefairy.time.time')
+    @mock.patch.object(Filefairy, 'try_')
+    @mock.patch.object(Filefairy, '_render_internal')
+    def test_flush__debounce(self, _render_internal_, try_, time_):
+        time_.side_effect = [100, 102]
+
+        dashboard = self.create_dashboard(DATE_10260602)
+        reference = self.create_reference(DATE_10260602)
+        filefairy = self.create_filefairy(DATE_10260602, dashboard, reference)
+
+        filefairy._render(date=DATE_10260602)
+        filefairy.flush()
+
+        self.assertIn('filefairy', filefairy.renders.dirty)
+        self.assertEqual(dashboard.stats, {})
+        self.assertNotCalled(_render_internal_, try_, self.log_)
+
     @mock.patch.object(Filefairy, 'try_all')
     @mock.patch.object(Filefairy, 'try_')
     def test_handle_response__empty(self, try_, try_all_):
@@ -323,7 +392,8 @@ class FilefairyTest(Test):
         self.assertEqual(filefairy.runners['faketask'].date, DATE_10260604)
         self.assertFalse(len(filefairy.threads))
 
-        self.assertNotCalled(try_, try_all_, self.log_)
+        try_.assert_called_once_with('faketask', '_flush', force=True)
+        self.assertNotCalled(try_all_, self.log_)
 
     @mock.patch.object(Filefairy, 'try_all')
     @mock.patch.object(Filefairy, 'try_')
@@ -339,10 +409,11 @@ class FilefairyTest(Test):
         self.assertEqual(filefairy.runners['faketask'].date, DATE_10260604)
         self.assertFalse(len(filefairy.threads))
 
+        try_.assert_called_once_with('faketask', '_flush', force=True)
         try_all_.assert_called_once_with('_notify',
                                          notify=Notify.OTHER,
                                          date=DATE_10260604)
-        self.assertNotCalled(try_, self.log_)
+        self.assertNotCalled(self.log_)
 
     @mock.patch.object(Filefairy, 'try_all')
     @mock.patch.object(Filefairy, 'try_')
@@ -398,6 +469,10 @@ class FilefairyTest(Test):
         self.assertEqual(actual, expected)
         self.assertTrue(isinstance(filefairy.runners['faketask'], Faketask))
 
+        filefairy.runners['faketask']._render(date=DATE_10260604)
+        self.assertEqual(filefairy.renders.due(force=True),
+                         [('faketask', {'date': DATE_10260604})])
+
         getattr_.assert_called_once_with(module, 'Faketask')
         self.assertNotCalled(self.log_)
 
@@ -557,6 +632,7 @@ class FilefairyTest(Test):
         datetime_now_.assert_called_once_with()
         try_all_.assert_has_calls([
             mock.call('_run', date=DATE_10260604),
+            mock.call('_flush', date=DATE_10260604),
             mock.call('_notify', notify=notify, date=DATE_10260604)
         ])
         self.assertNotCalled(_render_, try_, self.log_)
@@ -578,7 +654,11 @@ class FilefairyTest(Test):
         self.assertEqual(filefairy.day, 26)
 
         datetime_now_.assert_called_once_with()
-        try_all_.assert_called_once_with('_run', date=DATE_10260604)
+        try_all_.assert_has_calls([
+            mock.call('_run', date=DATE_10260604),
+            mock.call('_flush', date=DATE_10260604)
+        ])
+        self.assertEqual(try_all_.call_count, 2)
         self.assertNotCalled(_render_, try_, self.log_)
 
     @mock.patch.object(Filefairy, 'try_all')
@@ -606,7 +686,11 @@ class FilefairyTest(Test):
         #                              '_notify',
         #                              notify=notify,
         #                              date=DATE_10260604)
-        try_all_.assert_called_once_with('_run', date=DATE_10260604)
+        try_all_.assert_has_calls([
+            mock.call('_run', date=DATE_10260604),
+            mock.call('_flush', date=DATE_10260604)
+        ])
+        self.assertEqual(try_all_.call_count, 2)
         self.assertNotCalled(self.log_)
 
     @mock.patch.object(Filefairy, 'try_all')
@@ -675,6 +759,56 @@ class FilefairyTest(Test):
         sleep_.assert_called_once_with(2)
         self.assertNotCalled(connect_, thread_, self.log_)
 
+    @mock.patch('impl.filefairy.filefairy.time.time')
+    def test_render_scheduler__due(self, time_):
+        renders = RenderScheduler(5, 30)
+
+        time_.return_value = 100
+        renders.mark('gameday', date=DATE_10260602)
+        renders.mark('news', date=DATE_10260602)
+
+        time_.return_value = 104
+        renders.mark('gameday', date=DATE_10260604)
+        self.assertEqual(renders.due(), [])
+
+        time_.return_value = 105
+        self.assertEqual(renders.due(), [('news', {'date': DATE_10260602})])
+
+        for now in range(106, 130, 4):
+            time_.return_value = now
+            renders.mark('gameday', date=DATE_10260604)
+            self.assertEqual(renders.due(), [])
+
+        time_.return_value = 130
+        self.assertEqual(renders.due(),
+                         [('gameday', {'date': DATE_10260604})])
+
+        renders.mark('standings', date=DATE_10260604)
+        self.assertEqual(renders.due(force=True),
+                         [('standings', {'date': DATE_10260604})])
+        self.assertEqual(renders.dirty, {})
+
+    def test_render_scheduler__stats(self):
+        renders = RenderScheduler(5, 30)
+        self.assertEqual(renders.get_stats('gameday'), {
+            'average': '0.0ms',
+            'max': '0.0ms',
+            'renders': 0,
+            'requests': 0
+        })
+
+        renders.mark('gameday', date=DATE_10260602)
+        renders.mark('gameday', date=DATE_10260602)
+        renders.mark('gameday', date=DATE_10260602)
+        renders.record('gameday', 0.25)
+        renders.record('gameday', 0.125)
+        self.assertEqual(renders.get_stats('gameday'), {
+            'average': '187.5ms',
+            'max': '250.0ms',
+            'renders': 2,
+            'requests': 3
+        })
+
     @mock.patch.object(Faketask, '_run')
     @mock.patch.object(Filefairy, 'handle_response')
     def test_try__exception(self, handle_response_, run_):
@@ -6,8 +6,21 @@ The stored data is a map of player ids to player identity information. When a
 caller attempts to put new ids into the map, only new ids are parsed and
 stored. At the end of each day, the entire map is refreshed to have up-to-date
 information.
+
+Player pages are fetched concurrently by a bounded pool of worker threads, each
+reusing its own HTTP connection and retrying failed requests with backoff. The
+requests are conditional on the validators (ETag, Last-Modified and content
+hash) stored for each player, so unchanged pages are not parsed again. The
+results are applied in request order, and the file is written once at the end.
+
+Text substitutions scan for player encodings with a single tokenizer and cache
+the result of each repl function per player, until the map next changes.
 """
 
+import concurrent.futures
+import hashlib
+import json
+import logging
 import os
 import re
 import sys
@@ -18,6 +31,7 @@ sys.path.append(re.sub(r'/impl/reference', '', _path))
 from api.runnable.runnable import Runnable  # noqa
 from api.serializable.serializable import Serializable  # noqa
 from common.re_.re_ import search  # noqa
+from common.requests_.requests_ import get_conditional  # noqa
 from common.service.service import call_service  # noqa
 from types_.notify.notify import Notify  # noqa
 from types_.response.response import Response  # noqa
@@ -26,45 +40,170 @@ DATA_DIR = re.sub(r'/impl/reference', '', _path) + '/resources/data/reference'
 STATSPLUS_LINK = 'https://statsplus.net/oblootp/reports/news/html'
 STATSPLUS_PLAYERS = os.path.join(STATSPLUS_LINK, 'players')
 
+_logger = logging.getLogger('filefairy')
+
+PLAYER_PATTERN = re.compile(r'P\d+')
+
+RETRIES = 2
+WORKERS = 8
+
+
+def _record(data):
+    return tuple(data.split(' ', 4))
+
 
 class Reference(Runnable, Serializable):
     def __init__(self, **kwargs):
+        """Create a Reference object.
+
+        Args:
+            workers: The maximum number of player pages to fetch concurrently.
+
+        Attributes:
+            digest: Content hash of the player map, computed on demand.
+            players: The player map that the records were built from.
+            records: Mapping of player ids to pre-split identity tuples.
+            repls: Mapping of repl functions to their cached substitutions.
+            version: Number which increments whenever the player map changes.
+            workers: The maximum number of player pages to fetch concurrently.
+        """
+        workers = kwargs.pop('workers', WORKERS)
         super(Reference, self).__init__(**kwargs)
 
+        self.digest = None
+        self.players = None
+        self.records = {}
+        self.repls = {}
+        self.version = 0
+        self.workers = workers
+
+    def _compact(self):
+        return True
+
+    def _changed(self):
+        self.digest = None
+        self.repls = {}
+        self.version += 1
+
+    def _refresh(self):
+        if self.data['players'] is not self.players:
+            self.players = self.data['players']
+            self.records = {e: _record(d) for e, d in self.players.items()}
+            self._changed()
+
     def _notify_internal(self, **kwargs):
         notify = kwargs['notify']
         if notify == Notify.FILEFAIRY_DAY:
             encodings = list(sorted(self.data['players'].keys()))
-            self.parse_players(encodings)
+            counts = self.parse_players(encodings)
+            msg = 'Refreshed players ({fetched} fetched, {skipped} skipped, '
+            msg += '{changed} changed).'
+            _logger.log(logging.INFO, msg.format(**counts))
         return Response()
 
     def get_attribute(self, e, index, default):
-        if e not in self.data['players']:
+        if self.data['players'] is not self.players:
+            self._refresh()
+        record = self.records.get(e)
+        if record is None:
             return default
-        return self.data['players'][e].split(' ', 4)[index]
+        return record[index]
+
+    def get_digest(self):
+        self._refresh()
+        if self.digest is None:
+            text = json.dumps(self.players, sort_keys=True)
+            self.digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return self.digest
+
+    def get_version(self):
+        if self.data['players'] is not self.players:
+            self._refresh()
+        return self.version
+
+    def _parse_player(self, e):
+        n = e.strip('P')
+        link = os.path.join(STATSPLUS_PLAYERS, 'player_{}.html'.format(n))
+
+        validator = None
+        if e in self.data['players']:
+            validator = self.data['validators'].get(e)
+
+        text, validator = get_conditional(link, validator, retries=RETRIES)
+        if text is None:
+            return True, None, validator
+
+        data = call_service('statslab', 'parse_player_page', (text, ))
+        return False, data, validator
 
     def parse_players(self, encodings):
+        """Parse the given players, skipping the pages which are unchanged.
+
+        Args:
+            encodings: The list of player encodings to parse.
+
+        Returns:
+            A mapping of the number of pages fetched, skipped and changed.
+        """
+        self._refresh()
+        counts = {'fetched': 0, 'skipped': 0, 'changed': 0}
+        if not encodings:
+            return counts
+
+        validators = self.data.setdefault('validators', {})
+        workers = max(1, min(self.workers, len(encodings)))
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            results = list(executor.map(self._parse_player, encodings))
+
         changed = False
+        original = dict(validators)
+        for e, (skipped, data, validator) in zip(encodings, results):
+            if skipped:
+                counts['skipped'] += 1
+                validators[e] = validator
+                continue
 
-        for e in encodings:
-            n = e.strip('P')
-            link = os.path.join(STATSPLUS_PLAYERS, 'player_{}.html'.format(n))
-            data = call_service('statslab', 'parse_player', (link, ))
+            counts['fetched'] += 1
+            if data is None:
+                validators.pop(e, None)
+            else:
+                validators[e] = validator
 
             if self.data['players'].get(e) != data:
                 if data is None:
                     self.data['players'].pop(e, None)
+                    self.records.pop(e, None)
                 else:
                     self.data['players'][e] = data
+                    self.records[e] = _record(data)
+                counts['changed'] += 1
                 changed = True
 
         if changed:
+            self._changed()
+        if changed or validators != original:
             self._write()
 
+        return counts
+
     def put_players(self, encodings):
         encodings = [e for e in encodings if e not in self.data['players']]
         self.parse_players(encodings)
 
     def substitute(self, repl, text):
-        pattern = '|'.join([e + r'(?!\d)' for e in self.data['players']])
-        return re.sub(pattern, repl, text)
+        self._refresh()
+
+        records = self.records
+        if repl not in self.repls:
+            self.repls[repl] = {}
+        cache = self.repls[repl]
+
+        def _repl(m):
+            e = m.group(0)
+            if e not in records:
+                return e
+            if e not in cache:
+                cache[e] = repl(m)
+            return cache[e]
+
+        return PLAYER_PATTERN.sub(_repl, text)
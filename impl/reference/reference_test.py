@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for reference.py."""
 
+import logging
 import os
 import re
 import sys
@@ -13,7 +14,10 @@ sys.path.extend((_path, re.sub(r'/impl/reference', '', _path)))
 
 from common.datetime_.datetime_ import datetime_datetime_pst  # noqa
 from common.json_.json_ import dumps  # noqa
+from common.requests_.requests_ import get_conditional  # noqa
+from common.service.service import reload_service_for_test  # noqa
 from common.test.test import Test  # noqa
+from common.test.test import serve  # noqa
 from impl.reference.reference import Reference  # noqa
 from types_.notify.notify import Notify  # noqa
 from types_.response.response import Response  # noqa
@@ -22,10 +26,13 @@ DATE_10260602 = datetime_datetime_pst(1985, 10, 26, 6, 2, 30)
 DATE_10260604 = datetime_datetime_pst(1985, 10, 26, 6, 4)
 
 PLAYERS = {'P123': 'T31 1 L R Jim Alfa', 'P456': 'T32 42 R L Jim Beta'}
+VALIDATOR = {'etag': '"abc"', 'hash': 'def'}
 
 STATSPLUS_LINK = 'https://statsplus.net/oblootp/reports/news/html'
 STATSPLUS_PLAYERS = os.path.join(STATSPLUS_LINK, 'players')
 
+TESTDATA_DIR = re.sub(r'/impl/reference', '/common/test/testdata', _path)
+
 
 def create_statsplus_player_page(num):
     return os.path.join(STATSPLUS_PLAYERS, 'player_{}.html'.format(num))
@@ -37,6 +44,15 @@ class ReferenceTest(Test):
         self.addCleanup(open_patch.stop)
         self.open_ = open_patch.start()
 
+        replace_patch = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(replace_patch.stop)
+        self.replace_ = replace_patch.start()
+
+        get_patch = mock.patch('impl.reference.reference.get_conditional')
+        self.addCleanup(get_patch.stop)
+        self.get_conditional_ = get_patch.start()
+        self.get_conditional_.return_value = ('page', VALIDATOR)
+
     def init_mocks(self, data):
         mo = mock.mock_open(read_data=dumps(data))
         self.open_handle_ = mo()
@@ -59,14 +75,63 @@ class ReferenceTest(Test):
 
         return reference
 
+    def test_get_attribute__records(self):
+        data = {'players': PLAYERS}
+        reference = self.create_reference(data)
+        self.assertEqual(reference.records, {})
+
+        reference.get_attribute('P123', 0, 'T30')
+        expected = {
+            'P123': ('T31', '1', 'L', 'R', 'Jim Alfa'),
+            'P456': ('T32', '42', 'R', 'L', 'Jim Beta'),
+        }
+        self.assertEqual(reference.records, expected)
+        self.assertEqual(reference.version, 1)
+
+        self.assertNotCalled(self.open_handle_.write)
+
+    def test_get_digest(self):
+        data = {'players': PLAYERS}
+        reference = self.create_reference(data)
+        digest = reference.get_digest()
+        self.assertEqual(reference.get_digest(), digest)
+
+        reference.data['players'] = dict(PLAYERS)
+        self.assertEqual(reference.get_digest(), digest)
+
+        reference.data['players'] = dict(PLAYERS, P789='T33 7 R R Jim Doe')
+        self.assertNotEqual(reference.get_digest(), digest)
+
+        self.assertNotCalled(self.open_handle_.write)
+
+    def test_get_version(self):
+        data = {'players': PLAYERS}
+        reference = self.create_reference(data)
+        self.assertEqual(reference.get_version(), 1)
+        self.assertEqual(reference.get_version(), 1)
+
+        reference.data['players'] = dict(PLAYERS)
+        self.assertEqual(reference.get_version(), 2)
+
+        self.assertNotCalled(self.open_handle_.write)
+
+    @mock.patch('impl.reference.reference._logger.log')
     @mock.patch.object(Reference, 'parse_players')
-    def test_notify__fairylab_day(self, parse_players_):
+    def test_notify__fairylab_day(self, parse_players_, log_):
+        parse_players_.return_value = {
+            'fetched': 1,
+            'skipped': 1,
+            'changed': 0
+        }
+
         data = {'players': PLAYERS}
         reference = self.create_reference(data)
         response = reference._notify_internal(notify=Notify.FILEFAIRY_DAY)
         self.assertEqual(response, Response())
 
         parse_players_.assert_called_once_with(['P123', 'P456'])
+        msg = 'Refreshed players (1 fetched, 1 skipped, 0 changed).'
+        log_.assert_called_once_with(logging.INFO, msg)
         self.assertNotCalled(self.open_handle_.write)
 
     @mock.patch.object(Reference, 'parse_players')
@@ -134,46 +199,119 @@ class ReferenceTest(Test):
         call_service_.return_value = 'T32 1 L R Jim Alfa'
 
         players = {'P123': 'T31 1 L R Jim Alfa'}
-        data = {'players': players}
+        data = {'players': players, 'validators': {}}
         reference = self.create_reference(data)
-        reference.parse_players(['P123'])
+        actual = reference.parse_players(['P123'])
+        expected = {'fetched': 1, 'skipped': 0, 'changed': 1}
+        self.assertEqual(actual, expected)
+
+        self.assertEqual(reference.get_attribute('P123', 0, 'T30'), 'T32')
 
         link = create_statsplus_player_page('123')
         players = {'P123': 'T32 1 L R Jim Alfa'}
-        write = {'players': players}
-        call_service_.assert_called_once_with('statslab', 'parse_player',
-                                              (link, ))
-        self.open_handle_.write.assert_called_once_with(dumps(write) + '\n')
+        write = {'players': players, 'validators': {'P123': VALIDATOR}}
+        self.get_conditional_.assert_called_once_with(link, None, retries=2)
+        call_service_.assert_called_once_with('statslab', 'parse_player_page',
+                                              ('page', ))
+        self.open_handle_.write.assert_called_once_with(
+            dumps(write, compact=True) + '\n')
+
+    def test_parse_players__local(self):
+        server = serve(self, TESTDATA_DIR)
+
+        self.get_conditional_.side_effect = get_conditional
+        reload_service_for_test('statslab')
+        link = server.url
+        encodings = ['P24322', 'P35903', 'P54297', 'P99']
+
+        players = {'P24322': 'T47 16 R R Jarid Joseph', 'P99': 'T31 1 L R X'}
+        data = {'players': players, 'validators': {}}
+        reference = self.create_reference(data)
+        reference.workers = 2
+        with mock.patch('impl.reference.reference.STATSPLUS_PLAYERS', link):
+            actual = reference.parse_players(encodings)
+            expected = {'fetched': 4, 'skipped': 0, 'changed': 3}
+            self.assertEqual(actual, expected)
+
+            players = {
+                'P24322': 'T47 16 R R Jarid Joseph',
+                'P35903': 'T47 35 R R Jose Fernandez',
+                'P54297': 'T30 56 R R Lineu Murraas',
+            }
+            self.assertEqual(reference.data['players'], players)
+            self.assertEqual(
+                sorted(reference.data['validators']), sorted(players))
+            self.open_handle_.write.assert_called_once()
+
+            self.reset_mocks()
+            actual = reference.parse_players(encodings)
+            expected = {'fetched': 1, 'skipped': 3, 'changed': 0}
+            self.assertEqual(actual, expected)
+            self.assertNotCalled(self.open_handle_.write)
 
     @mock.patch('impl.reference.reference.call_service')
     def test_parse_players__none(self, call_service_):
         call_service_.return_value = None
 
         players = {'P123': 'T31 1 L R Jim Alfa'}
-        data = {'players': players}
+        validators = {'P123': VALIDATOR}
+        data = {'players': players, 'validators': validators}
         reference = self.create_reference(data)
-        reference.parse_players(['P123'])
+        actual = reference.parse_players(['P123'])
+        expected = {'fetched': 1, 'skipped': 0, 'changed': 1}
+        self.assertEqual(actual, expected)
+
+        self.assertEqual(reference.get_attribute('P123', 0, 'T30'), 'T30')
 
         link = create_statsplus_player_page('123')
-        write = {'players': {}}
-        call_service_.assert_called_once_with('statslab', 'parse_player',
-                                              (link, ))
-        self.open_handle_.write.assert_called_once_with(dumps(write) + '\n')
+        write = {'players': {}, 'validators': {}}
+        self.get_conditional_.assert_called_once_with(
+            link, VALIDATOR, retries=2)
+        call_service_.assert_called_once_with('statslab', 'parse_player_page',
+                                              ('page', ))
+        self.open_handle_.write.assert_called_once_with(
+            dumps(write, compact=True) + '\n')
 
     @mock.patch('impl.reference.reference.call_service')
     def test_parse_players__same(self, call_service_):
         call_service_.return_value = 'T31 1 L R Jim Alfa'
 
         players = {'P123': 'T31 1 L R Jim Alfa'}
-        data = {'players': players}
+        validators = {'P123': VALIDATOR}
+        data = {'players': players, 'validators': validators}
         reference = self.create_reference(data)
-        reference.parse_players(['P123'])
+        actual = reference.parse_players(['P123'])
+        expected = {'fetched': 1, 'skipped': 0, 'changed': 0}
+        self.assertEqual(actual, expected)
 
         link = create_statsplus_player_page('123')
-        call_service_.assert_called_once_with('statslab', 'parse_player',
-                                              (link, ))
+        self.get_conditional_.assert_called_once_with(
+            link, VALIDATOR, retries=2)
+        call_service_.assert_called_once_with('statslab', 'parse_player_page',
+                                              ('page', ))
         self.assertNotCalled(self.open_handle_.write)
 
+    @mock.patch('impl.reference.reference.call_service')
+    def test_parse_players__skipped(self, call_service_):
+        validator = {'etag': '"ghi"', 'hash': 'def'}
+        self.get_conditional_.return_value = (None, validator)
+
+        players = {'P123': 'T31 1 L R Jim Alfa'}
+        validators = {'P123': VALIDATOR}
+        data = {'players': players, 'validators': validators}
+        reference = self.create_reference(data)
+        actual = reference.parse_players(['P123'])
+        expected = {'fetched': 0, 'skipped': 1, 'changed': 0}
+        self.assertEqual(actual, expected)
+
+        link = create_statsplus_player_page('123')
+        write = {'players': players, 'validators': {'P123': validator}}
+        self.get_conditional_.assert_called_once_with(
+            link, VALIDATOR, retries=2)
+        self.assertNotCalled(call_service_)
+        self.open_handle_.write.assert_called_once_with(
+            dumps(write, compact=True) + '\n')
+
     @mock.patch.object(Reference, 'parse_players')
     def test_put_players(self, parse_players_):
         data = {'players': PLAYERS}
@@ -196,6 +334,58 @@ class ReferenceTest(Test):
 
         self.assertNotCalled(self.open_handle_.write)
 
+    def test_substitute__cached(self):
+        data = {'players': PLAYERS}
+        reference = self.create_reference(data)
+
+        _repl = mock.Mock(return_value='Jim Alfa')
+
+        actual = reference.substitute(_repl, 'P123 P123, P123')
+        expected = 'Jim Alfa Jim Alfa, Jim Alfa'
+        self.assertEqual(actual, expected)
+
+        actual = reference.substitute(_repl, 'P123 (1-0, 0.00 ERA)')
+        expected = 'Jim Alfa (1-0, 0.00 ERA)'
+        self.assertEqual(actual, expected)
+
+        self.assertEqual(_repl.call_count, 1)
+        self.assertNotCalled(self.open_handle_.write)
+
+    @mock.patch('impl.reference.reference.call_service')
+    def test_substitute__changed(self, call_service_):
+        call_service_.return_value = 'T31 1 L R Jim Alpha'
+
+        data = {'players': {'P123': 'T31 1 L R Jim Alfa'}}
+        reference = self.create_reference(data)
+
+        def _repl(m):
+            return reference.get_attribute(m.group(0), 4, 'Jim Unknown')
+
+        actual = reference.substitute(_repl, 'P123 (1-0, 0.00 ERA)')
+        expected = 'Jim Alfa (1-0, 0.00 ERA)'
+        self.assertEqual(actual, expected)
+
+        version = reference.version
+        reference.parse_players(['P123'])
+        self.assertEqual(reference.version, version + 1)
+
+        actual = reference.substitute(_repl, 'P123 (1-0, 0.00 ERA)')
+        expected = 'Jim Alpha (1-0, 0.00 ERA)'
+        self.assertEqual(actual, expected)
+
+    def test_substitute__unknown(self):
+        data = {'players': PLAYERS}
+        reference = self.create_reference(data)
+
+        def _repl(m):
+            return reference.get_attribute(m.group(0), 4, 'Jim Unknown')
+
+        actual = reference.substitute(_repl, 'P1234 P12 P456 (P123)')
+        expected = 'P1234 P12 Jim Beta (Jim Alfa)'
+        self.assertEqual(actual, expected)
+
+        self.assertNotCalled(self.open_handle_.write)
+
 
 if __name__ == '__main__':
     unittest.main()
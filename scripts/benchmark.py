@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Microbenchmarks for hot paths, run against the checked-in resources.
+
+Usage:
+    python3 scripts/benchmark.py [name ...]
+
+With no names given, every registered benchmark is run.
+"""
+
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import timeit
+import unittest.mock as mock
+
+_path = os.path.dirname(os.path.abspath(__file__))
+_root = re.sub(r'/scripts', '', _path)
+sys.path.append(_root)
+
+from common.datetime_.datetime_ import datetime_now  # noqa
+from common.jinja2_.jinja2_ import env  # noqa
+from common.re_.re_ import match  # noqa
+from common.re_.re_ import search  # noqa
+from common.reference.reference import set_reference  # noqa
+from common.service.service import call_service  # noqa
+from common.service.service import reload_services  # noqa
+from common.styles.styles import get_styles  # noqa
+from impl.reference.reference import Reference  # noqa
+from services.events.events import classify  # noqa
+from services.events.events import get_map  # noqa
+from services.statslab.statslab import _open  # noqa
+from services.statslab.statslab import _parse_innings  # noqa
+from services.statslab.statslab import _parse_lines  # noqa
+from types_.event.event import Event  # noqa
+
+EXTRACT_DIR = os.path.join(_root, 'resources/extract')
+GAMES_DIR = os.path.join(_root, 'resources/games')
+TESTDATA_DIR = os.path.join(_root, 'common/test/testdata')
+
+BENCHMARKS = {}
+
+COLD_START = """
+import sys
+import time
+sys.path.append({root!r})
+from common.jinja2_.jinja2_ import _create
+from common.jinja2_.jinja2_ import compile_templates
+start = time.time()
+compile_templates(_create(bytecode_cache={cache}))
+print(time.time() - start)
+"""
+
+
+def benchmark(f):
+    BENCHMARKS[f.__name__] = f
+    return f
+
+
+def report(name, before, after):
+    print('{:<32} {:>10.2f}ms {:>10.2f}ms {:>8.1f}x'.format(
+        name, before * 1000, after * 1000, before / after))
+
+
+def reference():
+    r = Reference(date=datetime_now())
+    set_reference(r)
+    return r
+
+
+@benchmark
+def get_attribute():
+    r = reference()
+    players = r.data['players']
+    encodings = list(players) + ['P0']
+
+    def _split(e, index, default):
+        if e not in players:
+            return default
+        return players[e].split(' ', 4)[index]
+
+    def _before():
+        for e in encodings:
+            for index in range(5):
+                _split(e, index, None)
+
+    def _after():
+        for e in encodings:
+            for index in range(5):
+                r.get_attribute(e, index, None)
+
+    before = min(timeit.repeat(_before, number=20, repeat=5))
+    after = min(timeit.repeat(_after, number=20, repeat=5))
+    report('get_attribute', before, after)
+
+
+def game_logs():
+    logs = glob.glob(os.path.join(EXTRACT_DIR, 'game_logs', 'log_*.txt'))
+    if not logs:
+        logs = glob.glob(os.path.join(TESTDATA_DIR, 'log_*'))
+
+    lines = []
+    for log in sorted(logs):
+        html = log.endswith('.html')
+        for inning in _parse_innings(_open(log), html):
+            lines.extend(_parse_lines(inning[3], html))
+    return lines
+
+
+@benchmark
+def classify_events():
+    lines = game_logs()
+    events_map = get_map()
+
+    def _match(line):
+        for event, regex in events_map.items():
+            groups = match(regex, line)
+            if groups is not None:
+                return event, groups
+        return None
+
+    assert [_match(line) for line in lines] == [classify(l) for l in lines]
+
+    def _before():
+        for line in lines:
+            _match(line)
+
+    def _after():
+        for line in lines:
+            classify(line)
+
+    before = min(timeit.repeat(_before, number=1, repeat=3))
+    after = min(timeit.repeat(_after, number=1, repeat=3))
+    report('classify_events ({} lines)'.format(len(lines)), before, after)
+
+
+@benchmark
+def re_search():
+    lines = game_logs()
+    patterns = [r'^\d-\d: (\w+)', r'(P\d+)', r'\((\w+), (\w+)\)']
+
+    def _before():
+        for line in lines:
+            for pattern in patterns:
+                groups = re.compile(pattern).groups
+                m = re.search(pattern, line)
+                if m and groups:
+                    [g.strip() for g in m.groups() if g]
+
+    def _after():
+        for line in lines:
+            for pattern in patterns:
+                search(pattern, line)
+
+    before = min(timeit.repeat(_before, number=1, repeat=3))
+    after = min(timeit.repeat(_after, number=1, repeat=3))
+    report('re_search ({} lines)'.format(len(lines)), before, after)
+
+
+def games():
+    games = glob.glob(os.path.join(GAMES_DIR, '*.json'))
+    if not games:
+        games = glob.glob(os.path.join(TESTDATA_DIR, '[0-9]*.json'))
+    return sorted(games)
+
+
+@benchmark
+def game_events():
+    texts = {False: [], True: []}
+    for game in games():
+        with open(game) as f:
+            data = json.loads(f.read())
+        events = data['events']
+        if isinstance(events, dict):
+            events = Event.unpack_encodings(events)
+        for pack in texts:
+            data['events'] = Event.pack(events) if pack else events
+            texts[pack].append(json.dumps(data, indent=2, sort_keys=True))
+
+    def _load(pack):
+        for text in texts[pack]:
+            Event.decode_all(json.loads(text)['events'])
+
+    before = min(timeit.repeat(lambda: _load(False), number=10, repeat=5))
+    after = min(timeit.repeat(lambda: _load(True), number=10, repeat=5))
+    report('game_events ({} games)'.format(len(texts[False])), before, after)
+
+    sizes = {k: sum(len(t) for t in v) for k, v in texts.items()}
+    print('{:<32} {:>10.1f}KB {:>10.1f}KB {:>8.1f}x'.format(
+        '  file size', sizes[False] / 1024, sizes[True] / 1024,
+        sizes[False] / sizes[True]))
+
+
+@benchmark
+def livesim_compact():
+    reference()
+    reload_services()
+    e = env()
+
+    sizes = {}
+
+    def _render(compact):
+        size = 0
+        for game in games():
+            context = call_service(
+                'livesim', 'get_html', (game, ), compact=compact)
+            styles = get_styles(context)
+            html = e.get_template('livesim.html').render(
+                dict(context, menu=None, styles=styles, title='', date=''))
+            size += len(html.encode())
+        sizes[compact] = size
+
+    before = min(timeit.repeat(lambda: _render(False), number=1, repeat=3))
+    after = min(timeit.repeat(lambda: _render(True), number=1, repeat=3))
+    report('livesim_compact ({} games)'.format(len(games())), before, after)
+    print('{:<32} {:>10.1f}KB {:>10.1f}KB {:>8.1f}x'.format(
+        '  page size', sizes[False] / 1024, sizes[True] / 1024,
+        sizes[False] / sizes[True]))
+
+
+@benchmark
+def livesim_tables():
+    reference()
+    reload_services()
+
+    def _events(game):
+        with open(game) as f:
+            return len(Event.decode_all(json.loads(f.read())['events']))
+
+    game = max(games(), key=_events)
+    module = sys.modules['services.tables.tables']
+
+    class _Tables(module.Tables):
+        def append_live_body(self, r):
+            self.live_body.insert(0, r)
+
+        def append_live_foot(self, r):
+            self.live_foot.insert(0, r)
+
+        def get_live_tables(self):
+            return self.live_head + [
+                module.table(body=self.live_body),
+                module.table(body=self.live_foot)
+            ]
+
+        def get_old_body(self):
+            return list(self.old_body)
+
+        def get_summary(self):
+            return list(self.summary)
+
+    def _before():
+        with mock.patch.object(module, 'create_tables', _Tables):
+            call_service('livesim', 'get_html', (game, ))
+
+    def _after():
+        call_service('livesim', 'get_html', (game, ))
+
+    before = min(timeit.repeat(_before, number=1, repeat=5))
+    after = min(timeit.repeat(_after, number=1, repeat=5))
+    name = 'livesim_tables ({} events)'.format(_events(game))
+    report(name, before, after)
+
+
+@benchmark
+def templates_cold_start():
+    def _start(cache):
+        code = COLD_START.format(root=_root, cache=cache)
+        return float(subprocess.check_output([sys.executable, '-c', code]))
+
+    _start(True)
+
+    before = min(_start(False) for _ in range(5))
+    after = min(_start(True) for _ in range(5))
+    report('templates_cold_start', before, after)
+
+
+def main(names):
+    print('{:<32} {:>12} {:>12} {:>9}'.format('', 'before', 'after', ''))
+    for name in names or sorted(BENCHMARKS):
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
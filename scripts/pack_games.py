@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Converts game files between the packed and the legacy event encodings.
+
+Usage:
+    python3 scripts/pack_games.py [--unpack] [path ...]
+
+With no paths given, every game file in resources/games is converted.
+"""
+
+import glob
+import os
+import re
+import sys
+
+_path = os.path.dirname(os.path.abspath(__file__))
+_root = re.sub(r'/scripts', '', _path)
+sys.path.append(_root)
+
+from common.json_.json_ import dumps  # noqa
+from common.json_.json_ import loads  # noqa
+from types_.event.event import Event  # noqa
+
+GAMES_DIR = os.path.join(_root, 'resources/games')
+
+
+def convert(path, unpack):
+    data = loads(path)
+    events = data.get('events')
+    if not events:
+        return False
+
+    packed = isinstance(events, dict)
+    if packed == (not unpack):
+        return False
+
+    if unpack:
+        data['events'] = Event.unpack_encodings(events)
+    else:
+        data['events'] = Event.pack(events)
+
+    with open(path, 'w') as f:
+        f.write(dumps(data) + '\n')
+    return True
+
+
+def main(args):
+    unpack = '--unpack' in args
+    paths = [a for a in args if a != '--unpack']
+    paths = paths or sorted(glob.glob(os.path.join(GAMES_DIR, '*.json')))
+
+    before = sum(os.path.getsize(p) for p in paths)
+    converted = sum(convert(p, unpack) for p in paths)
+    after = sum(os.path.getsize(p) for p in paths)
+
+    print('Converted {} of {} games ({:.1f}KB to {:.1f}KB).'.format(
+        converted, len(paths), before / 1024, after / 1024))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Service (reloadable) methods for parsing StatsLab events."""
+"""Service (reloadable) methods for parsing StatsLab events.
+
+The event map is also compiled into a single pattern, which holds each event
+regex as a named alternative in map order. A line is classified with one match
+call, and the outermost matched group identifies the event.
+"""
 
 import os
 import re
@@ -152,5 +157,46 @@ EVENT_MAP = {
 MAP = {k: v.format(**EVENT_KWARGS) for k, v in EVENT_MAP.items()}
 
 
+def _compile(map_):
+    alternatives = []
+    events = {}
+    index = 1
+    for i, (event, regex) in enumerate(map_.items()):
+        alternatives.append('(?P<e{}>{})'.format(i, regex))
+        groups = re.compile(regex).groups
+        events[index] = (event, index + 1, index + groups + 1)
+        index += groups + 1
+    return re.compile('|'.join(alternatives)), events
+
+
+PATTERN, PATTERN_EVENTS = _compile(MAP)
+
+
+def _strip(s):
+    if s is None:
+        return None
+    return s.strip()
+
+
+def classify(line):
+    """Classify a play-by-play line against the event map.
+
+    Equivalent to matching each regex of the event map in order, and returning
+    the groups of the first match in the same form as ``common.re_.match``.
+
+    Args:
+        line: The play-by-play line to classify.
+
+    Returns:
+        A tuple of the matched event and its list of groups, otherwise None.
+    """
+    m = PATTERN.match(line)
+    if m is None:
+        return None
+
+    event, start, end = PATTERN_EVENTS[m.lastindex]
+    return event, [_strip(m.group(i)) for i in range(start, end)]
+
+
 def get_map():
     return MAP
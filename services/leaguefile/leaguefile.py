@@ -1,33 +1,177 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Service (reloadable) methods for leaguefile operations."""
+"""Service (reloadable) methods for leaguefile operations.
+
+The league file is streamed to disk, resuming from the partial file left by an
+interrupted attempt, and its size and member checksums are verified before it
+is kept. The league file is kept as a zip archive, and extraction reads only
+the box score and league members directly from it. A league file which was
+unpacked to disk (the legacy download mode) is read from the download directory
+instead.
+
+Box scores are dated by reading only the head of each file, and the dates are
+kept in an index (keyed by file name and size) so that repeated extractions of
+the same league file do not open any box scores at all. Newer box scores and
+game logs are copied into the extract directory as raw bytes (hard linked, if
+read from disk).
+"""
 
 import datetime
+import io
+import logging
 import os
 import re
+import shutil
 import sys
+import time
+import zipfile
 
+_logger = logging.getLogger('filefairy')
 _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(re.sub(r'/services/leaguefile', '', _path))
 
 from common.datetime_.datetime_ import datetime_datetime_pst  # noqa
+from common.datetime_.datetime_ import decode_datetime  # noqa
 from common.datetime_.datetime_ import encode_datetime  # noqa
 from common.json_.json_ import dumps  # noqa
+from common.json_.json_ import loads  # noqa
 from common.os_.os_ import chdir  # noqa
 from common.re_.re_ import search  # noqa
 from common.re_.re_ import findall  # noqa
 from common.reference.reference import put_players  # noqa
+from common.requests_.requests_ import download  # noqa
 from common.subprocess_.subprocess_ import check_output  # noqa
 from common.teams.teams import decoding_to_encoding_sub  # noqa
 
+BOX_SCORES = 'news/html/box_scores'
+LEAGUES = 'news/txt/leagues'
+
 DOWNLOAD_DIR = re.sub(r'/services/leaguefile', '/resources/download', _path)
-DOWNLOAD_BOX_SCORES = os.path.join(DOWNLOAD_DIR, 'news/html/box_scores')
-DOWNLOAD_LEAGUES = os.path.join(DOWNLOAD_DIR, 'news/txt/leagues')
+DOWNLOAD_BOX_SCORES = os.path.join(DOWNLOAD_DIR, BOX_SCORES)
+DOWNLOAD_LEAGUES = os.path.join(DOWNLOAD_DIR, LEAGUES)
 EXTRACT_DIR = re.sub(r'/services/leaguefile', '/resources/extract', _path)
 EXTRACT_BOX_SCORES = os.path.join(EXTRACT_DIR, 'box_scores')
 EXTRACT_GAME_LOGS = os.path.join(EXTRACT_DIR, 'game_logs')
+EXTRACT_INDEX = os.path.join(EXTRACT_DIR, 'index.json')
 EXTRACT_LEAGUES = os.path.join(EXTRACT_DIR, 'leagues')
 
+BOX_DATE = re.compile(rb'MLB Box Score[^\d]+(\d{2}\/\d{2}\/\d{4})')
+DOWNLOAD_RETRIES = 5
+HEADER_SIZE = 1024
+MB = float(1 << 20)
+
+
+class _Archive(object):
+    """Reads the box score and league members of a zipped league file."""
+
+    def __init__(self, filename):
+        self.zf = zipfile.ZipFile(filename)
+        self.members = {BOX_SCORES: {}, LEAGUES: {}}
+        for info in self.zf.infolist():
+            d, _, name = info.filename.rpartition('/')
+            if d in self.members and name:
+                self.members[d][name] = info
+
+    def close(self):
+        self.zf.close()
+
+    def copy(self, d, name, dst):
+        with self.open(d, name) as f, open(dst, 'wb') as g:
+            shutil.copyfileobj(f, g)
+
+    def getsize(self, d, name):
+        return self.members[d][name].file_size
+
+    def isfile(self, d, name):
+        return name in self.members[d]
+
+    def listdir(self, d):
+        return list(self.members[d])
+
+    def open(self, d, name):
+        return self.zf.open(self.members[d][name])
+
+
+class _Directory(object):
+    """Reads the box score and league files of an unpacked league file."""
+
+    def __init__(self):
+        self.dirs = {
+            BOX_SCORES: DOWNLOAD_BOX_SCORES,
+            LEAGUES: DOWNLOAD_LEAGUES,
+        }
+
+    def close(self):
+        pass
+
+    def copy(self, d, name, dst):
+        try:
+            os.link(self.path(d, name), dst)
+        except OSError:
+            shutil.copyfile(self.path(d, name), dst)
+
+    def getsize(self, d, name):
+        return os.path.getsize(self.path(d, name))
+
+    def isfile(self, d, name):
+        return os.path.isfile(self.path(d, name))
+
+    def listdir(self, d):
+        return os.listdir(self.dirs[d])
+
+    def open(self, d, name):
+        return open(self.path(d, name), 'rb')
+
+    def path(self, d, name):
+        return os.path.join(self.dirs[d], name)
+
+
+def _open_league_file():
+    if os.path.isdir(DOWNLOAD_DIR):
+        for name in sorted(os.listdir(DOWNLOAD_DIR)):
+            filename = os.path.join(DOWNLOAD_DIR, name)
+            if zipfile.is_zipfile(filename):
+                return _Archive(filename)
+
+    return _Directory()
+
+
+def _progress():
+    state = {'start': time.time(), 'base': None, 'step': 0}
+
+    def _log(size, total):
+        if state['base'] is None:
+            state['base'] = size
+        if not total:
+            return
+
+        step = size * 10 // total
+        if step <= state['step']:
+            return
+
+        state['step'] = step
+        elapsed = max(time.time() - state['start'], 0.001)
+        rate = (size - state['base']) / elapsed
+        eta = round((total - size) / rate) if rate else 0
+        msg = 'Downloaded {}% ({:.1f}/{:.1f} MB, {:.1f} MB/s, ETA {}s).'
+        msg = msg.format(step * 10, size / MB, total / MB, rate / MB, eta)
+        _logger.log(logging.INFO, msg)
+
+    return _log
+
+
+def _read_date(f):
+    text = f.read(HEADER_SIZE)
+    match = BOX_DATE.search(text)
+    if not match:
+        match = BOX_DATE.search(text + f.read())
+
+    if not match:
+        return ''
+
+    d = datetime.datetime.strptime(match.group(1).decode(), '%m/%d/%Y')
+    return encode_datetime(datetime_datetime_pst(d.year, d.month, d.day))
+
 
 def _repl(m):
     encoding = search(r'player_(\d+)\.html', m.group(1))
@@ -41,23 +185,59 @@ def _sub(text):
     return re.sub(r'(?s)(<a href="[^"]+">)(.+?)</a>', _repl, text)
 
 
-def download_file(url):
-    """Download and unpack the league file.
+def download_file(url, unzip=False):
+    """Download (and optionally unpack) the league file.
+
+    The league file is streamed to disk in chunks, and an interrupted download
+    is resumed from the partial file left behind by the previous attempt. The
+    completed archive has its size and member checksums verified before it is
+    kept. By default the league file is left zipped, since extraction can read
+    the needed members directly from the archive.
 
     Args:
         url: The url of the league file.
+        unzip: Whether to also unpack the league file to disk.
 
     Returns:
-        Subprocess output describing the download status.
+        Output describing the download status.
     """
-    check_output(['rm', '-rf', DOWNLOAD_DIR])
-    check_output(['mkdir', DOWNLOAD_DIR])
-
-    with chdir(DOWNLOAD_DIR):
-        filename = url.rsplit('/', 1)[1].replace('%20', '_')
-        output = check_output(['wget', url, '-O', filename], timeout=4800)
-        if output.get('ok'):
-            check_output(['unzip', filename])
+    filename = url.rsplit('/', 1)[1].replace('%20', '_')
+    path = os.path.join(DOWNLOAD_DIR, filename)
+
+    if os.path.isdir(DOWNLOAD_DIR):
+        for name in os.listdir(DOWNLOAD_DIR):
+            if name != filename + '.part':
+                check_output(['rm', '-rf', os.path.join(DOWNLOAD_DIR, name)])
+    else:
+        check_output(['mkdir', DOWNLOAD_DIR])
+
+    ok = download(url, path, retries=DOWNLOAD_RETRIES, progress=_progress())
+    if not ok:
+        e = 'Download of {} did not complete.'.format(url)
+        return {'ok': False, 'stdout': e, 'stderr': e}
+
+    error = None
+    try:
+        with zipfile.ZipFile(path) as zf:
+            bad = zf.testzip()
+            if bad:
+                error = 'Checksum mismatch for {} in {}.'.format(bad, filename)
+    except Exception as e:
+        error = 'Invalid league file {} ({}).'.format(filename, e)
+
+    if error:
+        os.remove(path)
+        return {'ok': False, 'stdout': error, 'stderr': error}
+
+    size = os.path.getsize(path) / MB
+    msg = 'Verified {} ({:.1f} MB).'.format(filename, size)
+    _logger.log(logging.INFO, msg)
+
+    output = {'ok': True, 'stdout': '', 'stderr': ''}
+
+    if unzip:
+        with chdir(DOWNLOAD_DIR):
+            output = check_output(['unzip', filename])
 
     return output
 
@@ -81,48 +261,54 @@ def extract_file(start):
         check_output(['rm', '-rf', d])
         check_output(['mkdir', d])
 
+    league_file = _open_league_file()
+    index = loads(EXTRACT_INDEX) if os.path.isfile(EXTRACT_INDEX) else {}
+    seen = {}
+
     end = start
-    for box in os.listdir(DOWNLOAD_BOX_SCORES):
-        box_fname = os.path.join(DOWNLOAD_BOX_SCORES, box)
-        if not os.path.isfile(box_fname):
+    for box in league_file.listdir(BOX_SCORES):
+        if not league_file.isfile(BOX_SCORES, box):
             continue
 
         game = box.replace('game_box', 'log').replace('html', 'txt')
-        game_fname = os.path.join(DOWNLOAD_LEAGUES, game)
-        if not os.path.isfile(game_fname):
+        if not league_file.isfile(LEAGUES, game):
             continue
 
-        with open(box_fname, 'r', encoding='iso-8859-1') as f:
-            box_read = f.read()
-
-        with open(game_fname, 'r', encoding='iso-8859-1') as f:
-            game_read = f.read()
+        size = league_file.getsize(BOX_SCORES, box)
+        if box in index and index[box][0] == size:
+            encoded = index[box][1]
+        else:
+            with league_file.open(BOX_SCORES, box) as f:
+                encoded = _read_date(f)
+        seen[box] = [size, encoded]
 
-        match = search(r'MLB Box Score[^\d]+(\d{2}\/\d{2}\/\d{4})', box_read)
-        if not match:
+        if not encoded:
             continue
 
-        d = datetime.datetime.strptime(match, '%m/%d/%Y')
-        date = datetime_datetime_pst(d.year, d.month, d.day)
+        date = decode_datetime(encoded)
         if date < start:
             continue
 
-        with open(os.path.join(EXTRACT_BOX_SCORES, box), 'w') as f:
-            f.write(box_read)
-
-        with open(os.path.join(EXTRACT_GAME_LOGS, game), 'w') as f:
-            f.write(game_read)
+        box_fname = os.path.join(EXTRACT_BOX_SCORES, box)
+        league_file.copy(BOX_SCORES, box, box_fname)
+        game_fname = os.path.join(EXTRACT_GAME_LOGS, game)
+        league_file.copy(LEAGUES, game, game_fname)
 
         if date >= end:
             end = date + datetime.timedelta(days=1)
 
+    if seen != index:
+        with open(EXTRACT_INDEX, 'w') as f:
+            f.write(dumps(seen) + '\n')
+
     encodings = set()
     for name in ['injuries', 'news', 'transactions']:
-        path = os.path.join(DOWNLOAD_LEAGUES, 'league_100_{}.txt'.format(name))
+        league = 'league_100_{}.txt'.format(name)
 
         data = {}
-        if os.path.isfile(path):
-            with open(path, 'r', encoding='iso-8859-1') as f:
+        if league_file.isfile(LEAGUES, league):
+            f = league_file.open(LEAGUES, league)
+            with io.TextIOWrapper(f, encoding='iso-8859-1') as f:
                 read = re.sub(r'[ ]+', ' ', f.read())
 
             read = _sub(decoding_to_encoding_sub(read))
@@ -149,6 +335,7 @@ def extract_file(start):
         with open(os.path.join(EXTRACT_LEAGUES, name + '.json'), 'w') as f:
             f.write(dumps(data) + '\n')
 
+    league_file.close()
     put_players(list(sorted(encodings)))
 
     return end
@@ -2,38 +2,33 @@
 # -*- coding: utf-8 -*-
 """Tests for leaguefile.py."""
 
+import json
+import logging
 import os
 import re
+import shutil
 import sys
+import tempfile
 import unittest
 import unittest.mock as mock
+import zipfile
 
 _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(re.sub(r'/services/leaguefile', '', _path))
 
 from common.datetime_.datetime_ import datetime_datetime_pst  # noqa
-from common.test.test import RMock  # noqa
-from common.test.test import Suite  # noqa
-from common.test.test import WMock  # noqa
 from common.test.test import get_testdata  # noqa
+from common.test.test import serve  # noqa
+from services.leaguefile import leaguefile  # noqa
 from services.leaguefile.leaguefile import download_file  # noqa
-from services.leaguefile.leaguefile import extract_file  # noqa
 
 DATE_08280000 = datetime_datetime_pst(2024, 8, 28)
 DATE_08310000 = datetime_datetime_pst(2024, 8, 31)
 DATE_10260000 = datetime_datetime_pst(1985, 10, 26)
 DATE_10260604 = datetime_datetime_pst(1985, 10, 26, 6, 4)
 
-DOWNLOAD_DIR = re.sub(r'/services/leaguefile', '/resources/download', _path)
-DOWNLOAD_BOX_SCORES = os.path.join(DOWNLOAD_DIR, 'news/html/box_scores')
-DOWNLOAD_LEAGUES = os.path.join(DOWNLOAD_DIR, 'news/txt/leagues')
+TESTDATA_DIR = re.sub(r'/services/leaguefile', '/common/test/testdata', _path)
 
-EXTRACT_DIR = re.sub(r'/services/leaguefile', '/resources/extract', _path)
-EXTRACT_BOX_SCORES = os.path.join(EXTRACT_DIR, 'box_scores')
-EXTRACT_GAME_LOGS = os.path.join(EXTRACT_DIR, 'game_logs')
-EXTRACT_LEAGUES = os.path.join(EXTRACT_DIR, 'leagues')
-
-FILE_HOST = 'https://statsplus.net/oblootp/files/'
 ISO = 'iso-8859-1'
 
 PLAYERS = [
@@ -52,95 +47,241 @@ PLAYERS = [
 
 TESTDATA = get_testdata()
 
+BOX_SCORES = [
+    'game_box_2449.html', 'game_box_2469.html', 'game_box_2476.html'
+]
+LEAGUES = [
+    'league_100_injuries.txt', 'league_100_news.txt',
+    'league_100_transactions.txt', 'log_2449.txt', 'log_2469.txt',
+    'log_2476.txt'
+]
+
 
 class LeaguefileTest(unittest.TestCase):
-    @mock.patch('services.leaguefile.leaguefile.chdir')
-    @mock.patch('services.leaguefile.leaguefile.check_output')
-    def test_download_file__ok(self, mock_check, mock_chdir):
-        url = FILE_HOST + 'orange%20and%20blue%20league.zip'
-        expected = {'ok': True}
-        mock_check.return_value = expected
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+
+        self.dirs = {}
+        for name in [
+                'DOWNLOAD_DIR', 'DOWNLOAD_BOX_SCORES', 'DOWNLOAD_LEAGUES',
+                'EXTRACT_BOX_SCORES', 'EXTRACT_GAME_LOGS', 'EXTRACT_LEAGUES'
+        ]:
+            self.dirs[name] = os.path.join(tmpdir.name, name.lower())
+            os.mkdir(self.dirs[name])
+            dir_patch = mock.patch.object(leaguefile, name, self.dirs[name])
+            self.addCleanup(dir_patch.stop)
+            dir_patch.start()
+
+        self.index = os.path.join(tmpdir.name, 'index.json')
+        index_patch = mock.patch.object(leaguefile, 'EXTRACT_INDEX',
+                                        self.index)
+        self.addCleanup(index_patch.stop)
+        index_patch.start()
+
+        for name in BOX_SCORES:
+            self.copy(name, 'DOWNLOAD_BOX_SCORES')
+        for name in LEAGUES:
+            self.copy(name, 'DOWNLOAD_LEAGUES')
+
+    def clear(self, *keys):
+        for key in keys:
+            for name in os.listdir(self.dirs[key]):
+                os.remove(os.path.join(self.dirs[key], name))
+
+    def copy(self, name, key):
+        shutil.copy(os.path.join(TESTDATA_DIR, name), self.dirs[key])
+
+    def assertExtracted(self, names):
+        boxes = sorted('game_box_{}.html'.format(num) for num in names)
+        logs = sorted('log_{}.txt'.format(num) for num in names)
+        extracted = sorted(os.listdir(self.dirs['EXTRACT_BOX_SCORES']))
+        self.assertEqual(extracted, boxes)
+        extracted = sorted(os.listdir(self.dirs['EXTRACT_GAME_LOGS']))
+        self.assertEqual(extracted, logs)
+
+        for key, name in [('EXTRACT_BOX_SCORES', n) for n in boxes] + [
+                ('EXTRACT_GAME_LOGS', n) for n in logs]:
+            with open(os.path.join(TESTDATA_DIR, name), 'rb') as f:
+                expected = f.read()
+            with open(os.path.join(self.dirs[key], name), 'rb') as f:
+                self.assertEqual(f.read(), expected)
+
+        for name in ['injuries', 'news', 'transactions']:
+            fname = os.path.join(self.dirs['EXTRACT_LEAGUES'], name + '.json')
+            with open(fname, 'r') as f:
+                self.assertEqual(f.read(), TESTDATA[name + '.json'])
 
+    def archive(self, filename):
+        with zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for name in BOX_SCORES:
+                path = os.path.join(TESTDATA_DIR, name)
+                zf.write(path, 'news/html/box_scores/' + name)
+            for name in LEAGUES:
+                path = os.path.join(TESTDATA_DIR, name)
+                zf.write(path, 'news/txt/leagues/' + name)
+            zf.writestr('news/html/players/player_1.html', 'ignored')
+
+    def serve(self, drops=0):
+        files = os.path.join(self.tmpdir, 'files')
+        os.mkdir(files)
+        self.archive(os.path.join(files, 'orange and blue league.zip'))
+        with open(os.path.join(files, 'corrupt.zip'), 'wb') as f:
+            f.write(b'PK' + bytes(1024))
+
+        server = serve(self, files, drops=drops)
+        return server.url + '/'
+
+    @mock.patch.object(leaguefile, '_logger')
+    @mock.patch.object(leaguefile, 'chdir')
+    @mock.patch.object(leaguefile, 'check_output')
+    def test_download_file__corrupt(self, mock_check, mock_chdir, mock_log):
+        url = self.serve() + 'corrupt.zip'
         actual = download_file(url)
-        self.assertEqual(actual, expected)
+        self.assertFalse(actual['ok'])
+
+        self.assertEqual(os.listdir(self.dirs['DOWNLOAD_DIR']), [])
+        mock_chdir.assert_not_called()
+
+    @mock.patch.object(leaguefile, '_logger')
+    @mock.patch.object(leaguefile, 'put_players')
+    @mock.patch.object(leaguefile, 'check_output')
+    def test_download_file__ok(self, mock_check, mock_put, mock_log):
+        old = os.path.join(self.dirs['DOWNLOAD_DIR'], 'old.zip')
+        with open(old, 'w') as f:
+            f.write('old')
+
+        url = self.serve() + 'orange%20and%20blue%20league.zip'
+        actual = download_file(url)
+        self.assertEqual(actual, {'ok': True, 'stdout': '', 'stderr': ''})
 
         filename = 'orange_and_blue_league.zip'
-        mock_check.assert_has_calls([
-            mock.call(['rm', '-rf', DOWNLOAD_DIR]),
-            mock.call(['mkdir', DOWNLOAD_DIR]),
-            mock.call(['wget', url, '-O', filename], timeout=4800),
-            mock.call(['unzip', filename]),
-        ])
-        mock_chdir.assert_called_once_with(DOWNLOAD_DIR)
-
-    @mock.patch('services.leaguefile.leaguefile.chdir')
-    @mock.patch('services.leaguefile.leaguefile.check_output')
-    def test_download_file__timeout(self, mock_check, mock_chdir):
-        url = FILE_HOST + 'orange%20and%20blue%20league.zip'
-        e = 'Command \'wget {}\' timed out after {} seconds'.format(url, 4800)
-        expected = {'ok': False, 'stdout': e, 'stderr': e}
-        mock_check.return_value = expected
+        download_dir = self.dirs['DOWNLOAD_DIR']
+        mock_check.assert_called_once_with(
+            ['rm', '-rf', os.path.join(download_dir, 'old.zip')])
+        path = os.path.join(download_dir, filename)
+        self.assertTrue(zipfile.is_zipfile(path))
+        msg = 'Verified {} (0.0 MB).'.format(filename)
+        mock_log.log.assert_called_with(logging.INFO, msg)
+
+        os.remove(old)
+        self.clear('DOWNLOAD_BOX_SCORES', 'DOWNLOAD_LEAGUES')
+        actual = leaguefile.extract_file(DATE_08280000)
+        self.assertEqual(actual, DATE_08310000)
+        self.assertExtracted(['2449', '2469', '2476'])
 
-        url = FILE_HOST + 'orange%20and%20blue%20league%20baseball.zip'
+    @mock.patch.object(leaguefile, '_logger')
+    @mock.patch.object(leaguefile, 'check_output')
+    @mock.patch('common.requests_.requests_._logger')
+    @mock.patch('common.requests_.requests_.time.sleep')
+    def test_download_file__resume(self, mock_sleep, mock_warn, mock_check,
+                                   mock_log):
+        url = self.serve(drops=2) + 'orange%20and%20blue%20league.zip'
         actual = download_file(url)
+        self.assertTrue(actual['ok'])
+
+        filename = 'orange_and_blue_league.zip'
+        download_dir = self.dirs['DOWNLOAD_DIR']
+        path = os.path.join(download_dir, filename)
+        self.assertTrue(zipfile.is_zipfile(path))
+        self.assertFalse(os.path.exists(path + '.part'))
+        mock_sleep.assert_has_calls([mock.call(1), mock.call(2)])
+
+    @mock.patch.object(leaguefile, '_logger')
+    @mock.patch.object(leaguefile, 'check_output')
+    @mock.patch('common.requests_.requests_._logger')
+    @mock.patch('common.requests_.requests_.time.sleep')
+    def test_download_file__timeout(self, mock_sleep, mock_warn, mock_check,
+                                    mock_log):
+        url = self.serve(drops=12) + 'orange%20and%20blue%20league.zip'
+        actual = download_file(url)
+        e = 'Download of {} did not complete.'.format(url)
+        self.assertEqual(actual, {'ok': False, 'stdout': e, 'stderr': e})
+
+        filename = 'orange_and_blue_league.zip'
+        download_dir = self.dirs['DOWNLOAD_DIR']
+        self.assertIn(filename + '.part', os.listdir(download_dir))
+        self.assertEqual(mock_sleep.call_count, 5)
+
+        mock_check.reset_mock()
+        actual = download_file(url)
+        self.assertFalse(actual['ok'])
+        for call in mock_check.call_args_list:
+            self.assertNotIn(filename + '.part', call[0][0][-1])
+
+    @mock.patch.object(leaguefile, '_logger')
+    @mock.patch.object(leaguefile, 'chdir')
+    @mock.patch.object(leaguefile, 'check_output')
+    def test_download_file__unzip(self, mock_check, mock_chdir, mock_log):
+        expected = {'ok': True}
+        mock_check.return_value = expected
+
+        url = self.serve() + 'orange%20and%20blue%20league.zip'
+        actual = download_file(url, unzip=True)
         self.assertEqual(actual, expected)
 
-        filename = 'orange_and_blue_league_baseball.zip'
-        mock_check.assert_has_calls([
-            mock.call(['rm', '-rf', DOWNLOAD_DIR]),
-            mock.call(['mkdir', DOWNLOAD_DIR]),
-            mock.call(['wget', url, '-O', filename], timeout=4800),
-        ])
-        mock_chdir.assert_called_once_with(DOWNLOAD_DIR)
-
-    @mock.patch('services.leaguefile.leaguefile.put_players')
-    @mock.patch('services.leaguefile.leaguefile.open', create=True)
-    @mock.patch('services.leaguefile.leaguefile.os.listdir')
-    @mock.patch('services.leaguefile.leaguefile.os.path.isfile')
-    @mock.patch('services.leaguefile.leaguefile.check_output')
-    def test_extract_file(self, mock_check, mock_isfile, mock_listdir,
-                          mock_open, mock_put):
-        mock_isfile.return_value = True
-        mock_listdir.return_value = [
-            'game_box_2449.html', 'game_box_2469.html', 'game_box_2476.html'
-        ]
-        suite = Suite(
-            RMock(DOWNLOAD_BOX_SCORES, 'game_box_2449.html', TESTDATA),
-            RMock(DOWNLOAD_LEAGUES, 'log_2449.txt', TESTDATA),
-            WMock(EXTRACT_BOX_SCORES, 'game_box_2449.html', TESTDATA),
-            WMock(EXTRACT_GAME_LOGS, 'log_2449.txt', TESTDATA),
-            RMock(DOWNLOAD_BOX_SCORES, 'game_box_2469.html', TESTDATA),
-            RMock(DOWNLOAD_LEAGUES, 'log_2469.txt', TESTDATA),
-            WMock(EXTRACT_BOX_SCORES, 'game_box_2469.html', TESTDATA),
-            WMock(EXTRACT_GAME_LOGS, 'log_2469.txt', TESTDATA),
-            RMock(DOWNLOAD_BOX_SCORES, 'game_box_2476.html', TESTDATA),
-            RMock(DOWNLOAD_LEAGUES, 'log_2476.txt', TESTDATA),
-            WMock(EXTRACT_BOX_SCORES, 'game_box_2476.html', TESTDATA),
-            WMock(EXTRACT_GAME_LOGS, 'log_2476.txt', TESTDATA),
-            RMock(DOWNLOAD_LEAGUES, 'league_100_injuries.txt', TESTDATA),
-            WMock(EXTRACT_LEAGUES, 'injuries.json', TESTDATA),
-            RMock(DOWNLOAD_LEAGUES, 'league_100_news.txt', TESTDATA),
-            WMock(EXTRACT_LEAGUES, 'news.json', TESTDATA),
-            RMock(DOWNLOAD_LEAGUES, 'league_100_transactions.txt', TESTDATA),
-            WMock(EXTRACT_LEAGUES, 'transactions.json', TESTDATA),
-        )
-        mock_open.side_effect = suite.values()
-
-        actual = extract_file(DATE_08280000)
+        filename = 'orange_and_blue_league.zip'
+        mock_check.assert_called_with(['unzip', filename])
+        mock_chdir.assert_called_once_with(self.dirs['DOWNLOAD_DIR'])
+
+    @mock.patch.object(leaguefile, 'put_players')
+    @mock.patch.object(leaguefile, 'check_output')
+    def test_extract_file(self, mock_check, mock_put):
+        actual = leaguefile.extract_file(DATE_08280000)
+        self.assertEqual(actual, DATE_08310000)
+
+        calls = []
+        for name in ['EXTRACT_BOX_SCORES', 'EXTRACT_GAME_LOGS',
+                     'EXTRACT_LEAGUES']:
+            calls.append(mock.call(['rm', '-rf', self.dirs[name]]))
+            calls.append(mock.call(['mkdir', self.dirs[name]]))
+        mock_check.assert_has_calls(calls)
+        mock_put.assert_called_once_with(PLAYERS)
+        self.assertExtracted(['2449', '2469', '2476'])
+
+        with open(self.index, 'r') as f:
+            index = json.loads(f.read())
+        self.assertEqual(sorted(index), BOX_SCORES)
+
+    @mock.patch.object(leaguefile, 'put_players')
+    @mock.patch.object(leaguefile, 'check_output')
+    def test_extract_file__archive(self, mock_check, mock_put):
+        self.archive(os.path.join(self.dirs['DOWNLOAD_DIR'], 'league.zip'))
+        self.clear('DOWNLOAD_BOX_SCORES', 'DOWNLOAD_LEAGUES')
+
+        actual = leaguefile.extract_file(DATE_08280000)
         self.assertEqual(actual, DATE_08310000)
 
-        mock_check.assert_has_calls([
-            mock.call(['rm', '-rf', EXTRACT_BOX_SCORES]),
-            mock.call(['mkdir', EXTRACT_BOX_SCORES]),
-            mock.call(['rm', '-rf', EXTRACT_GAME_LOGS]),
-            mock.call(['mkdir', EXTRACT_GAME_LOGS]),
-            mock.call(['rm', '-rf', EXTRACT_LEAGUES]),
-            mock.call(['mkdir', EXTRACT_LEAGUES]),
-        ])
-        mock_listdir.assert_called_once_with(DOWNLOAD_BOX_SCORES)
-        mock_open.assert_has_calls(suite.calls())
         mock_put.assert_called_once_with(PLAYERS)
-        suite.verify()
+        self.assertExtracted(['2449', '2469', '2476'])
+
+    @mock.patch.object(leaguefile, 'put_players')
+    @mock.patch.object(leaguefile, 'check_output')
+    @mock.patch.object(leaguefile, '_read_date', wraps=leaguefile._read_date)
+    def test_extract_file__index(self, mock_read, mock_check, mock_put):
+        actual = leaguefile.extract_file(DATE_08280000)
+        self.assertEqual(actual, DATE_08310000)
+        self.assertEqual(mock_read.call_count, 3)
+
+        self.clear('EXTRACT_BOX_SCORES', 'EXTRACT_GAME_LOGS')
+        mock_read.reset_mock()
+
+        actual = leaguefile.extract_file(DATE_08280000)
+        self.assertEqual(actual, DATE_08310000)
+        mock_read.assert_not_called()
+        self.assertExtracted(['2449', '2469', '2476'])
+
+        self.clear('EXTRACT_BOX_SCORES', 'EXTRACT_GAME_LOGS')
+        mock_read.reset_mock()
+        fname = os.path.join(self.dirs['DOWNLOAD_BOX_SCORES'],
+                             'game_box_2476.html')
+        with open(fname, 'ab') as f:
+            f.write(b'\n')
+
+        actual = leaguefile.extract_file(DATE_08280000)
+        self.assertEqual(actual, DATE_08310000)
+        self.assertEqual(mock_read.call_count, 1)
 
 
 if __name__ == '__main__':
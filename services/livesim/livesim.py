@@ -1,7 +1,30 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Service (reloadable) methods for displaying live sim data."""
+"""Service (reloadable) methods for displaying live sim data.
 
+Game events are replayed through a table which maps each event to its handler
+(and to a step shared by a group of events, if any). The table is filled in by
+the handlers' decorators as the module is imported, so that it is rebuilt
+whenever the service is reloaded.
+
+In compact mode, the live and old tables are not rendered into the page as
+HTML. Instead, every distinct string is emitted once in a string table, and
+every distinct list of cells once in a cell table, so that a live row and the
+old row it mirrors share their cells. The tables then refer to those entries by
+index, and the page script materialises both views.
+
+The replay can be checkpointed at inning boundaries. The roster, state, and
+tables at the start of the last inning replayed are written to the git-ignored
+cache directory, together with a hash of the events before it. A later replay
+of the same game (for instance, once more of it has been simmed) resumes from
+there instead of from the first event. Since the tables hold rendered player
+names, the checkpoint is keyed on the reference data of every player in the
+game, as well as on the source of the services which do the rendering, and a
+checkpoint is discarded as soon as either changes.
+"""
+
+import hashlib
+import json
 import os
 import re
 import sys
@@ -19,10 +42,21 @@ from common.events.events import get_outcome  # noqa
 from common.events.events import get_position  # noqa
 from common.events.events import get_seats  # noqa
 from common.json_.json_ import loads  # noqa
+from common.reference.reference import get_attribute  # noqa
 from common.reference.reference import player_to_name_sub  # noqa
 from common.service.service import call_service  # noqa
 from types_.event.event import Event  # noqa
 
+CHECKPOINT_SOURCES = [
+    'common/elements/elements.py',
+    'services/livesim/livesim.py',
+    'services/roster/roster.py',
+    'services/state/state.py',
+    'services/tables/tables.py',
+]
+ROOT_DIR = re.sub(r'/services/livesim', '', _path)
+CHECKPOINT_DIR = os.path.join(ROOT_DIR, 'resources/cache/livesim')
+
 EVENT_CHANGES = [
     Event.CHANGE_INNING,
     Event.CHANGE_BATTER,
@@ -32,612 +66,900 @@ EVENT_CHANGES = [
     Event.CHANGE_PITCHER,
 ]
 
+HANDLERS = {}
 
-def _check_change_events(e, args, roster, state, tables):
-    if e == Event.CHANGE_INNING:
-        aruns, hruns = [int(a) for a in args]
-        state.set_change_inning()
-        if aruns != state.get_runs_away() or hruns != state.get_runs_home():
-            state.set_runs(aruns, hruns)
-            text = state.to_score_long_str()
-            body = roster.create_bolded_row('Score Update', text)
-            tables.append_old_body(body)
-            tables.append_all()
-            tables.reset_all()
-    elif state.get_change_inning():
-        roster.handle_change_inning()
-        state.handle_change_inning(tables)
 
-    if e in [Event.CHANGE_BATTER, Event.CHANGE_PINCH_HITTER]:
-        batter, = args
-        roster.handle_change_batter(batter, tables)
-        state.handle_change_batter(tables)
-        tables.create_old_table(roster, state)
-    if e == Event.CHANGE_FIELDER:
-        _, player = args
-        roster.handle_change_fielder(player, tables)
-    if e == Event.CHANGE_PINCH_RUNNER:
-        base, runner = args
-        roster.handle_change_runner(runner, tables)
-        state.handle_change_runner(get_base(base), runner)
-    if e == Event.CHANGE_PITCHER:
-        pitcher, = args
-        if roster.is_change_pitcher(pitcher):
-            roster.handle_change_pitcher(pitcher, tables)
-
-
-EVENT_BATTER_REACHES = [
-    Event.BATTER_SINGLE,
-    Event.BATTER_SINGLE_BATTED_OUT,
-    Event.BATTER_SINGLE_BUNT,
-    Event.BATTER_SAC_BUNT_HIT,
-    Event.BATTER_SINGLE_INFIELD,
-    Event.BATTER_SINGLE_ERR,
-    Event.BATTER_SINGLE_STRETCH,
-    Event.BATTER_DOUBLE,
-    Event.BATTER_DOUBLE_STRETCH,
-    Event.BATTER_TRIPLE,
-    Event.BATTER_HOME_RUN,
-    Event.BATTER_HOME_RUN_INSIDE,
-    Event.BATTER_REACH_DROPPED,
-    Event.BATTER_REACH_FIELDING,
-    Event.BATTER_REACH_INTERFERENCE,
-]
+def _handles(*events, before=None):
+    """Registers the decorated function as the handler of the given events.
 
+    Since the table is filled in as the module is imported, reloading the
+    service rebuilds it against the reloaded handlers.
 
-def _check_batter_reach_events(e, args, roster, state, tables):
+    Args:
+        events: The events to handle.
+        before: An optional function, shared by a group of events, to call
+            before the handler.
+    """
+    def _register(f):
+        for e in events:
+            HANDLERS[e] = (before, f) if before else (f, )
+        return f
+
+    return _register
+
+
+def _create_summary(e, args, roster, state, tables):
     if tables.get_summary():
         state.create_summary_row(tables)
         tables.reset_summary()
 
-    batter = roster.get_batter()
+
+def _create_summary_inplay(e, args, roster, state, tables):
+    _create_summary(e, args, roster, state, tables)
     state.set_inplay()
-    if e == Event.BATTER_SINGLE:
-        path, zone = args
-        outcome = get_outcome(path, False)
-        fielder = roster.get_title_fielder(get_position(zone, True))
-        tables.append_summary('{} singles on a {} to {}.'.format(
-            batter, outcome, fielder))
-        state.handle_batter_to_base(batter, 1)
-    if e == Event.BATTER_SINGLE_INFIELD:
-        path, zone = args
-        outcome = get_outcome(path, False)
-        fielder = roster.get_title_fielder(get_position(zone, False))
-        tables.append_summary('{} singles on a {} to {}.'.format(
-            batter, outcome, fielder))
-        state.handle_batter_to_base(batter, 1)
-    if e == Event.BATTER_SINGLE_BATTED_OUT:
-        path, zone = args
-        outcome = get_outcome(path, False)
-        fielder = roster.get_title_fielder(get_position(zone, False))
-        tables.append_summary('{} singles on a {} to {}.'.format(
-            batter, outcome, fielder))
-        base = 1 if ('3' in zone or '4' in zone) else 2
-        runner = state.get_runner(base)
-        advance = '2nd' if base == 1 else '3rd'
-        tables.append_summary('{} out at {} (hit by batted ball).'.format(
-            runner, advance))
-        state.handle_out_runner(base)
-        state.handle_batter_to_base(batter, 1)
-    if e in [Event.BATTER_SINGLE_BUNT, Event.BATTER_SAC_BUNT_HIT]:
-        zone, = args
-        fielder = roster.get_title_fielder(get_position(zone, False))
-        tables.append_summary('{} singles on a bunt ground ball to {}.'.format(
-            batter, fielder))
-        state.handle_batter_to_base(batter, 1)
-    if e == Event.BATTER_SINGLE_ERR:
-        scoring, path, _ = args
-        outcome = get_outcome(path, False)
-        fielder = roster.get_title_fielder(get_position(scoring, True))
-        tables.append_summary('{} singles on a {} to {}.'.format(
-            batter, outcome, fielder))
-        tables.append_summary(
-            '{} advances to 2nd, on a fielding error by {}.'.format(
-                batter, fielder))
-        state.handle_batter_to_base(batter, 2)
-    if e == Event.BATTER_SINGLE_STRETCH:
-        path, zone = args
-        outcome = get_outcome(path, False)
-        fielder = roster.get_title_fielder(get_position(zone, False))
-        receiver = roster.get_title_fielder('2B' if '7' in zone else 'SS')
-        tables.append_summary('{} singles on a {} to {}.'.format(
-            batter, outcome, fielder))
-        tables.append_summary('{} out at 2nd, {} to {}.'.format(
-            batter, fielder, receiver))
-        state.handle_batter_to_base(batter, 2)
-        state.handle_out_runner(2)
-    if e == Event.BATTER_DOUBLE:
-        path, zone = args
-        outcome = get_outcome(path, False)
-        fielder = roster.get_title_fielder(get_position(zone, True))
-        tables.append_summary('{} doubles on a {} to {}.'.format(
-            batter, outcome, fielder))
-        state.handle_batter_to_base(batter, 2)
-    if e == Event.BATTER_DOUBLE_STRETCH:
-        path, zone = args
-        outcome = get_outcome(path, False)
-        fielder = roster.get_title_fielder(get_position(zone, False))
-        receiver = roster.get_title_fielder('3B')
-        tables.append_summary('{} doubles on a {} to {}.'.format(
-            batter, outcome, fielder))
-        tables.append_summary('{} out at 3rd, {} to {}.'.format(
-            batter, fielder, receiver))
-        state.handle_batter_to_base(batter, 3)
-        state.handle_out_runner(3)
-    if e == Event.BATTER_TRIPLE:
-        path, zone = args
-        outcome = get_outcome(path, False)
-        fielder = roster.get_title_fielder(get_position(zone, True))
-        tables.append_summary('{} triples on a {} to {}.'.format(
-            batter, outcome, fielder))
-        state.handle_batter_to_base(batter, 3)
-    if e == Event.BATTER_HOME_RUN:
-        path, zone, distance = args
-        outcome = get_outcome(path, False)
-        tables.append_summary('{} homers on a {} to {} ({} ft).'.format(
-            batter, outcome, get_seats(zone), distance))
-        state.handle_batter_to_base(batter, 4)
-    if e == Event.BATTER_HOME_RUN_INSIDE:
-        path, zone = args
-        outcome = get_outcome(path, False)
-        tables.append_summary(
-            '{} hits an inside-the-park home run on a {} to {}.'.format(
-                batter, outcome, get_seats(zone)))
-        state.handle_batter_to_base(batter, 4)
-    if e == Event.BATTER_REACH_DROPPED:
-        position, scoring, _ = args
-        fielder = roster.get_title_fielder(position)
-        receiver = roster.get_title_fielder(get_position(scoring, False))
-        tables.append_summary(
-            '{} reaches on a missed catch error by {}, assist to {}.'.format(
-                batter, receiver, fielder))
-        state.handle_batter_to_base(batter, 1)
-    if e == Event.BATTER_REACH_FIELDING:
-        scoring, _1, _2 = args
-        fielder = roster.get_title_fielder(get_position(scoring, False))
-        tables.append_summary('{} reaches on a fielding error by {}.'.format(
+
+
+def _handle_change_inning(e, args, roster, state, tables):
+    if state.get_change_inning():
+        roster.handle_change_inning()
+        state.handle_change_inning(tables)
+
+
+@_handles(Event.CHANGE_INNING)
+def _change_inning(e, args, roster, state, tables):
+    aruns, hruns = [int(a) for a in args]
+    state.set_change_inning()
+    if aruns != state.get_runs_away() or hruns != state.get_runs_home():
+        state.set_runs(aruns, hruns)
+        text = state.to_score_long_str()
+        body = roster.create_bolded_row('Score Update', text)
+        tables.append_old_body(body)
+        tables.append_all()
+        tables.reset_all()
+
+
+@_handles(Event.CHANGE_BATTER,
+          Event.CHANGE_PINCH_HITTER,
+          before=_handle_change_inning)
+def _change_batter(e, args, roster, state, tables):
+    batter, = args
+    roster.handle_change_batter(batter, tables)
+    state.handle_change_batter(tables)
+    tables.create_old_table(roster, state)
+
+
+@_handles(Event.CHANGE_FIELDER, before=_handle_change_inning)
+def _change_fielder(e, args, roster, state, tables):
+    _, player = args
+    roster.handle_change_fielder(player, tables)
+
+
+@_handles(Event.CHANGE_PINCH_RUNNER, before=_handle_change_inning)
+def _change_pinch_runner(e, args, roster, state, tables):
+    base, runner = args
+    roster.handle_change_runner(runner, tables)
+    state.handle_change_runner(get_base(base), runner)
+
+
+@_handles(Event.CHANGE_PITCHER, before=_handle_change_inning)
+def _change_pitcher(e, args, roster, state, tables):
+    pitcher, = args
+    if roster.is_change_pitcher(pitcher):
+        roster.handle_change_pitcher(pitcher, tables)
+
+
+@_handles(Event.BATTER_SINGLE, before=_create_summary_inplay)
+def _batter_single(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone = args
+    outcome = get_outcome(path, False)
+    fielder = roster.get_title_fielder(get_position(zone, True))
+    tables.append_summary('{} singles on a {} to {}.'.format(
+        batter, outcome, fielder))
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.BATTER_SINGLE_INFIELD, before=_create_summary_inplay)
+def _batter_single_infield(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone = args
+    outcome = get_outcome(path, False)
+    fielder = roster.get_title_fielder(get_position(zone, False))
+    tables.append_summary('{} singles on a {} to {}.'.format(
+        batter, outcome, fielder))
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.BATTER_SINGLE_BATTED_OUT, before=_create_summary_inplay)
+def _batter_single_batted_out(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone = args
+    outcome = get_outcome(path, False)
+    fielder = roster.get_title_fielder(get_position(zone, False))
+    tables.append_summary('{} singles on a {} to {}.'.format(
+        batter, outcome, fielder))
+    base = 1 if ('3' in zone or '4' in zone) else 2
+    runner = state.get_runner(base)
+    advance = '2nd' if base == 1 else '3rd'
+    tables.append_summary('{} out at {} (hit by batted ball).'.format(
+        runner, advance))
+    state.handle_out_runner(base)
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.BATTER_SINGLE_BUNT,
+          Event.BATTER_SAC_BUNT_HIT,
+          before=_create_summary_inplay)
+def _batter_single_bunt(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    zone, = args
+    fielder = roster.get_title_fielder(get_position(zone, False))
+    tables.append_summary('{} singles on a bunt ground ball to {}.'.format(
+        batter, fielder))
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.BATTER_SINGLE_ERR, before=_create_summary_inplay)
+def _batter_single_err(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    scoring, path, _ = args
+    outcome = get_outcome(path, False)
+    fielder = roster.get_title_fielder(get_position(scoring, True))
+    tables.append_summary('{} singles on a {} to {}.'.format(
+        batter, outcome, fielder))
+    tables.append_summary(
+        '{} advances to 2nd, on a fielding error by {}.'.format(
             batter, fielder))
+    state.handle_batter_to_base(batter, 2)
+
+
+@_handles(Event.BATTER_SINGLE_STRETCH, before=_create_summary_inplay)
+def _batter_single_stretch(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone = args
+    outcome = get_outcome(path, False)
+    fielder = roster.get_title_fielder(get_position(zone, False))
+    receiver = roster.get_title_fielder('2B' if '7' in zone else 'SS')
+    tables.append_summary('{} singles on a {} to {}.'.format(
+        batter, outcome, fielder))
+    tables.append_summary('{} out at 2nd, {} to {}.'.format(
+        batter, fielder, receiver))
+    state.handle_batter_to_base(batter, 2)
+    state.handle_out_runner(2)
+
+
+@_handles(Event.BATTER_DOUBLE, before=_create_summary_inplay)
+def _batter_double(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone = args
+    outcome = get_outcome(path, False)
+    fielder = roster.get_title_fielder(get_position(zone, True))
+    tables.append_summary('{} doubles on a {} to {}.'.format(
+        batter, outcome, fielder))
+    state.handle_batter_to_base(batter, 2)
+
+
+@_handles(Event.BATTER_DOUBLE_STRETCH, before=_create_summary_inplay)
+def _batter_double_stretch(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone = args
+    outcome = get_outcome(path, False)
+    fielder = roster.get_title_fielder(get_position(zone, False))
+    receiver = roster.get_title_fielder('3B')
+    tables.append_summary('{} doubles on a {} to {}.'.format(
+        batter, outcome, fielder))
+    tables.append_summary('{} out at 3rd, {} to {}.'.format(
+        batter, fielder, receiver))
+    state.handle_batter_to_base(batter, 3)
+    state.handle_out_runner(3)
+
+
+@_handles(Event.BATTER_TRIPLE, before=_create_summary_inplay)
+def _batter_triple(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone = args
+    outcome = get_outcome(path, False)
+    fielder = roster.get_title_fielder(get_position(zone, True))
+    tables.append_summary('{} triples on a {} to {}.'.format(
+        batter, outcome, fielder))
+    state.handle_batter_to_base(batter, 3)
+
+
+@_handles(Event.BATTER_HOME_RUN, before=_create_summary_inplay)
+def _batter_home_run(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone, distance = args
+    outcome = get_outcome(path, False)
+    tables.append_summary('{} homers on a {} to {} ({} ft).'.format(
+        batter, outcome, get_seats(zone), distance))
+    state.handle_batter_to_base(batter, 4)
+
+
+@_handles(Event.BATTER_HOME_RUN_INSIDE, before=_create_summary_inplay)
+def _batter_home_run_inside(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    path, zone = args
+    outcome = get_outcome(path, False)
+    tables.append_summary(
+        '{} hits an inside-the-park home run on a {} to {}.'.format(
+            batter, outcome, get_seats(zone)))
+    state.handle_batter_to_base(batter, 4)
+
+
+@_handles(Event.BATTER_REACH_DROPPED, before=_create_summary_inplay)
+def _batter_reach_dropped(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    position, scoring, _ = args
+    fielder = roster.get_title_fielder(position)
+    receiver = roster.get_title_fielder(get_position(scoring, False))
+    tables.append_summary(
+        '{} reaches on a missed catch error by {}, assist to {}.'.format(
+            batter, receiver, fielder))
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.BATTER_REACH_FIELDING, before=_create_summary_inplay)
+def _batter_reach_fielding(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    scoring, _1, _2 = args
+    fielder = roster.get_title_fielder(get_position(scoring, False))
+    tables.append_summary('{} reaches on a fielding error by {}.'.format(
+        batter, fielder))
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.BATTER_REACH_INTERFERENCE, before=_create_summary_inplay)
+def _batter_reach_interference(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    fielder = roster.get_fielder('C')
+    tables.append_summary('{} reaches on catcher interference by {}.'.format(
+        batter, fielder))
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.BATTER_FLY, before=_create_summary_inplay)
+def _batter_fly(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    scoring, path, _ = args
+    outcome = get_outcome(path, True)
+    fielder = roster.get_title_fielder(get_position(scoring, False))
+    tables.append_summary('{} {} to {}.'.format(batter, outcome, fielder))
+    state.handle_out_batter()
+
+
+@_handles(Event.BATTER_FLY_BUNT, before=_create_summary_inplay)
+def _batter_fly_bunt(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    _, scoring = args
+    fielder = roster.get_title_fielder(get_position(scoring, False))
+    tables.append_summary('{} bunt flies out to {}.'.format(batter, fielder))
+    state.handle_out_batter()
+
+
+@_handles(Event.BATTER_FLY_BUNT_DP, before=_create_summary_inplay)
+def _batter_fly_bunt_dp(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    _1, _2, scoring = args
+    base = 1 if scoring[-1] == '3' else 3 if scoring[-1] == '5' else 2
+    runner = state.get_runner(base)
+    tables.append_summary('{} bunt lines into a double play, {}.'.format(
+        batter, roster.get_scoring(scoring)))
+    tables.append_summary('{} out at {}.'.format(runner, get_bag(base)))
+    state.handle_out_batter()
+    state.handle_out_runner(base)
+
+
+@_handles(Event.BATTER_GROUND,
+          Event.BATTER_GROUND_BUNT,
+          before=_create_summary_inplay)
+def _batter_ground(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    scoring, _ = args
+    outcome = 'bunt ' if e == Event.BATTER_GROUND_BUNT else ''
+    outcome += 'grounds out'
+    tables.append_summary('{} {}, {}.'.format(batter, outcome,
+                                              roster.get_scoring(scoring)))
+    state.handle_out_batter()
+
+
+@_handles(Event.BATTER_GROUND_DP, before=_create_summary_inplay)
+def _batter_ground_dp(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    scoring, _ = args
+    i = 1 if scoring[0] == 'U' else 2
+    base = 3 if scoring[i] == '2' else 2 if scoring[i] == '5' else 1
+    runner = state.get_runner(base)
+    tables.append_summary('{} grounds into a double play, {}.'.format(
+        batter, roster.get_scoring(scoring)))
+    tables.append_summary('{} out at {}.'.format(runner, get_bag(base + 1)))
+    state.handle_out_batter()
+    state.handle_out_runner(base)
+
+
+@_handles(Event.BATTER_GROUND_FC, before=_create_summary_inplay)
+def _batter_ground_fc(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    base, scoring, _ = args
+    base = get_base(base)
+    runner = state.get_runner(base - 1)
+    tables.append_summary('{} grounds into a force out, {}.'.format(
+        batter, roster.get_scoring(scoring)))
+    tables.append_summary('{} out at {}.'.format(runner, get_bag(base)))
+    state.handle_out_runner(base - 1)
+    if state.get_outs() < 3:
+        tables.append_summary('{} to {}.'.format(batter, get_bag(1)))
         state.handle_batter_to_base(batter, 1)
-    if e == Event.BATTER_REACH_INTERFERENCE:
-        fielder = roster.get_fielder('C')
-        tables.append_summary(
-            '{} reaches on catcher interference by {}.'.format(
-                batter, fielder))
+
+
+@_handles(Event.BATTER_GROUND_HOME, before=_create_summary_inplay)
+def _batter_ground_home(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    scoring, _ = args
+    runner = state.get_runner(3)
+    tables.append_summary('{} grounds into a force out, {}.'.format(
+        batter, roster.get_scoring(scoring)))
+    tables.append_summary('{} out at home.'.format(runner))
+    state.handle_out_runner(3)
+    if state.get_outs() < 3:
+        tables.append_summary('{} to {}.'.format(batter, get_bag(1)))
         state.handle_batter_to_base(batter, 1)
 
 
-EVENT_BATTER_OUTS = [
-    Event.BATTER_FLY,
-    Event.BATTER_FLY_BUNT,
-    Event.BATTER_FLY_BUNT_DP,
-    Event.BATTER_GROUND,
-    Event.BATTER_GROUND_BUNT,
-    Event.BATTER_GROUND_DP,
-    Event.BATTER_GROUND_FC,
-    Event.BATTER_GROUND_HOME,
-    Event.BATTER_SINGLE_APPEAL,
-    Event.BATTER_LINED_DP,
-    Event.BATTER_SAC_BUNT,
-    Event.BATTER_SAC_BUNT_DP,
-    Event.BATTER_SAC_BUNT_OUT,
-    Event.BATTER_SAC_BUNT_SAFE,
-]
+@_handles(Event.BATTER_SINGLE_APPEAL, before=_create_summary_inplay)
+def _batter_single_appeal(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    tables.append_summary('{} grounds out, {}.'.format(
+        batter, roster.get_scoring('U3')))
+    state.handle_out_batter()
 
 
-def _check_batter_out_events(e, args, roster, state, tables):
-    if tables.get_summary():
-        state.create_summary_row(tables)
-        tables.reset_summary()
+@_handles(Event.BATTER_LINED_DP, before=_create_summary_inplay)
+def _batter_lined_dp(e, args, roster, state, tables):
+    scoring, _1, _2 = args
+    i = 1 if scoring[0] == 'U' else 2
+    base = 1 if scoring[i] == '3' else 3 if scoring[i] == '5' else 2
+    runner = state.get_runner(base)
+    tables.append_summary('{} out at {}, {}.'.format(
+        runner, get_bag(base), roster.get_scoring(scoring)))
+    state.handle_out_runner(base)
+
 
+@_handles(Event.BATTER_SAC_BUNT, before=_create_summary_inplay)
+def _batter_sac_bunt(e, args, roster, state, tables):
     batter = roster.get_batter()
-    state.set_inplay()
-    if e == Event.BATTER_FLY:
-        scoring, path, _ = args
-        outcome = get_outcome(path, True)
-        fielder = roster.get_title_fielder(get_position(scoring, False))
-        tables.append_summary('{} {} to {}.'.format(batter, outcome, fielder))
-        state.handle_out_batter()
-    if e == Event.BATTER_FLY_BUNT:
-        _, scoring = args
-        fielder = roster.get_title_fielder(get_position(scoring, False))
-        tables.append_summary('{} bunt flies out to {}.'.format(
-            batter, fielder))
-        state.handle_out_batter()
-    if e == Event.BATTER_FLY_BUNT_DP:
-        _1, _2, scoring = args
-        base = 1 if scoring[-1] == '3' else 3 if scoring[-1] == '5' else 2
-        runner = state.get_runner(base)
-        tables.append_summary('{} bunt lines into a double play, {}.'.format(
-            batter, roster.get_scoring(scoring)))
-        tables.append_summary('{} out at {}.'.format(runner, get_bag(base)))
-        state.handle_out_batter()
-        state.handle_out_runner(base)
-    if e in [Event.BATTER_GROUND, Event.BATTER_GROUND_BUNT]:
-        scoring, _ = args
-        outcome = 'bunt ' if e == Event.BATTER_GROUND_BUNT else ''
-        outcome += 'grounds out'
-        tables.append_summary('{} {}, {}.'.format(batter, outcome,
-                                                  roster.get_scoring(scoring)))
-        state.handle_out_batter()
-    if e == Event.BATTER_GROUND_DP:
-        scoring, _ = args
-        i = 1 if scoring[0] == 'U' else 2
-        base = 3 if scoring[i] == '2' else 2 if scoring[i] == '5' else 1
-        runner = state.get_runner(base)
-        tables.append_summary('{} grounds into a double play, {}.'.format(
-            batter, roster.get_scoring(scoring)))
-        tables.append_summary('{} out at {}.'.format(runner,
-                                                     get_bag(base + 1)))
-        state.handle_out_batter()
-        state.handle_out_runner(base)
-    if e == Event.BATTER_GROUND_FC:
-        base, scoring, _ = args
-        base = get_base(base)
-        runner = state.get_runner(base - 1)
-        tables.append_summary('{} grounds into a force out, {}.'.format(
-            batter, roster.get_scoring(scoring)))
-        tables.append_summary('{} out at {}.'.format(runner, get_bag(base)))
-        state.handle_out_runner(base - 1)
-        if state.get_outs() < 3:
-            tables.append_summary('{} to {}.'.format(batter, get_bag(1)))
-            state.handle_batter_to_base(batter, 1)
-    if e == Event.BATTER_GROUND_HOME:
-        scoring, _ = args
-        runner = state.get_runner(3)
-        tables.append_summary('{} grounds into a force out, {}.'.format(
-            batter, roster.get_scoring(scoring)))
-        tables.append_summary('{} out at home.'.format(runner))
-        state.handle_out_runner(3)
-        if state.get_outs() < 3:
-            tables.append_summary('{} to {}.'.format(batter, get_bag(1)))
-            state.handle_batter_to_base(batter, 1)
-    if e == Event.BATTER_SINGLE_APPEAL:
-        tables.append_summary('{} grounds out, {}.'.format(
-            batter, roster.get_scoring('U3')))
-        state.handle_out_batter()
-    if e == Event.BATTER_LINED_DP:
-        scoring, _1, _2 = args
-        i = 1 if scoring[0] == 'U' else 2
-        base = 1 if scoring[i] == '3' else 3 if scoring[i] == '5' else 2
-        runner = state.get_runner(base)
-        tables.append_summary('{} out at {}, {}.'.format(
-            runner, get_bag(base), roster.get_scoring(scoring)))
-        state.handle_out_runner(base)
-    if e == Event.BATTER_SAC_BUNT:
-        _, scoring = args
-        tables.append_summary('{} out on a sacrifice bunt, {}.'.format(
-            batter, roster.get_scoring(scoring)))
-        state.handle_batter_to_base(batter, 1)
-        state.handle_out_runner(1)
-    if e == Event.BATTER_SAC_BUNT_DP:
-        base, _ = args
-        base = get_base(base)
-        scoring = '1-5-3' if base == 3 else '1-6-3'
-        runner = state.get_runner(base - 1)
-        tables.append_summary('{} bunt grounds into a double play, {}.'.format(
-            batter, roster.get_scoring(scoring)))
-        tables.append_summary('{} out at {}.'.format(runner, get_bag(base)))
-        state.handle_out_batter()
-        state.handle_out_runner(base - 1)
-    if e == Event.BATTER_SAC_BUNT_OUT:
-        _, base, scoring = args
-        base = get_base(base)
-        runner = state.get_runner(base - 1)
-        tables.append_summary('{} bunt grounds into a force out, {}.'.format(
-            batter, roster.get_scoring(scoring)))
-        tables.append_summary('{} out at {}.'.format(runner, get_bag(base)))
-        state.handle_out_runner(base - 1)
-        if state.get_outs() < 3:
-            tables.append_summary('{} to {}.'.format(batter, get_bag(1)))
-            state.handle_batter_to_base(batter, 1)
-    if e == Event.BATTER_SAC_BUNT_SAFE:
-        _, base = args
-        base = get_base(base)
-        runner = state.get_runner(base - 1)
-        tables.append_summary('{} hits a sacrifice bunt.'.format(batter))
-        tables.append_summary('{} to {}.'.format(runner, get_bag(base)))
+    _, scoring = args
+    tables.append_summary('{} out on a sacrifice bunt, {}.'.format(
+        batter, roster.get_scoring(scoring)))
+    state.handle_batter_to_base(batter, 1)
+    state.handle_out_runner(1)
+
+
+@_handles(Event.BATTER_SAC_BUNT_DP, before=_create_summary_inplay)
+def _batter_sac_bunt_dp(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    base, _ = args
+    base = get_base(base)
+    scoring = '1-5-3' if base == 3 else '1-6-3'
+    runner = state.get_runner(base - 1)
+    tables.append_summary('{} bunt grounds into a double play, {}.'.format(
+        batter, roster.get_scoring(scoring)))
+    tables.append_summary('{} out at {}.'.format(runner, get_bag(base)))
+    state.handle_out_batter()
+    state.handle_out_runner(base - 1)
+
+
+@_handles(Event.BATTER_SAC_BUNT_OUT, before=_create_summary_inplay)
+def _batter_sac_bunt_out(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    _, base, scoring = args
+    base = get_base(base)
+    runner = state.get_runner(base - 1)
+    tables.append_summary('{} bunt grounds into a force out, {}.'.format(
+        batter, roster.get_scoring(scoring)))
+    tables.append_summary('{} out at {}.'.format(runner, get_bag(base)))
+    state.handle_out_runner(base - 1)
+    if state.get_outs() < 3:
         tables.append_summary('{} to {}.'.format(batter, get_bag(1)))
-        state.handle_runner_to_base(runner, base)
         state.handle_batter_to_base(batter, 1)
 
 
-EVENT_MISC_BATTERS = [
-    Event.CATCHER_PASSED_BALL,
-    Event.CATCHER_PICK_ERR,
-    Event.CATCHER_PICK_OUT,
-    Event.FIELDER_THROWING,
-    Event.PITCHER_PICK_ERR,
-    Event.PITCHER_PICK_OUT,
-    Event.PITCHER_BALK,
-    Event.PITCHER_HIT_BY_PITCH,
-    Event.PITCHER_HIT_BY_PITCH_CHARGE,
-    Event.PITCHER_WILD_PITCH,
-]
+@_handles(Event.BATTER_SAC_BUNT_SAFE, before=_create_summary_inplay)
+def _batter_sac_bunt_safe(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    _, base = args
+    base = get_base(base)
+    runner = state.get_runner(base - 1)
+    tables.append_summary('{} hits a sacrifice bunt.'.format(batter))
+    tables.append_summary('{} to {}.'.format(runner, get_bag(base)))
+    tables.append_summary('{} to {}.'.format(batter, get_bag(1)))
+    state.handle_runner_to_base(runner, base)
+    state.handle_batter_to_base(batter, 1)
 
 
-def _check_misc_batter_events(e, args, roster, state, tables):
+@_handles(Event.CATCHER_PASSED_BALL)
+def _catcher_passed_ball(e, args, roster, state, tables):
     batter = roster.get_batter()
-    pitcher = roster.get_pitcher()
-    if e == Event.CATCHER_PASSED_BALL:
-        tables.append_summary('With {} batting, passed ball by {}.'.format(
+    tables.append_summary('With {} batting, passed ball by {}.'.format(
+        batter, roster.get_title_fielder('C')))
+
+
+@_handles(Event.CATCHER_PICK_ERR)
+def _catcher_pick_err(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    tables.append_summary(
+        'With {} batting, throwing error by {} on the pickoff attempt.'.format(
             batter, roster.get_title_fielder('C')))
-    if e == Event.CATCHER_PICK_ERR:
-        tables.append_summary(
-            'With {} batting, throwing error by {} on the pickoff attempt.'.
-            format(batter, roster.get_title_fielder('C')))
-    if e == Event.CATCHER_PICK_OUT:
-        base, = args
-        base = get_base(base)
+
+
+@_handles(Event.CATCHER_PICK_OUT)
+def _catcher_pick_out(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    base, = args
+    base = get_base(base)
+    runner = state.get_runner(base)
+    position = '3B' if base == 3 else '1B' if base == 1 else 'SS'
+    tables.append_summary(
+        'With {} batting, {} picks off {} on throw to {}.'.format(
+            batter, roster.get_title_fielder('C'), runner,
+            roster.get_title_fielder(position)))
+    state.handle_out_runner(base)
+
+
+@_handles(Event.FIELDER_THROWING)
+def _fielder_throwing(e, args, roster, state, tables):
+    scoring, = args
+    fielder = roster.get_title_fielder(get_position(scoring, False))
+    tables.append_summary('Throwing error by {}.'.format(fielder))
+
+
+@_handles(Event.PITCHER_PICK_ERR)
+def _pitcher_pick_err(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    pitcher = roster.get_pitcher()
+    tables.append_summary(
+        'With {} batting, throwing error by {} on the pickoff attempt.'.format(
+            batter, pitcher))
+
+
+@_handles(Event.PITCHER_PICK_OUT)
+def _pitcher_pick_out(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    pitcher = roster.get_pitcher()
+    base, = args
+    base = get_base(base)
+    runner = state.get_runner(base)
+    position = '3B' if base == 3 else '1B' if base == 1 else 'SS'
+    tables.append_summary(
+        'With {} batting, {} picks off {} on throw to {}.'.format(
+            batter, pitcher, runner, roster.get_title_fielder(position)))
+    state.handle_out_runner(base)
+
+
+@_handles(Event.PITCHER_BALK)
+def _pitcher_balk(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    pitcher = roster.get_pitcher()
+    tables.append_summary('With {} batting, balk by {}.'.format(
+        batter, pitcher))
+    for base in range(3, 0, -1):
         runner = state.get_runner(base)
-        position = '3B' if base == 3 else '1B' if base == 1 else 'SS'
+        if runner:
+            state.handle_runner_to_base(runner, base + 1)
+            if base < 3:
+                tables.append_summary('{} to {}.'.format(
+                    runner, get_bag(base + 1)))
+
+
+@_handles(Event.PITCHER_HIT_BY_PITCH, Event.PITCHER_HIT_BY_PITCH_CHARGE)
+def _pitcher_hit_by_pitch(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    state.handle_pitch_ball()
+    state.create_pitch_row('Hit By Pitch', tables)
+    tables.append_summary('{} hit by pitch.'.format(batter))
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.PITCHER_WILD_PITCH)
+def _pitcher_wild_pitch(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    pitcher = roster.get_pitcher()
+    tables.append_summary('With {} batting, wild pitch by {}.'.format(
+        batter, pitcher))
+
+
+@_handles(Event.PITCHER_BALL, before=_create_summary)
+def _pitcher_ball(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    state.handle_pitch_ball()
+    state.create_pitch_row('Ball', tables)
+    if state.is_walk():
+        tables.append_summary('{} walks.'.format(batter))
+        state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.PITCHER_WALK, before=_create_summary)
+def _pitcher_walk(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    pitcher = roster.get_pitcher()
+    tables.append_summary('{} walked intentionally by {}.'.format(
+        batter, pitcher))
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.PITCHER_STRIKE_CALL,
+          Event.PITCHER_STRIKE_CALL_TOSSED,
+          before=_create_summary)
+def _pitcher_strike_call(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    state.handle_pitch_strike()
+    state.create_pitch_row('Called Strike', tables)
+    if state.is_strikeout():
+        tables.append_summary('{} called out on strikes.'.format(batter))
+        state.handle_out_batter()
+    if e == Event.PITCHER_STRIKE_CALL_TOSSED:
         tables.append_summary(
-            'With {} batting, {} picks off {} on throw to {}.'.format(
-                batter, roster.get_title_fielder('C'), runner,
-                roster.get_title_fielder(position)))
-        state.handle_out_runner(base)
-    if e == Event.FIELDER_THROWING:
+            '{} ejected for arguing the call.'.format(batter))
+
+
+@_handles(Event.PITCHER_STRIKE_FOUL,
+          Event.PITCHER_STRIKE_FOUL_ERR,
+          before=_create_summary)
+def _pitcher_strike_foul(e, args, roster, state, tables):
+    state.handle_pitch_foul()
+    state.create_pitch_row('Foul', tables)
+    if e == Event.PITCHER_STRIKE_FOUL_ERR:
         scoring, = args
         fielder = roster.get_title_fielder(get_position(scoring, False))
-        tables.append_summary('Throwing error by {}.'.format(fielder))
-    if e == Event.PITCHER_PICK_ERR:
-        tables.append_summary(
-            'With {} batting, throwing error by {} on the pickoff attempt.'.
-            format(batter, pitcher))
-    if e == Event.PITCHER_PICK_OUT:
-        base, = args
-        base = get_base(base)
-        runner = state.get_runner(base)
-        position = '3B' if base == 3 else '1B' if base == 1 else 'SS'
-        tables.append_summary(
-            'With {} batting, {} picks off {} on throw to {}.'.format(
-                batter, pitcher, runner, roster.get_title_fielder(position)))
-        state.handle_out_runner(base)
-    if e == Event.PITCHER_BALK:
-        tables.append_summary('With {} batting, balk by {}.'.format(
-            batter, pitcher))
-        for base in range(3, 0, -1):
-            runner = state.get_runner(base)
-            if runner:
-                state.handle_runner_to_base(runner, base + 1)
-                if base < 3:
-                    tables.append_summary('{} to {}.'.format(
-                        runner, get_bag(base + 1)))
-    if e in [Event.PITCHER_HIT_BY_PITCH, Event.PITCHER_HIT_BY_PITCH_CHARGE]:
-        state.handle_pitch_ball()
-        state.create_pitch_row('Hit By Pitch', tables)
-        tables.append_summary('{} hit by pitch.'.format(batter))
-        state.handle_batter_to_base(batter, 1)
-    if e == Event.PITCHER_WILD_PITCH:
-        tables.append_summary('With {} batting, wild pitch by {}.'.format(
-            batter, pitcher))
+        body = roster.create_bolded_row(
+            'Error', 'Dropped foul ball error by {}.'.format(fielder))
+        tables.append_body(body)
 
 
-EVENT_PITCHES = [
-    Event.PITCHER_BALL,
-    Event.PITCHER_WALK,
-    Event.PITCHER_STRIKE_CALL,
-    Event.PITCHER_STRIKE_CALL_TOSSED,
-    Event.PITCHER_STRIKE_FOUL,
-    Event.PITCHER_STRIKE_FOUL_BUNT,
-    Event.PITCHER_STRIKE_FOUL_ERR,
-    Event.PITCHER_STRIKE_MISS,
-    Event.PITCHER_STRIKE_SWING,
-    Event.PITCHER_STRIKE_SWING_OUT,
-    Event.PITCHER_STRIKE_SWING_PASSED,
-    Event.PITCHER_STRIKE_SWING_WILD,
-]
+@_handles(Event.PITCHER_STRIKE_FOUL_BUNT, before=_create_summary)
+def _pitcher_strike_foul_bunt(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    state.handle_pitch_strike()
+    state.create_pitch_row('Foul Bunt', tables)
+    if state.is_strikeout():
+        tables.append_summary('{} strikes out on a foul bunt.'.format(batter))
+        state.handle_out_batter()
 
 
-def _check_pitch_events(e, args, roster, state, tables):
-    if tables.get_summary():
-        state.create_summary_row(tables)
-        tables.reset_summary()
+@_handles(Event.PITCHER_STRIKE_MISS, before=_create_summary)
+def _pitcher_strike_miss(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    state.handle_pitch_strike()
+    state.create_pitch_row('Missed Bunt', tables)
+    if state.is_strikeout():
+        tables.append_summary(
+            '{} strikes out on a missed bunt.'.format(batter))
+        state.handle_out_batter()
+
 
+@_handles(Event.PITCHER_STRIKE_SWING, before=_create_summary)
+def _pitcher_strike_swing(e, args, roster, state, tables):
     batter = roster.get_batter()
-    if e == Event.PITCHER_BALL:
-        state.handle_pitch_ball()
-        state.create_pitch_row('Ball', tables)
-        if state.is_walk():
-            tables.append_summary('{} walks.'.format(batter))
-            state.handle_batter_to_base(batter, 1)
-    if e == Event.PITCHER_WALK:
-        pitcher = roster.get_pitcher()
-        tables.append_summary('{} walked intentionally by {}.'.format(
-            batter, pitcher))
-        state.handle_batter_to_base(batter, 1)
-    if e in [Event.PITCHER_STRIKE_CALL, Event.PITCHER_STRIKE_CALL_TOSSED]:
-        state.handle_pitch_strike()
-        state.create_pitch_row('Called Strike', tables)
-        if state.is_strikeout():
-            tables.append_summary('{} called out on strikes.'.format(batter))
-            state.handle_out_batter()
-        if e == Event.PITCHER_STRIKE_CALL_TOSSED:
-            tables.append_summary(
-                '{} ejected for arguing the call.'.format(batter))
-    if e in [Event.PITCHER_STRIKE_FOUL, Event.PITCHER_STRIKE_FOUL_ERR]:
-        state.handle_pitch_foul()
-        state.create_pitch_row('Foul', tables)
-        if e == Event.PITCHER_STRIKE_FOUL_ERR:
-            scoring, = args
-            fielder = roster.get_title_fielder(get_position(scoring, False))
-            body = roster.create_bolded_row(
-                'Error', 'Dropped foul ball error by {}.'.format(fielder))
-            tables.append_body(body)
-    if e == Event.PITCHER_STRIKE_FOUL_BUNT:
-        state.handle_pitch_strike()
-        state.create_pitch_row('Foul Bunt', tables)
-        if state.is_strikeout():
-            tables.append_summary(
-                '{} strikes out on a foul bunt.'.format(batter))
-            state.handle_out_batter()
-    if e == Event.PITCHER_STRIKE_MISS:
-        state.handle_pitch_strike()
-        state.create_pitch_row('Missed Bunt', tables)
-        if state.is_strikeout():
-            tables.append_summary(
-                '{} strikes out on a missed bunt.'.format(batter))
-            state.handle_out_batter()
-    if e == Event.PITCHER_STRIKE_SWING:
-        state.handle_pitch_strike()
-        state.create_pitch_row('Swinging Strike', tables)
-        if state.is_strikeout():
-            tables.append_summary('{} strikes out swinging.'.format(batter))
-            state.handle_out_batter()
-    if e == Event.PITCHER_STRIKE_SWING_OUT:
-        state.handle_pitch_strike()
-        state.create_pitch_row('Swinging Strike', tables)
-        if state.is_strikeout():
-            tables.append_summary('{} strikes out swinging, {}.'.format(
-                batter, roster.get_scoring('2-3')))
-            state.handle_out_batter()
-    if e == Event.PITCHER_STRIKE_SWING_PASSED:
-        state.handle_pitch_strike()
-        state.create_pitch_row('Swinging Strike', tables)
-        tables.append_summary('{} strikes out swinging.'.format(batter))
-        fielder = roster.get_title_fielder('C')
-        s = '{} advances to 1st, on a passed ball by {}.'.format(
-            batter, fielder)
-        tables.append_summary(s)
-        state.handle_batter_to_base(batter, 1)
-    if e == Event.PITCHER_STRIKE_SWING_WILD:
-        state.handle_pitch_strike()
-        state.create_pitch_row('Swinging Strike', tables)
+    state.handle_pitch_strike()
+    state.create_pitch_row('Swinging Strike', tables)
+    if state.is_strikeout():
         tables.append_summary('{} strikes out swinging.'.format(batter))
-        fielder = roster.get_title_fielder('P')
-        s = '{} advances to 1st, on a wild pitch by {}.'.format(
-            batter, fielder)
-        tables.append_summary(s)
-        state.handle_batter_to_base(batter, 1)
+        state.handle_out_batter()
 
 
-EVENT_MISC_RUNNERS = [
-    Event.RUNNER_STEAL,
-    Event.RUNNER_STEAL_HOME,
-    Event.RUNNER_STEAL_HOME_OUT,
-    Event.RUNNER_STEAL_OUT,
-    Event.RUNNER_STEAL_THROWING,
-    Event.PLAYER_MOVE,
-    Event.PLAYER_SCORE,
-    Event.BASE_MOVE,
-    Event.BASE_MOVE_RUNDOWN,
-    Event.BASE_MOVE_THROW,
-    Event.BASE_MOVE_TRAIL,
-    Event.BASE_MOVE_TRAIL_OUT,
-    Event.BASE_OUT,
-    Event.BASE_SCORE,
-    Event.BASE_SCORE_THROW,
-    Event.BASE_SCORE_TRAIL,
-    Event.BASE_SCORE_TRAIL_OUT,
-]
+@_handles(Event.PITCHER_STRIKE_SWING_OUT, before=_create_summary)
+def _pitcher_strike_swing_out(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    state.handle_pitch_strike()
+    state.create_pitch_row('Swinging Strike', tables)
+    if state.is_strikeout():
+        tables.append_summary('{} strikes out swinging, {}.'.format(
+            batter, roster.get_scoring('2-3')))
+        state.handle_out_batter()
 
 
-def _check_misc_runner_events(e, args, roster, state, tables):
-    batter = roster.get_batter()
-    if e in [Event.RUNNER_STEAL, Event.RUNNER_STEAL_THROWING]:
-        runner, base = args
-        base = get_base(base)
-        state.handle_runner_to_base(runner, base)
-        tables.append_summary('With {} batting, {} steals {} base.'.format(
-            batter, runner, get_bag(base)))
-        if e == Event.RUNNER_STEAL_THROWING:
-            tables.append_summary('Throwing error by {}.'.format(
-                roster.get_title_fielder('C')))
-    if e == Event.RUNNER_STEAL_HOME:
-        runner, = args
-        state.handle_runner_to_base(runner, 4)
-        tables.append_summary('With {} batting, {} steals home.'.format(
-            batter, runner, get_bag(base)))
-        state.handle_runner_to_base(runner, 4)
-    if e == Event.RUNNER_STEAL_HOME_OUT:
-        runner, = args
-        scoring = '1-2'
-        state.handle_out_runner(3)
-        tables.append_summary(
-            'With {} batting, {} caught stealing home, {}.'.format(
-                batter, runner, roster.get_scoring(scoring)))
-    if e == Event.RUNNER_STEAL_OUT:
-        runner, base, scoring = args
-        base = get_base(base)
-        state.handle_out_runner(base - 1)
-        tables.append_summary(
-            'With {} batting, {} caught stealing {} base, {}.'.format(
-                batter, runner, get_bag(base), roster.get_scoring(scoring)))
-    if e == Event.PLAYER_MOVE:
-        runner, base = args
-        base = get_base(base)
-        state.handle_runner_to_base(runner, base)
-        tables.append_summary('{} to {}.'.format(runner, get_bag(base)))
-    if e == Event.PLAYER_SCORE:
-        runner, = args
-        state.handle_runner_to_base(runner, 4)
-    if e in [Event.BASE_MOVE, Event.BASE_MOVE_RUNDOWN, Event.BASE_MOVE_THROW]:
-        base, = args
-        base = get_base(base)
-        runner = state.get_runner(base)
-        state.handle_runner_to_base(runner, base + 1)
-        tables.append_summary('{} to {}.'.format(runner, get_bag(base + 1)))
-    if e in [Event.BASE_MOVE_TRAIL, Event.BASE_MOVE_TRAIL_OUT]:
-        runner = state.get_runner(2)
-        state.handle_runner_to_base(runner, 3)
-        tables.append_summary('{} to 3rd.'.format(runner))
-        trailer = state.get_runner(1)
-        if e == Event.BASE_MOVE_TRAIL:
-            state.handle_runner_to_base(trailer, 2)
-            tables.append_summary('{} to 2nd.'.format(trailer))
-        else:
-            scoring, = args
-            state.handle_out_runner(1)
-            tables.append_summary('{} out at 2nd on the throw, {}.'.format(
-                trailer, roster.get_scoring(scoring)))
-    if e == Event.BASE_OUT:
-        base, scoring = args
-        base = get_base(base)
-        runner = state.get_runner(base)
-        tables.append_summary('{} out at {} on the throw, {}.'.format(
-            runner, get_bag(base + 1), roster.get_scoring(scoring)))
-        state.handle_out_runner(base)
-    if e in [Event.BASE_SCORE, Event.BASE_SCORE_THROW]:
-        runner = state.get_runner(3)
-        state.handle_runner_to_base(runner, 4)
-    if e in [Event.BASE_SCORE_TRAIL, Event.BASE_SCORE_TRAIL_OUT]:
-        runner = state.get_runner(3)
-        state.handle_runner_to_base(runner, 4)
-        trailer = state.get_runner(2)
-        if e == Event.BASE_MOVE_TRAIL:
-            state.handle_runner_to_base(trailer, 3)
-            tables.append_summary('{} to 3rd.'.format(trailer))
-        else:
-            scoring, = args
-            tables.append_summary('{} out at 3rd on the throw, {}.'.format(
-                trailer, roster.get_scoring(scoring)))
-            state.handle_out_runner(2)
+@_handles(Event.PITCHER_STRIKE_SWING_PASSED, before=_create_summary)
+def _pitcher_strike_swing_passed(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    state.handle_pitch_strike()
+    state.create_pitch_row('Swinging Strike', tables)
+    tables.append_summary('{} strikes out swinging.'.format(batter))
+    fielder = roster.get_title_fielder('C')
+    s = '{} advances to 1st, on a passed ball by {}.'.format(batter, fielder)
+    tables.append_summary(s)
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.PITCHER_STRIKE_SWING_WILD, before=_create_summary)
+def _pitcher_strike_swing_wild(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    state.handle_pitch_strike()
+    state.create_pitch_row('Swinging Strike', tables)
+    tables.append_summary('{} strikes out swinging.'.format(batter))
+    fielder = roster.get_title_fielder('P')
+    s = '{} advances to 1st, on a wild pitch by {}.'.format(batter, fielder)
+    tables.append_summary(s)
+    state.handle_batter_to_base(batter, 1)
+
+
+@_handles(Event.RUNNER_STEAL, Event.RUNNER_STEAL_THROWING)
+def _runner_steal(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    runner, base = args
+    base = get_base(base)
+    state.handle_runner_to_base(runner, base)
+    tables.append_summary('With {} batting, {} steals {} base.'.format(
+        batter, runner, get_bag(base)))
+    if e == Event.RUNNER_STEAL_THROWING:
+        tables.append_summary('Throwing error by {}.'.format(
+            roster.get_title_fielder('C')))
 
 
-def _group(encodings):
+@_handles(Event.RUNNER_STEAL_HOME)
+def _runner_steal_home(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    runner, = args
+    state.handle_runner_to_base(runner, 4)
+    tables.append_summary('With {} batting, {} steals home.'.format(
+        batter, runner))
+    state.handle_runner_to_base(runner, 4)
+
+
+@_handles(Event.RUNNER_STEAL_HOME_OUT)
+def _runner_steal_home_out(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    runner, = args
+    scoring = '1-2'
+    state.handle_out_runner(3)
+    tables.append_summary(
+        'With {} batting, {} caught stealing home, {}.'.format(
+            batter, runner, roster.get_scoring(scoring)))
+
+
+@_handles(Event.RUNNER_STEAL_OUT)
+def _runner_steal_out(e, args, roster, state, tables):
+    batter = roster.get_batter()
+    runner, base, scoring = args
+    base = get_base(base)
+    state.handle_out_runner(base - 1)
+    tables.append_summary(
+        'With {} batting, {} caught stealing {} base, {}.'.format(
+            batter, runner, get_bag(base), roster.get_scoring(scoring)))
+
+
+@_handles(Event.PLAYER_MOVE)
+def _player_move(e, args, roster, state, tables):
+    runner, base = args
+    base = get_base(base)
+    state.handle_runner_to_base(runner, base)
+    tables.append_summary('{} to {}.'.format(runner, get_bag(base)))
+
+
+@_handles(Event.PLAYER_SCORE)
+def _player_score(e, args, roster, state, tables):
+    runner, = args
+    state.handle_runner_to_base(runner, 4)
+
+
+@_handles(Event.BASE_MOVE, Event.BASE_MOVE_RUNDOWN, Event.BASE_MOVE_THROW)
+def _base_move(e, args, roster, state, tables):
+    base, = args
+    base = get_base(base)
+    runner = state.get_runner(base)
+    state.handle_runner_to_base(runner, base + 1)
+    tables.append_summary('{} to {}.'.format(runner, get_bag(base + 1)))
+
+
+@_handles(Event.BASE_MOVE_TRAIL, Event.BASE_MOVE_TRAIL_OUT)
+def _base_move_trail(e, args, roster, state, tables):
+    runner = state.get_runner(2)
+    state.handle_runner_to_base(runner, 3)
+    tables.append_summary('{} to 3rd.'.format(runner))
+    trailer = state.get_runner(1)
+    if e == Event.BASE_MOVE_TRAIL:
+        state.handle_runner_to_base(trailer, 2)
+        tables.append_summary('{} to 2nd.'.format(trailer))
+    else:
+        scoring, = args
+        state.handle_out_runner(1)
+        tables.append_summary('{} out at 2nd on the throw, {}.'.format(
+            trailer, roster.get_scoring(scoring)))
+
+
+@_handles(Event.BASE_OUT)
+def _base_out(e, args, roster, state, tables):
+    base, scoring = args
+    base = get_base(base)
+    runner = state.get_runner(base)
+    tables.append_summary('{} out at {} on the throw, {}.'.format(
+        runner, get_bag(base + 1), roster.get_scoring(scoring)))
+    state.handle_out_runner(base)
+
+
+@_handles(Event.BASE_SCORE, Event.BASE_SCORE_THROW)
+def _base_score(e, args, roster, state, tables):
+    runner = state.get_runner(3)
+    state.handle_runner_to_base(runner, 4)
+
+
+@_handles(Event.BASE_SCORE_TRAIL, Event.BASE_SCORE_TRAIL_OUT)
+def _base_score_trail(e, args, roster, state, tables):
+    runner = state.get_runner(3)
+    state.handle_runner_to_base(runner, 4)
+    trailer = state.get_runner(2)
+    if e == Event.BASE_MOVE_TRAIL:
+        state.handle_runner_to_base(trailer, 3)
+        tables.append_summary('{} to 3rd.'.format(trailer))
+    else:
+        scoring, = args
+        tables.append_summary('{} out at 3rd on the throw, {}.'.format(
+            trailer, roster.get_scoring(scoring)))
+        state.handle_out_runner(2)
+
+
+@_handles(Event.SPECIAL, before=_create_summary)
+def _special(e, args, roster, state, tables):
+    body = roster.create_bolded_row('Parse Error',
+                                    'Unable to parse game event.')
+    tables.append_old_body(body)
+
+    text = player_to_name_sub(' '.join(args))
+    cells = [cell(col=col(colspan='2'), content=text)]
+    tables.append_old_body(row(cells=cells))
+
+
+def _group(decodings):
     change = None
     group = []
-    for encoding in encodings:
-        e, _ = Event.decode(encoding)
-        c = e in EVENT_CHANGES
+    for decoding in decodings:
+        c = decoding[0] in EVENT_CHANGES
         if not group:
             change = c
-            group.append(encoding)
+            group.append(decoding)
         elif change == c:
-            group.append(encoding)
+            group.append(decoding)
         else:
             yield group
             change = c
-            group = [encoding]
+            group = [decoding]
 
     if group:
         yield group
 
 
-def get_html(game_in):
+class _Compact(object):
+    """Encodes tables by index into shared string and cell tables, for the
+    compact livesim output mode.
+
+    Everything except the string table is built from tuples, which the style
+    extraction does not descend into, so that only the strings are scanned.
+    """
+
+    def __init__(self):
+        self.cells = []
+        self.cells_index = {}
+        self.strings = ['']
+        self.strings_index = {'': 0}
+
+    def encode_cells(self, cells):
+        encoded = tuple((self.encode_string(c.get('content')),
+                         self.encode_string(c.get('col', {}).get('clazz')),
+                         self.encode_string(c.get('col', {}).get('colspan')))
+                        for c in cells)
+        if encoded not in self.cells_index:
+            self.cells_index[encoded] = len(self.cells)
+            self.cells.append(encoded)
+        return self.cells_index[encoded]
+
+    def encode_cols(self, cols):
+        return tuple((self.encode_string(c.get('clazz')),
+                      self.encode_string(c.get('colspan')))
+                     for c in cols or [])
+
+    def encode_rows(self, rows):
+        encoded = []
+        for r in rows or []:
+            r = r if isinstance(r, dict) else {}
+            encoded.append((self.encode_string(r.get('attr')),
+                            self.encode_string(r.get('clazz')),
+                            self.encode_cells(r.get('cells', []))))
+        return tuple(encoded)
+
+    def encode_string(self, s):
+        s = s or ''
+        if s not in self.strings_index:
+            self.strings_index[s] = len(self.strings)
+            self.strings.append(s)
+        return self.strings_index[s]
+
+    def encode_table(self, t):
+        return (
+            self.encode_string(t.get('clazz')),
+            self.encode_string(t.get('id')),
+            self.encode_string(t.get('attributes')),
+            self.encode_cols(t.get('hcols')),
+            self.encode_cols(t.get('bcols')),
+            self.encode_cols(t.get('fcols')),
+            self.encode_rows(t.get('head')),
+            self.encode_rows(t.get('body')),
+            self.encode_rows(t.get('foot')),
+        )
+
+
+def _compact(tabs):
+    c = _Compact()
+    tabs = tuple(
+        tuple(c.encode_table(t) for t in tab['tables']) for tab in tabs)
+    return {'cells': tuple(c.cells), 'strings': c.strings, 'tabs': tabs}
+
+
+def _checkpoint_key(data):
+    h = hashlib.sha1(CHECKPOINT_VERSION.encode())
+    game = {k: v for k, v in data.items() if k != 'events'}
+    h.update(json.dumps(game, sort_keys=True).encode())
+    for e in sorted(set(re.findall(r'P\d+', json.dumps(data)))):
+        attributes = [get_attribute(e, i, None) for i in range(5)]
+        h.update(json.dumps([e, attributes]).encode())
+    return h.hexdigest()
+
+
+def _checkpoint_path(game_in):
+    name = re.sub(r'\.json$', '', os.path.basename(game_in))
+    return os.path.join(CHECKPOINT_DIR, name + '.checkpoint')
+
+
+def _checkpoint_version():
+    h = hashlib.sha1()
+    for source in CHECKPOINT_SOURCES:
+        with open(os.path.join(ROOT_DIR, source), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+CHECKPOINT_VERSION = _checkpoint_version()
+
+
+def _events_hash(events):
+    return hashlib.sha1(json.dumps(events).encode()).hexdigest()
+
+
+def _load_checkpoint(path, key, events, starts):
+    if not os.path.isfile(path):
+        return None
+
+    checkpoint = loads(path)
+    if checkpoint.get('key') != key or checkpoint.get('start') not in starts:
+        return None
+
+    start = checkpoint['start']
+    if checkpoint.get('hash') != _events_hash(events[:start]):
+        return None
+
+    return checkpoint
+
+
+def _replay(group, roster, state, tables):
+    for e, args in group:
+        for handler in HANDLERS.get(e, ()):
+            handler(e, args, roster, state, tables)
+
+    if tables.get_summary():
+        state.create_summary_row(tables)
+        tables.reset_summary()
+
+    tables.append_all()
+    tables.reset_all()
+
+
+def get_html(game_in, compact=False, checkpoint=False):
     """Gets template data for a given game data object.
 
     Args:
         game_in: The game data file path.
+        compact: Whether to encode the live and old tables compactly, to be
+            materialised by the page script instead of the template. The
+            live events are returned as is either way.
+        checkpoint: Whether to resume the replay from, and then update, the
+            checkpoint stored in the cache directory for the game.
 
     Returns:
         The template data.
@@ -646,52 +968,60 @@ def get_html(game_in):
     if not data['events']:
         return None
 
+    events = Event.decode_all(data['events'])
+    groups = list(_group(events))
+    starts, start = [], 0
+    for group in groups:
+        starts.append(start)
+        start += len(group)
+
+    innings = [
+        i for i, group in enumerate(groups)
+        if group[0][0] == Event.CHANGE_INNING
+    ]
+
     roster = call_service('roster', 'create_roster', (data, ))
     state = call_service('state', 'create_state', (data, ))
     tables = call_service('tables', 'create_tables', ())
 
-    tables.append_live_head(roster.create_ballpark_table())
-    tables.append_live_head(state.create_live_head_table())
-    tables.append_live_head(roster.create_live_pitcher_table())
-    tables.append_live_head(roster.create_live_batter_table())
+    resume, saved = 0, None
+    if checkpoint:
+        path = _checkpoint_path(game_in)
+        key = _checkpoint_key(data)
+        saved = _load_checkpoint(path, key, events, starts)
+
+    if saved:
+        resume = starts.index(saved['start'])
+        roster.set_checkpoint(saved['roster'])
+        state.set_checkpoint(saved['state'])
+        tables.set_checkpoint(saved['tables'])
+    else:
+        tables.append_live_head(roster.create_ballpark_table())
+        tables.append_live_head(state.create_live_head_table())
+        tables.append_live_head(roster.create_live_pitcher_table())
+        tables.append_live_head(roster.create_live_batter_table())
+
+    save = innings[-1] if checkpoint and innings else None
+    if save is not None and save <= resume and saved:
+        save = None
 
     try:
-        for group in _group(data['events']):
-            for i, encoding in enumerate(list(group)):
-                e, args = Event.decode(encoding)
-
-                if e in EVENT_CHANGES:
-                    _check_change_events(e, args, roster, state, tables)
-                if e in EVENT_BATTER_REACHES:
-                    _check_batter_reach_events(e, args, roster, state, tables)
-                if e in EVENT_BATTER_OUTS:
-                    _check_batter_out_events(e, args, roster, state, tables)
-                if e in EVENT_MISC_BATTERS:
-                    _check_misc_batter_events(e, args, roster, state, tables)
-                if e in EVENT_PITCHES:
-                    _check_pitch_events(e, args, roster, state, tables)
-                if e in EVENT_MISC_RUNNERS:
-                    _check_misc_runner_events(e, args, roster, state, tables)
-
-                if e == Event.SPECIAL:
-                    if tables.get_summary():
-                        state.create_summary_row(tables)
-                        tables.reset_summary()
-
-                    body = roster.create_bolded_row(
-                        'Parse Error', 'Unable to parse game event.')
-                    tables.append_old_body(body)
-
-                    text = player_to_name_sub(' '.join(args))
-                    cells = [cell(col=col(colspan='2'), content=text)]
-                    tables.append_old_body(row(cells=cells))
-
-            if tables.get_summary():
-                state.create_summary_row(tables)
-                tables.reset_summary()
-
-            tables.append_all()
-            tables.reset_all()
+        for i in range(resume, len(groups)):
+            if i == save:
+                start = starts[i]
+                text = json.dumps({
+                    'hash': _events_hash(events[:start]),
+                    'key': key,
+                    'roster': roster.get_checkpoint(),
+                    'start': start,
+                    'state': state.get_checkpoint(),
+                    'tables': tables.get_checkpoint(),
+                }, separators=(',', ':'))
+                os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write(text + '\n')
+
+            _replay(groups[i], roster, state, tables)
     except Exception as e:
         print(game_in)
         raise e
@@ -704,4 +1034,15 @@ def get_html(game_in):
         'title': 'Old',
         'tables': tables.get_old_tables(),
     }]
-    return {'events': tables.get_live_events(), 'styles': styles, 'tabs': tabs}
+    events = tables.get_live_events()
+    if compact:
+        data = _compact(tabs)
+        tabs = [{'title': tab['title']} for tab in tabs]
+        return {
+            'compact': data,
+            'events': events,
+            'styles': styles,
+            'tabs': tabs
+        }
+
+    return {'events': events, 'styles': styles, 'tabs': tabs}
@@ -188,6 +188,9 @@ class Roster(object):
     def get_batter(self):
         return self.get_batter_at(self.get_index())
 
+    def get_checkpoint(self):
+        return dict(vars(self))
+
     def get_fielder(self, position):
         return self.fielders[self.throwing][position]
 
@@ -326,6 +329,9 @@ class Roster(object):
         curr, change = (change + ',').split(',', 1)
         return (curr, change.strip(','))
 
+    def set_checkpoint(self, checkpoint):
+        self.__dict__.update(checkpoint)
+
 
 def create_roster(data):
     return Roster(data)
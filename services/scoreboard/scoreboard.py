@@ -1,7 +1,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Service (reloadable) methods for displaying game data."""
+"""Service (reloadable) methods for displaying game data.
 
+Line score fragments are cached in a bounded LRU cache, keyed by the game file
+fingerprint from the game index, the hidden flag, and the reference version.
+The cache lives at module level, so it is emptied whenever the service reloads.
+Collecting styles strips the style tokens from a fragment in place, so the
+cached fragments are never handed out. Each render gets its own copy, and the
+cache size is the only bound on the cached fragments.
+"""
+
+import collections
 import os
 import re
 import sys
@@ -21,10 +30,11 @@ from common.elements.elements import row  # noqa
 from common.elements.elements import span  # noqa
 from common.elements.elements import table  # noqa
 from common.elements.elements import topper  # noqa
-from common.json_.json_ import loads  # noqa
+from common.games.games import get_games  # noqa
 from common.re_.re_ import search  # noqa
 from common.record.record import decode_record  # noqa
 from common.record.record import encode_record  # noqa
+from common.reference.reference import get_version  # noqa
 from common.reference.reference import player_to_shortname_sub  # noqa
 from common.reference.reference import player_to_starter_sub  # noqa
 from common.teams.teams import encoding_to_abbreviation  # noqa
@@ -33,11 +43,14 @@ from common.teams.teams import encoding_to_hometown  # noqa
 from common.teams.teams import encoding_to_hometown_sub  # noqa
 from common.teams.teams import icon_absolute  # noqa
 
-GAMES_DIR = re.sub(r'/services/scoreboard', '/resources/games', _path)
-
 STATSPLUS_LINK = 'https://statsplus.net/oblootp/reports/news/html'
 STATSPLUS_BOX_SCORES = os.path.join(STATSPLUS_LINK, 'box_scores')
 
+LINE_SCORE_CACHE_SIZE = 4096
+
+_line_score_cache = collections.OrderedDict()
+_line_score_stats = {'evictions': 0, 'hits': 0, 'misses': 0}
+
 
 def _add_line_score(s, data, body, foot):
     for team in ['away', 'home']:
@@ -55,10 +68,46 @@ def _cell(text, attributes):
                              attributes=attributes))
 
 
+def _copy(fragment):
+    if isinstance(fragment, dict):
+        return {k: _copy(v) for k, v in fragment.items()}
+    if isinstance(fragment, (list, tuple)):
+        return type(fragment)(_copy(v) for v in fragment)
+
+    return fragment
+
+
 def _date(date):
     return decode_datetime(date).strftime('%m%d')
 
 
+def _line_score(data, hidden):
+    key = (data['num'], data.get('mtime'), data.get('size'), hidden,
+           get_version())
+    if key in _line_score_cache:
+        _line_score_cache.move_to_end(key)
+        _line_score_stats['hits'] += 1
+        return _copy(_line_score_cache[key])
+
+    _line_score_stats['misses'] += 1
+
+    fragment = {'dialog': None, 'hide': None}
+    if hidden:
+        dialog_ = create_dialog(_date(data['date']), data['num'])
+        fragment['dialog'] = dialog_
+        fragment['hide'] = (line_score_hide_body(data),
+                            line_score_hide_foot(data))
+    fragment['show'] = (line_score_show_body(data, hidden=hidden),
+                        line_score_show_foot(data, hidden=hidden))
+
+    _line_score_cache[key] = fragment
+    if len(_line_score_cache) > LINE_SCORE_CACHE_SIZE:
+        _line_score_cache.popitem(last=False)
+        _line_score_stats['evictions'] += 1
+
+    return _copy(fragment)
+
+
 def _location_row(data):
     date = datetime_as_est(decode_datetime(data['date']))
     start = date.strftime('%I:%M %p').lstrip('0')
@@ -328,7 +377,9 @@ def line_score_show_foot(data, hidden=False):
 def line_scores(nums, hidden=False):
     """Returns a dictionary of all line scores.
 
-    If including hidden line scores, also return the necessary dialogs.
+    If including hidden line scores, also return the necessary dialogs. The
+    line scores are read from the game index, rather than the game files, and
+    the tables for unchanged games are reused from the line score cache.
 
     Args:
         nums: The list of game numbers to include.
@@ -339,22 +390,36 @@ def line_scores(nums, hidden=False):
     """
     d = []
     s = {}
+    games = get_games(nums)
     for num in nums:
-        data = loads(os.path.join(GAMES_DIR, num + '.json'))
-        if hidden:
-            d.append(create_dialog(_date(data['date']), data['num']))
+        if num not in games:
+            continue
 
-            body = line_score_hide_body(data)
-            foot = line_score_hide_foot(data)
-            _add_line_score(s, data, body, foot)
+        data = games[num]
+        fragment = _line_score(data, hidden)
+        if hidden:
+            d.append(fragment['dialog'])
+            _add_line_score(s, data, *fragment['hide'])
 
-        body = line_score_show_body(data, hidden=hidden)
-        foot = line_score_show_foot(data, hidden=hidden)
-        _add_line_score(s, data, body, foot)
+        _add_line_score(s, data, *fragment['show'])
 
     return {'dialogs': d, 'scores': s}
 
 
+def line_score_stats():
+    """Returns the hit and miss counts of the line score cache.
+
+    Returns:
+        A mapping of statistic names to counts.
+    """
+    stats = dict(_line_score_stats)
+    stats.update({
+        'capacity': LINE_SCORE_CACHE_SIZE,
+        'size': len(_line_score_cache)
+    })
+    return stats
+
+
 def pending_hide_body(date, scores):
     """Creates a hidden pending table body for a given list of pending scores.
 
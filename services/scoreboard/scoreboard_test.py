@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for scoreboard.py."""
 
+import collections
 import json
 import os
 import re
@@ -19,9 +20,12 @@ from common.elements.elements import cell  # noqa
 from common.elements.elements import dialog  # noqa
 from common.elements.elements import row  # noqa
 from common.elements.elements import table  # noqa
+from common.styles.styles import get_styles  # noqa
 from common.test.test import get_testdata  # noqa
+from services.scoreboard import scoreboard  # noqa
 from services.scoreboard.scoreboard import line_score_show_body  # noqa
 from services.scoreboard.scoreboard import line_score_show_foot  # noqa
+from services.scoreboard.scoreboard import line_score_stats  # noqa
 from services.scoreboard.scoreboard import line_scores  # noqa
 from services.scoreboard.scoreboard import pending_show_body  # noqa
 from services.scoreboard.scoreboard import pending_carousel  # noqa
@@ -30,8 +34,6 @@ from services.scoreboard.scoreboard import pending_dialog  # noqa
 DATE_08280000 = datetime_datetime_pst(2024, 8, 28)
 DATE_08310000 = datetime_datetime_pst(2024, 8, 31)
 
-GAMES_DIR = re.sub(r'/services/scoreboard', '/resources/games', _path)
-
 TESTDATA = get_testdata()
 
 DIALOG_2449 = dialog(id_='d0828g2449')
@@ -64,6 +66,20 @@ SHOW_2469 = (GAME_2469['date'], SHOW_BODY_2469, SHOW_FOOT_2469)
 
 
 class ScoreboardTest(unittest.TestCase):
+    def setUp(self):
+        for name, value in [
+            ('_line_score_cache', collections.OrderedDict()),
+            ('_line_score_stats', {'evictions': 0, 'hits': 0, 'misses': 0}),
+        ]:
+            patch = mock.patch.object(scoreboard, name, value)
+            self.addCleanup(patch.stop)
+            patch.start()
+
+        version_patch = mock.patch.object(scoreboard, 'get_version')
+        self.addCleanup(version_patch.stop)
+        self.get_version_ = version_patch.start()
+        self.get_version_.return_value = 1
+
     def test_line_score_show_body(self):
         for num in ['2449', '2469', '2476']:
             data = json.loads(TESTDATA[num + '.json'])
@@ -80,7 +96,20 @@ class ScoreboardTest(unittest.TestCase):
             expected = json.loads(TESTDATA[s])
             self.assertEqual(actual, expected)
 
-    @mock.patch('services.scoreboard.scoreboard.loads')
+    @mock.patch.object(scoreboard, 'get_games')
+    def test_line_scores__styles(self, mock_get_games):
+        mock_get_games.return_value = {'2449': GAME_2449}
+
+        actual = get_styles(scoreboard.line_scores(['2449'], hidden=True))
+        self.assertTrue(actual)
+
+        for _ in range(3):
+            context = scoreboard.line_scores(['2449'], hidden=True)
+            self.assertEqual(get_styles(context), actual)
+
+        self.assertEqual(scoreboard.line_score_stats()['hits'], 3)
+
+    @mock.patch('services.scoreboard.scoreboard.get_games')
     @mock.patch('services.scoreboard.scoreboard.line_score_show_foot')
     @mock.patch('services.scoreboard.scoreboard.line_score_show_body')
     @mock.patch('services.scoreboard.scoreboard.line_score_hide_foot')
@@ -89,10 +118,10 @@ class ScoreboardTest(unittest.TestCase):
     def test_line_scores__hidden_false(self, mock_create_dialog,
                                        mock_hide_body, mock_hide_foot,
                                        mock_show_body, mock_show_foot,
-                                       mock_loads):
+                                       mock_get_games):
         mock_show_body.side_effect = [SHOW_BODY_2449, SHOW_BODY_2469]
         mock_show_foot.side_effect = [SHOW_FOOT_2449, SHOW_FOOT_2469]
-        mock_loads.side_effect = [GAME_2449, GAME_2469]
+        mock_get_games.return_value = {'2449': GAME_2449, '2469': GAME_2469}
 
         actual = line_scores(['2449', '2469'])
         expected = {
@@ -115,12 +144,9 @@ class ScoreboardTest(unittest.TestCase):
             mock.call(GAME_2449, hidden=False),
             mock.call(GAME_2469, hidden=False)
         ])
-        mock_loads.assert_has_calls([
-            mock.call(os.path.join(GAMES_DIR, '2449.json')),
-            mock.call(os.path.join(GAMES_DIR, '2469.json'))
-        ])
+        mock_get_games.assert_called_once_with(['2449', '2469'])
 
-    @mock.patch('services.scoreboard.scoreboard.loads')
+    @mock.patch('services.scoreboard.scoreboard.get_games')
     @mock.patch('services.scoreboard.scoreboard.line_score_show_foot')
     @mock.patch('services.scoreboard.scoreboard.line_score_show_body')
     @mock.patch('services.scoreboard.scoreboard.line_score_hide_foot')
@@ -128,13 +154,13 @@ class ScoreboardTest(unittest.TestCase):
     @mock.patch('services.scoreboard.scoreboard.create_dialog')
     def test_line_scores__hidden_true(self, mock_create_dialog, mock_hide_body,
                                       mock_hide_foot, mock_show_body,
-                                      mock_show_foot, mock_loads):
+                                      mock_show_foot, mock_get_games):
         mock_create_dialog.side_effect = [DIALOG_2449, DIALOG_2469]
         mock_hide_body.side_effect = [HIDE_BODY_2449, HIDE_BODY_2469]
         mock_hide_foot.side_effect = [HIDE_FOOT_2449, HIDE_FOOT_2469]
         mock_show_body.side_effect = [SHOW_BODY_2449, SHOW_BODY_2469]
         mock_show_foot.side_effect = [SHOW_FOOT_2449, SHOW_FOOT_2469]
-        mock_loads.side_effect = [GAME_2449, GAME_2469]
+        mock_get_games.return_value = {'2449': GAME_2449, '2469': GAME_2469}
 
         actual = line_scores(['2449', '2469'], hidden=True)
         expected = {
@@ -161,10 +187,91 @@ class ScoreboardTest(unittest.TestCase):
             mock.call(GAME_2449, hidden=True),
             mock.call(GAME_2469, hidden=True)
         ])
-        mock_loads.assert_has_calls([
-            mock.call(os.path.join(GAMES_DIR, '2449.json')),
-            mock.call(os.path.join(GAMES_DIR, '2469.json'))
+        mock_get_games.assert_called_once_with(['2449', '2469'])
+
+    @mock.patch.object(scoreboard, 'get_games')
+    @mock.patch.object(scoreboard, 'line_score_show_foot')
+    @mock.patch.object(scoreboard, 'line_score_show_body')
+    def test_line_scores__cached(self, mock_show_body, mock_show_foot,
+                                 mock_get_games):
+        mock_show_body.side_effect = [SHOW_BODY_2449, SHOW_BODY_2469]
+        mock_show_foot.side_effect = [SHOW_FOOT_2449, SHOW_FOOT_2469]
+        mock_get_games.return_value = {'2449': GAME_2449, '2469': GAME_2469}
+
+        line_scores(['2449'])
+        actual = line_scores(['2449', '2469'])
+        expected = {
+            'dialogs': [],
+            'scores': {
+                'T40': [SHOW_2449, SHOW_2469],
+                'T47': [SHOW_2449, SHOW_2469]
+            }
+        }
+        self.assertEqual(actual, expected)
+
+        mock_show_body.assert_has_calls([
+            mock.call(GAME_2449, hidden=False),
+            mock.call(GAME_2469, hidden=False)
         ])
+        self.assertEqual(mock_show_body.call_count, 2)
+        self.assertEqual(mock_show_foot.call_count, 2)
+
+        actual = line_score_stats()
+        expected = {
+            'capacity': 4096,
+            'evictions': 0,
+            'hits': 1,
+            'misses': 2,
+            'size': 2
+        }
+        self.assertEqual(actual, expected)
+
+    @mock.patch.object(scoreboard, 'get_games')
+    @mock.patch.object(scoreboard, 'line_score_show_foot')
+    @mock.patch.object(scoreboard, 'line_score_show_body')
+    def test_line_scores__changed(self, mock_show_body, mock_show_foot,
+                                  mock_get_games):
+        mock_show_body.side_effect = [SHOW_BODY_2449, SHOW_BODY_2469] * 2
+        mock_show_foot.side_effect = [SHOW_FOOT_2449, SHOW_FOOT_2469] * 2
+
+        game = dict(GAME_2449, mtime=1, size=2)
+        mock_get_games.return_value = {'2449': game}
+        line_scores(['2449'])
+
+        mock_get_games.return_value = {'2449': dict(game, mtime=3)}
+        line_scores(['2449'])
+
+        self.get_version_.return_value = 2
+        line_scores(['2449'])
+
+        self.assertEqual(mock_show_body.call_count, 3)
+        self.assertEqual(line_score_stats()['misses'], 3)
+
+    @mock.patch.object(scoreboard, 'LINE_SCORE_CACHE_SIZE', 1)
+    @mock.patch.object(scoreboard, 'get_games')
+    @mock.patch.object(scoreboard, 'line_score_show_foot')
+    @mock.patch.object(scoreboard, 'line_score_show_body')
+    def test_line_scores__evicted(self, mock_show_body, mock_show_foot,
+                                  mock_get_games):
+        mock_show_body.side_effect = [SHOW_BODY_2449, SHOW_BODY_2469] * 2
+        mock_show_foot.side_effect = [SHOW_FOOT_2449, SHOW_FOOT_2469] * 2
+        mock_get_games.return_value = {'2449': GAME_2449, '2469': GAME_2469}
+
+        line_scores(['2449', '2469'])
+        line_scores(['2469'])
+        line_scores(['2449'])
+
+        self.assertEqual(mock_show_body.call_count, 3)
+
+        actual = line_score_stats()
+        expected = {
+            'capacity': 1,
+            'evictions': 2,
+            'hits': 1,
+            'misses': 3,
+            'size': 1
+        }
+        self.assertEqual(actual, expected)
 
     def test_pending_show_body(self):
         date = encode_datetime(DATE_08280000)
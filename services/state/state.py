@@ -114,7 +114,7 @@ class State(object):
 
         cells = [left, right]
         tables.append_old_body(row(cells=cells))
-        tables.prepend_live_body(
+        tables.append_live_body(
             row(attributes=attributes,
                 clazz='livesimEvent d-none',
                 cells=cells))
@@ -122,7 +122,7 @@ class State(object):
         tables.append_live_event(('tick', delay, show))
 
     def create_summary_row(self, tables):
-        summary = tables.get_summary()
+        summary = list(tables.get_summary())
         for player in self.scored:
             summary.append('{} scores.'.format(player))
             self.runs[self.batting] += 1
@@ -191,7 +191,7 @@ class State(object):
 
         content = player_to_name_sub(content)
         cells = [cell(col=col(colspan='2'), content=content)]
-        tables.prepend_live_body(
+        tables.append_live_body(
             row(attributes=attributes,
                 clazz='livesimEvent d-none',
                 cells=cells))
@@ -200,6 +200,9 @@ class State(object):
     def get_change_inning(self):
         return self.change
 
+    def get_checkpoint(self):
+        return dict(vars(self))
+
     def get_outs(self):
         return self.outs
 
@@ -299,6 +302,9 @@ class State(object):
         self.bases = [None, None, None]
         self.change = True
 
+    def set_checkpoint(self, checkpoint):
+        self.__dict__.update(checkpoint)
+
     def set_inplay(self):
         self.inplay = True
 
@@ -5,6 +5,7 @@
 import logging
 import datetime
 import os
+import random
 import re
 import sys
 
@@ -17,9 +18,9 @@ from common.datetime_.datetime_ import datetime_as_pst  # noqa
 from common.datetime_.datetime_ import datetime_datetime_est  # noqa
 from common.datetime_.datetime_ import datetime_datetime_pst  # noqa
 from common.datetime_.datetime_ import encode_datetime  # noqa
+from common.games.games import put_game  # noqa
 from common.json_.json_ import dumps  # noqa
 from common.re_.re_ import findall  # noqa
-from common.re_.re_ import match  # noqa
 from common.re_.re_ import search  # noqa
 from common.reference.reference import put_players  # noqa
 from common.requests_.requests_ import get  # noqa
@@ -29,14 +30,7 @@ from common.teams.teams import encoding_to_hometown  # noqa
 from types_.event.event import Event  # noqa
 
 
-def _open(in_):
-    text = ''
-    if in_.startswith('http'):
-        text = get(in_)
-    elif os.path.isfile(in_):
-        with open(in_, 'r', encoding='iso-8859-1') as f:
-            text = f.read()
-
+def _clean(text):
     text = decoding_to_encoding_sub(text)
     text = re.sub(r'<a href="../\w+/player_(\d+)\.[^<]+</a>', r'P\1', text)
     text = re.sub(r'\s+', ' ', text)
@@ -47,6 +41,17 @@ def _open(in_):
     return text
 
 
+def _open(in_, **kwargs):
+    text = ''
+    if in_.startswith('http'):
+        text = get(in_, **kwargs)
+    elif os.path.isfile(in_):
+        with open(in_, 'r', encoding='iso-8859-1') as f:
+            text = f.read()
+
+    return _clean(text)
+
+
 def _parse_innings(text, html):
     regex = r'(?s)(\w+) batting - Pitching for (\w+) : \w+ (\w+)(.+?)'
     if html:
@@ -73,16 +78,7 @@ def _parse_lines(content, html):
     return list(filter(bool, lines))
 
 
-def parse_player(link):
-    """Parse a StatsLab player page into a reference-readable format.
-
-    Args:
-        link: The StatsLab player page link.
-
-    Returns:
-        A data string if the parse was successful, otherwise None.
-    """
-    text = _open(link)
+def _parse_player(text):
     number, name = search(r'Player Report for #(\d+) ([^<]+)</title>', text)
     if not number:
         return None
@@ -103,7 +99,32 @@ def parse_player(link):
     return ' '.join(data)
 
 
-def parse_game(box_in, log_in, out, date):
+def parse_player(link, **kwargs):
+    """Parse a StatsLab player page into a reference-readable format.
+
+    Args:
+        link: The StatsLab player page link.
+        kwargs: Optional keyword arguments for the page request (e.g. retries).
+
+    Returns:
+        A data string if the parse was successful, otherwise None.
+    """
+    return _parse_player(_open(link, **kwargs))
+
+
+def parse_player_page(text):
+    """Parse the already-downloaded contents of a StatsLab player page.
+
+    Args:
+        text: The raw player page contents.
+
+    Returns:
+        A data string if the parse was successful, otherwise None.
+    """
+    return _parse_player(_clean(text))
+
+
+def parse_game(box_in, log_in, out, date, pack=False, rng=random):
     """Parse a StatsLab box score and game log into a task-readable format.
 
     If the game is parsed successfully, the resulting data is written to a
@@ -116,6 +137,8 @@ def parse_game(box_in, log_in, out, date):
         log_in: The StatsLab game log link or file path.
         out: The file path to write the parsed data to.
         date: The encoded date that the game is expected to match.
+        pack: Whether to write the game events packed.
+        rng: The random number generator for choosing jersey colors.
 
     Returns:
         The game data if the parse was successful, otherwise None.
@@ -238,16 +261,14 @@ def parse_game(box_in, log_in, out, date):
     data['home_pitcher'] = home_pitcher
 
     events = []
-    events_map = call_service('events', 'get_map', ())
     for inning in _parse_innings(log_text, html):
         batting, pitching, pitcher, content = inning
         lines = _parse_lines(content, html)
         for i, line in enumerate(lines):
-            for event, regex in events_map.items():
-                groups = match(regex, line)
-                if groups is not None:
-                    events.append(event.encode(*groups))
-                    break
+            classified = call_service('events', 'classify', (line, ))
+            if classified is not None:
+                event, groups = classified
+                events.append(event.encode(*groups))
             else:
                 events.append(Event.SPECIAL.encode('<br>'.join(lines[i:])))
                 _logger.log(logging.DEBUG, '\n'.join([log_in, line]))
@@ -258,13 +279,19 @@ def parse_game(box_in, log_in, out, date):
         if away_inning:
             events.append(Event.CHANGE_INNING.encode(away_inning, home_inning))
 
-    data['events'] = events
+    data['events'] = Event.pack(events) if pack else events
 
     day = d.weekday()
     home_fargs = (home, day, 'home', None)
-    home_colors = call_service('uniforms', 'jersey_colors', home_fargs)
+    home_colors = call_service('uniforms',
+                               'jersey_colors',
+                               home_fargs,
+                               rng=rng)
     away_fargs = (away, day, 'away', home_colors[0])
-    away_colors = call_service('uniforms', 'jersey_colors', away_fargs)
+    away_colors = call_service('uniforms',
+                               'jersey_colors',
+                               away_fargs,
+                               rng=rng)
 
     data['away_colors'] = ' '.join(away_colors)
     data['home_colors'] = ' '.join(home_colors)
@@ -275,5 +302,6 @@ def parse_game(box_in, log_in, out, date):
 
     with open(out, 'w') as f:
         f.write(dumps(data) + '\n')
+    put_game(data)
 
     return data
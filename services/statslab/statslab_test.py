@@ -21,6 +21,7 @@ from common.test.test import Suite  # noqa
 from common.test.test import WMock  # noqa
 from common.test.test import get_testdata  # noqa
 from services.statslab.statslab import parse_player  # noqa
+from services.statslab.statslab import parse_player_page  # noqa
 from services.statslab.statslab import parse_game  # noqa
 
 DATE_03100000 = datetime_datetime_pst(2025, 3, 10)
@@ -140,12 +141,18 @@ class StatslabTest(unittest.TestCase):
         ])
         mock_open.assert_not_called()
 
+    def test_parse_player_page(self):
+        actual = parse_player_page(TESTDATA['player_54297.html'])
+        expected = 'T30 56 R R Lineu Murraas'
+        self.assertEqual(actual, expected)
+
+    @mock.patch('services.statslab.statslab.put_game')
     @mock.patch('services.statslab.statslab.put_players')
     @mock.patch('services.statslab.statslab.open', create=True)
     @mock.patch('services.statslab.statslab.get')
     @mock.patch('services.statslab.statslab.os.path.isfile')
     def test_parse_game__file(self, mock_isfile, mock_get, mock_open,
-                              mock_put):
+                              mock_put, mock_put_game):
         mock_isfile.return_value = True
         suite = Suite(
             RMock(EXTRACT_BOX_SCORES, 'game_box_23520.html', TESTDATA),
@@ -188,12 +195,13 @@ class StatslabTest(unittest.TestCase):
         mock_put.assert_has_calls([mock.call(p) for p in PLAYERS])
         suite.verify()
 
+    @mock.patch('services.statslab.statslab.put_game')
     @mock.patch('services.statslab.statslab.put_players')
     @mock.patch('services.statslab.statslab.open', create=True)
     @mock.patch('services.statslab.statslab.get')
     @mock.patch('services.statslab.statslab.os.path.isfile')
     def test_parse_game__link(self, mock_isfile, mock_get, mock_open,
-                              mock_put):
+                              mock_put, mock_put_game):
         mock_isfile.return_value = False
         mock_get.side_effect = [
             TESTDATA['game_box_23520.html'],
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Service (reloadable) methods for storing gameday player information."""
+"""Service (reloadable) methods for storing gameday player information.
+
+The live body and foot are displayed newest first. Rows are accumulated in the
+order that they are added, and reversed once when the live tables are built.
+"""
 
 import os
 import re
@@ -31,6 +35,12 @@ class Tables(object):
         for r in self.old_body:
             tbody(self.old_table, r)
 
+    def append_live_body(self, r):
+        self.live_body.append(r)
+
+    def append_live_foot(self, r):
+        self.live_foot.append(r)
+
     def append_live_event(self, e):
         self.live_events.append(e)
 
@@ -46,7 +56,7 @@ class Tables(object):
     def create_old_table(self, roster, state):
         self.old_tables.append(state.create_old_head_table())
 
-        body, self.old_body = list(self.old_body), []
+        body, self.old_body = self.old_body, []
         if body:
             t = table(clazz='border border-bottom-0', body=body)
             self.old_tables.append(t)
@@ -57,8 +67,11 @@ class Tables(object):
         self.old_table = table(clazz='border mb-3', bcols=bcols, body=[])
         self.old_tables.append(self.old_table)
 
+    def get_checkpoint(self):
+        return dict(vars(self))
+
     def get_old_body(self):
-        return list(self.old_body)
+        return self.old_body
 
     def get_live_events(self):
         return self.live_events
@@ -67,21 +80,15 @@ class Tables(object):
         return self.live_head + [
             table(clazz='table-fixed border mb-3',
                   bcols=[col(), col(clazz='css-style-w-50px text-right')],
-                  body=self.live_body),
-            table(clazz='border mb-3', body=self.live_foot),
+                  body=self.live_body[::-1]),
+            table(clazz='border mb-3', body=self.live_foot[::-1]),
         ]
 
     def get_old_tables(self):
         return self.old_tables
 
     def get_summary(self):
-        return list(self.summary)
-
-    def prepend_live_body(self, r):
-        self.live_body.insert(0, r)
-
-    def prepend_live_foot(self, r):
-        self.live_foot.insert(0, r)
+        return self.summary
 
     def reset_all(self):
         self.old_body = []
@@ -93,6 +100,12 @@ class Tables(object):
     def reset_summary(self):
         self.summary = []
 
+    def set_checkpoint(self, checkpoint):
+        self.__dict__.update(checkpoint)
+        self.live_events = [tuple(e) for e in self.live_events]
+        if self.old_tables and self.old_tables[-1] == self.old_table:
+            self.old_table = self.old_tables[-1]
+
 
 def create_tables():
     return Tables()
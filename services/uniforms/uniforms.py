@@ -433,7 +433,7 @@ def jersey_absolute(encoding, colors, num, side, classes):
     return '\n'.join(jersey)
 
 
-def jersey_colors(encoding, day, team, clash):
+def jersey_colors(encoding, day, team, clash, rng=random):
     alternates = _encoding_to_alternates(encoding)
     for colors, constraints in alternates:
         if colors[0] in CLASH_MAP.get(clash, {}):
@@ -442,7 +442,7 @@ def jersey_colors(encoding, day, team, clash):
         days, pct, teams = constraints
         if day not in days:
             continue
-        if pct < random.random():
+        if pct < rng.random():
             continue
         if not re.search(teams, team):
             continue
@@ -125,6 +125,18 @@ class UniformsTest(unittest.TestCase):
         expected = (RED, '#ffffff', '#000000', 'reds')
         self.assertEqual(actual, expected)
 
+    @mock.patch('services.uniforms.uniforms.random.random')
+    def test_jersey_colors__rng(self, mock_random):
+        rng = mock.Mock()
+        rng.random.return_value = 0.3
+
+        actual = jersey_colors('T37', SUNDAY, 'home', None, rng=rng)
+        expected = (RED, '#ffffff', '#000000', 'reds')
+        self.assertEqual(actual, expected)
+
+        rng.random.assert_called_once_with()
+        mock_random.assert_not_called()
+
     @mock.patch('services.uniforms.uniforms.random.random')
     def test_jersey_colors__team_false(self, mock_random):
         mock_random.return_value = 0.3
@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Downloads and extracts league file."""
+"""Downloads and extracts league file.
 
+A failed download is not re-queued straight away. Instead, a retry is scheduled
+with exponential backoff from the time of the failure (not the time that the
+download was queued), and queued by the first run after it is due. The
+league file service keeps the partial file, so the retry resumes the download.
+"""
+
+import datetime
 import logging
 import os
 import re
@@ -14,6 +21,7 @@ sys.path.append(re.sub(r'/tasks/leaguefile', '', _path))
 from api.messageable.messageable import Messageable  # noqa
 from api.runnable.runnable import Runnable  # noqa
 from api.serializable.serializable import Serializable  # noqa
+from common.datetime_.datetime_ import datetime_now  # noqa
 from common.datetime_.datetime_ import decode_datetime  # noqa
 from common.datetime_.datetime_ import encode_datetime  # noqa
 from common.messageable.messageable import messageable  # noqa
@@ -28,19 +36,35 @@ DOMAIN_NAME = 'statsplus.net'
 FILE_NAME = 'orange%20and%20blue%20league%20baseball.zip'
 FILE_URL = 'https://{}/oblootp/files/{}'.format(DOMAIN_NAME, FILE_NAME)
 
+BACKOFF = 60
+BACKOFF_MAX = 3600
+
 
 class Download(Messageable, Runnable, Serializable):
     def __init__(self, **kwargs):
         super(Download, self).__init__(**kwargs)
 
+        self.attempts = 0
+        self.retry = None
+
     def _notify_internal(self, **kwargs):
         if kwargs['notify'] == Notify.UPLOAD_FINISH:
             return self.start(**kwargs)
 
         return Response()
 
+    def _run_internal(self, **kwargs):
+        if self.retry is None or kwargs['date'] < self.retry:
+            return Response()
+
+        self.retry = None
+        return Response(
+            thread_=[Thread(target='download_start', kwargs=kwargs)])
+
     @messageable
     def start(self, *args, **kwargs):
+        self.attempts = 0
+        self.retry = None
         return Response(
             thread_=[Thread(target='download_start', kwargs=kwargs)])
 
@@ -48,14 +72,20 @@ class Download(Messageable, Runnable, Serializable):
         output = call_service('leaguefile', 'download_file', (FILE_URL, ))
         if output.get('ok'):
             _logger.log(logging.INFO, 'Download finished.')
-            response = self.extract_file(**kwargs)
-        else:
-            extra = {'stdout': output['stdout'], 'stderr': output['stderr']}
-            _logger.log(logging.WARNING, 'Download failed.', extra=extra)
-            response = Response(
-                thread_=[Thread(target='download_start', kwargs=kwargs)])
+            self.attempts = 0
+            return self.extract_file(**kwargs)
 
-        return response
+        return self.download_failed(output, **kwargs)
+
+    def download_failed(self, output, **kwargs):
+        extra = {'stdout': output['stdout'], 'stderr': output['stderr']}
+        _logger.log(logging.WARNING, 'Download failed.', extra=extra)
+
+        seconds = min(BACKOFF * 2**self.attempts, BACKOFF_MAX)
+        self.attempts += 1
+        self.retry = datetime_now() + datetime.timedelta(seconds=seconds)
+
+        return Response()
 
     def download_start(self, **kwargs):
         output = check_output(['ping', '-c 1', DOMAIN_NAME], timeout=10)
@@ -63,10 +93,7 @@ class Download(Messageable, Runnable, Serializable):
             _logger.log(logging.INFO, 'Download started.')
             return self.download_file(**kwargs)
 
-        extra = {'stdout': output['stdout'], 'stderr': output['stderr']}
-        _logger.log(logging.WARNING, 'Download failed.', extra=extra)
-        return Response(
-            thread_=[Thread(target='download_start', kwargs=kwargs)])
+        return self.download_failed(output, **kwargs)
 
     def extract_file(self, **kwargs):
         start = decode_datetime(self.data['end'])
@@ -29,6 +29,7 @@ DATE_10260000 = datetime_datetime_pst(1985, 10, 26)
 DATE_10260602 = datetime_datetime_pst(1985, 10, 26, 6, 2, 30)
 DATE_10260604 = datetime_datetime_pst(1985, 10, 26, 6, 4)
 DATE_10260605 = datetime_datetime_pst(1985, 10, 26, 6, 5)
+DATE_10260608 = datetime_datetime_pst(1985, 10, 26, 6, 8)
 
 DOMAIN_NAME = 'statsplus.net'
 FILE_NAME = 'orange%20and%20blue%20league%20baseball.zip'
@@ -52,6 +53,10 @@ class DownloadTest(Test):
         self.addCleanup(open_patch.stop)
         self.open_ = open_patch.start()
 
+        replace_patch = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(replace_patch.stop)
+        self.replace_ = replace_patch.start()
+
     def init_mocks(self, data):
         mo = mock.mock_open(read_data=dumps(data))
         self.open_handle_ = mo()
@@ -92,29 +97,66 @@ class DownloadTest(Test):
 
         self.assertNotCalled(mock_start, self.log_, self.open_handle_.write)
 
+    def test_run__due(self):
+        download = self.create_download(_data())
+        download.attempts = 1
+        download.retry = DATE_10260605
+        response = download._run_internal(date=DATE_10260605)
+        thread_ = Thread(target='download_start',
+                         kwargs={'date': DATE_10260605})
+        self.assertEqual(response, Response(thread_=[thread_]))
+        self.assertEqual(download.attempts, 1)
+        self.assertIsNone(download.retry)
+
+        self.assertNotCalled(self.log_, self.open_handle_.write)
+
+    def test_run__pending(self):
+        download = self.create_download(_data())
+        download.attempts = 1
+        download.retry = DATE_10260605
+        response = download._run_internal(date=DATE_10260604)
+        self.assertEqual(response, Response())
+        self.assertEqual(download.retry, DATE_10260605)
+
+        self.assertNotCalled(self.log_, self.open_handle_.write)
+
+    def test_run__unscheduled(self):
+        download = self.create_download(_data())
+        response = download._run_internal(date=DATE_10260604)
+        self.assertEqual(response, Response())
+
+        self.assertNotCalled(self.log_, self.open_handle_.write)
+
     def test_start(self):
         download = self.create_download(_data(end=DATE_10260602))
+        download.attempts = 2
+        download.retry = DATE_10260605
         response = download.start(date=DATE_10260604)
         thread_ = Thread(target='download_start',
                          kwargs={'date': DATE_10260604})
         self.assertEqual(response, Response(thread_=[thread_]))
+        self.assertEqual(download.attempts, 0)
+        self.assertIsNone(download.retry)
 
         self.assertNotCalled(self.log_, self.open_handle_.write)
 
     @mock.patch.object(Download, 'extract_file')
+    @mock.patch('tasks.download.download.datetime_now')
     @mock.patch('tasks.download.download.call_service')
-    def test_download_file__failed(self, call_service_, extract_file_):
+    def test_download_file__failed(self, call_service_, datetime_now_,
+                                   extract_file_):
         call_service_.return_value = {
             'ok': False,
             'stdout': 'o',
             'stderr': 'e'
         }
+        datetime_now_.return_value = DATE_10260604
 
-        now = DATE_10260604
         download = self.create_download(_data())
-        response = download.download_file(date=now)
-        thread_ = Thread(target='download_start', kwargs={'date': now})
-        self.assertEqual(response, Response(thread_=[thread_]))
+        response = download.download_file(date=DATE_10260000)
+        self.assertEqual(response, Response())
+        self.assertEqual(download.attempts, 1)
+        self.assertEqual(download.retry, DATE_10260605)
 
         extra = {'stdout': 'o', 'stderr': 'e'}
         call_service_.assert_called_once_with('leaguefile', 'download_file',
@@ -132,8 +174,10 @@ class DownloadTest(Test):
 
         now = DATE_10260604
         download = self.create_download(_data())
+        download.attempts = 2
         response = download.download_file(date=now)
         self.assertEqual(response, Response(notify=[Notify.BASE]))
+        self.assertEqual(download.attempts, 0)
 
         call_service_.assert_called_once_with('leaguefile', 'download_file',
                                               (FILE_URL, ))
@@ -142,19 +186,23 @@ class DownloadTest(Test):
         self.assertNotCalled(self.open_handle_.write)
 
     @mock.patch.object(Download, 'download_file')
+    @mock.patch('tasks.download.download.datetime_now')
     @mock.patch('tasks.download.download.check_output')
-    def test_download_start__failed(self, check_output_, download_file_):
+    def test_download_start__failed(self, check_output_, datetime_now_,
+                                    download_file_):
         check_output_.return_value = {
             'ok': False,
             'stdout': 'o',
             'stderr': 'e'
         }
+        datetime_now_.return_value = DATE_10260604
 
         download = self.create_download(_data())
-        response = download.download_start(date=DATE_10260604)
-        thread_ = Thread(target='download_start',
-                         kwargs={'date': DATE_10260604})
-        self.assertEqual(response, Response(thread_=[thread_]))
+        download.attempts = 2
+        response = download.download_start(date=DATE_10260000)
+        self.assertEqual(response, Response())
+        self.assertEqual(download.attempts, 3)
+        self.assertEqual(download.retry, DATE_10260608)
 
         extra = {'stdout': 'o', 'stderr': 'e'}
         check_output_.assert_called_once_with(['ping', '-c 1', DOMAIN_NAME],
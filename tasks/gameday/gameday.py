@@ -1,11 +1,33 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Builds playable live sim pages for sim results."""
-
+"""Builds playable live sim pages for sim results.
+
+Live sim pages are rendered incrementally. A manifest records the content hash
+of each game that has a rendered page, along with hashes of the templates,
+source modules and player reference data that the page was rendered with. The
+source modules are the services that build a live sim page and the common
+modules whose output ends up in its markup. A game is only re-rendered when its
+content changes, when its page is missing, or when the templates, source
+modules or player reference data change. A game is recorded in
+the manifest only once its page has been written. Pages for games which no
+longer exist are removed individually.
+
+When more than one game needs a page, the pages are rendered in a pool of
+worker processes. Each worker sets up its own reference (from the saved player
+data) and jinja2 environment once (loading the compiled templates from the
+bytecode cache), then builds the template data for a game and dumps the
+rendered page itself.
+"""
+
+import concurrent.futures
+import hashlib
+import logging
+import multiprocessing
 import os
 import re
 import sys
 
+_logger = logging.getLogger('filefairy')
 _path = os.path.dirname(os.path.abspath(__file__))
 _root = re.sub(r'/tasks/gameday', '', _path)
 sys.path.append(_root)
@@ -18,6 +40,7 @@ from common.datetime_.datetime_ import datetime_replace  # noqa
 from common.datetime_.datetime_ import decode_datetime  # noqa
 from common.datetime_.datetime_ import encode_datetime  # noqa
 from common.datetime_.datetime_ import suffix  # noqa
+from common.datetime_.datetime_ import timestamp  # noqa
 from common.dict_.dict_ import merge  # noqa
 from common.elements.elements import anchor  # noqa
 from common.elements.elements import cell  # noqa
@@ -25,13 +48,18 @@ from common.elements.elements import col  # noqa
 from common.elements.elements import row  # noqa
 from common.elements.elements import topper  # noqa
 from common.io_.io_ import read_data  # noqa
+from common.jinja2_.jinja2_ import env  # noqa
 from common.json_.json_ import loads  # noqa
 from common.os_.os_ import listdirs  # noqa
+from common.reference.reference import get_digest  # noqa
+from common.reference.reference import set_reference  # noqa
 from common.service.service import call_service  # noqa
+from common.service.service import reload_services  # noqa
 from common.subprocess_.subprocess_ import check_output  # noqa
 from common.teams.teams import encoding_keys  # noqa
 from common.teams.teams import encoding_to_decoding  # noqa
 from common.teams.teams import icon_absolute  # noqa
+from impl.reference.reference import Reference  # noqa
 from types_.notify.notify import Notify  # noqa
 from types_.response.response import Response  # noqa
 
@@ -40,6 +68,73 @@ FAIRYLAB_DIR = _root + '/fairylab'
 GAMEDAY_DIR = os.path.join(FAIRYLAB_DIR, 'gameday')
 
 GAMES_DIR = re.sub(r'/tasks/gameday', '/resources/games', _path)
+TEMPLATES_DIR = _root + '/resources/templates'
+
+LIVESIM_SOURCES = [
+    'api/renderable/renderable.py',
+    'common/elements/elements.py',
+    'common/events/events.py',
+    'common/styles/styles.py',
+    'common/teams/teams.py',
+    'services/livesim/livesim.py',
+    'services/roster/roster.py',
+    'services/state/state.py',
+    'services/tables/tables.py',
+    'services/uniforms/uniforms.py',
+    'types_/event/event.py',
+]
+LIVESIM_TEMPLATES = ['base.html', 'common.html', 'livesim.html']
+
+PROCESSES = os.cpu_count() or 1
+
+
+def _hash(paths):
+    h = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _nums():
+    return [
+        name[:-5] for name in sorted(os.listdir(GAMES_DIR))
+        if name.endswith('.json')
+    ]
+
+
+def _get_livesim_data(num):
+    in_ = os.path.join(GAMES_DIR, num + '.json')
+    return call_service(
+        'livesim', 'get_html', (in_, ), compact=True, checkpoint=True)
+
+
+def _get_livesim_url(num):
+    return 'gameday/{}/index.html'.format(num)
+
+
+_environment = None
+
+
+def _init_worker(date):
+    global _environment
+    _environment = env()
+    reload_services()
+    set_reference(Reference(date=date))
+
+
+def _render_livesim(e, num, date, test):
+    livesim_html = _get_livesim_data(num)
+    if not livesim_html:
+        return False
+
+    url = _get_livesim_url(num)
+    Gameday._render_page(e, url, num, 'livesim.html', livesim_html, date, test)
+    return True
+
+
+def _render_livesim_worker(num, date):
+    return _render_livesim(_environment, num, date, False)
 
 
 class Gameday(Renderable, Runnable, Serializable):
@@ -58,18 +153,36 @@ class Gameday(Renderable, Runnable, Serializable):
         gameday_html = self.get_gameday_html(**kwargs)
         datas = [('gameday/index.html', '', 'gameday.html', gameday_html)]
 
-        nums = listdirs(GAMEDAY_DIR)
-        for name in os.listdir(GAMES_DIR):
-            num = name.strip('.json')
-            if num in nums:
-                continue
-
-            in_ = os.path.join(GAMES_DIR, name)
-            livesim_html = call_service('livesim', 'get_html', (in_, ))
-            if livesim_html:
-                url = 'gameday/{}/index.html'.format(num)
-                datas.append((url, num, 'livesim.html', livesim_html))
-                check_output(['mkdir', os.path.join(GAMEDAY_DIR, num)])
+        manifest = self.data['manifest']
+        versions = self.get_versions()
+        games = manifest['games']
+        if any(manifest[k] != v for k, v in versions.items()):
+            games = {}
+
+        hashes = {}
+        rendered = {}
+        for num in _nums():
+            in_ = os.path.join(GAMES_DIR, num + '.json')
+            hashes[num] = _hash([in_])
+
+            out = os.path.join(GAMEDAY_DIR, num, 'index.html')
+            if games.get(num) == hashes[num] and os.path.isfile(out):
+                rendered[num] = hashes[num]
+
+        nums = [num for num in hashes if num not in rendered]
+        processes = kwargs.get('processes', PROCESSES)
+        if processes > 1 and len(nums) > 1:
+            nums = self.render_pooled(nums, processes, kwargs['date'])
+        else:
+            nums = self.render_serial(nums, kwargs['date'], kwargs.get('test'))
+
+        for num in nums:
+            rendered[num] = hashes[num]
+
+        manifest = dict(versions, games=rendered)
+        if manifest != self.data['manifest']:
+            self.data['manifest'] = manifest
+            self._write()
 
         return datas
 
@@ -90,8 +203,14 @@ class Gameday(Renderable, Runnable, Serializable):
         return Response()
 
     def cleanup(self):
-        check_output(['rm', '-rf', GAMEDAY_DIR])
-        check_output(['mkdir', GAMEDAY_DIR])
+        if not os.path.isdir(GAMEDAY_DIR):
+            check_output(['mkdir', GAMEDAY_DIR])
+            return
+
+        nums = _nums()
+        for num in listdirs(GAMEDAY_DIR):
+            if num not in nums:
+                check_output(['rm', '-rf', os.path.join(GAMEDAY_DIR, num)])
 
     def get_gameday_html(self, **kwargs):
         ret = {
@@ -99,10 +218,7 @@ class Gameday(Renderable, Runnable, Serializable):
             'dialogs': [],
         }
 
-        nums = [
-            name[:-5] for name in os.listdir(GAMES_DIR)
-            if name.endswith('.json')
-        ]
+        nums = _nums()
         data = call_service('scoreboard', 'line_scores', (nums, ), hidden=True)
         line = data['scores']
 
@@ -152,6 +268,56 @@ class Gameday(Renderable, Runnable, Serializable):
 
         return ret
 
+    def render_serial(self, nums, date, test):
+        date = timestamp(date)
+
+        rendered = []
+        for num in nums:
+            try:
+                if _render_livesim(self.environment, num, date, test):
+                    rendered.append(num)
+            except Exception:
+                _logger.log(logging.WARNING, 'Handled warning.', exc_info=True)
+
+        return rendered
+
+    def render_pooled(self, nums, processes, date):
+        context = multiprocessing.get_context('spawn')
+        executor = concurrent.futures.ProcessPoolExecutor(
+            min(processes, len(nums)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(date, ))
+
+        date = timestamp(date)
+        with executor:
+            futures = {
+                executor.submit(_render_livesim_worker, num, date): num
+                for num in nums
+            }
+
+            rendered = []
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    if future.result():
+                        rendered.append(futures[future])
+                except Exception:
+                    _logger.log(logging.WARNING,
+                                'Handled warning.',
+                                exc_info=True)
+
+        return sorted(rendered)
+
+    @staticmethod
+    def get_versions():
+        sources = [os.path.join(_root, s) for s in LIVESIM_SOURCES]
+        templates = [os.path.join(TEMPLATES_DIR, t) for t in LIVESIM_TEMPLATES]
+        return {
+            'reference': get_digest(),
+            'sources': _hash(sources),
+            'templates': _hash(templates),
+        }
+
 
 # from common.datetime_.datetime_ import datetime_now
 # from common.jinja2_.jinja2_ import env
@@ -2,9 +2,13 @@
 # -*- coding: utf-8 -*-
 """Tests for gameday.py."""
 
+import logging
 import os
 import re
+import shutil
 import sys
+import tempfile
+import unittest.mock as mock
 
 _path = os.path.dirname(os.path.abspath(__file__))
 sys.path.extend((_path, re.sub(r'/tasks/gameday', '', _path)))
@@ -13,17 +17,243 @@ from common.datetime_.datetime_ import datetime_datetime_pst  # noqa
 from common.jinja2_.jinja2_ import env  # noqa
 from common.test.test import Test  # noqa
 from common.test.test import main  # noqa
+from tasks.gameday import gameday  # noqa
 from tasks.gameday.gameday import Gameday  # noqa
+from tasks.gameday.gameday import _init_worker  # noqa
+from tasks.gameday.gameday import _render_livesim_worker  # noqa
 
 ENV = env()
 
 DATE_10260602 = datetime_datetime_pst(1985, 10, 26, 6, 2, 30)
 
+TESTDATA_DIR = re.sub(r'/tasks/gameday', '/common/test/testdata', _path)
+
+
+def _data(games=None, started=False):
+    manifest = dict(Gameday.get_versions(), games=games or {})
+    return {'manifest': manifest, 'started': started}
+
 
 class GamedayTest(Test):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+
+        self.dirs = {}
+        for name in ['GAMEDAY_DIR', 'GAMES_DIR']:
+            self.dirs[name] = os.path.join(tmpdir.name, name.lower())
+            os.mkdir(self.dirs[name])
+            dir_patch = mock.patch.object(gameday, name, self.dirs[name])
+            self.addCleanup(dir_patch.stop)
+            dir_patch.start()
+
+        for num in ['2449', '2469']:
+            shutil.copy(os.path.join(TESTDATA_DIR, num + '.json'),
+                        self.dirs['GAMES_DIR'])
+
+        service_patch = mock.patch.object(gameday, 'call_service')
+        self.addCleanup(service_patch.stop)
+        self.call_service_ = service_patch.start()
+        self.call_service_.side_effect = (
+            lambda s, m, fargs, compact, checkpoint: {'in': fargs[0]})
+
+        digest_patch = mock.patch.object(gameday, 'get_digest')
+        self.addCleanup(digest_patch.stop)
+        self.get_digest_ = digest_patch.start()
+        self.get_digest_.return_value = 'a'
+
+        page_patch = mock.patch.object(Gameday, '_render_page')
+        self.addCleanup(page_patch.stop)
+        self.render_page_ = page_patch.start()
+
+        html_patch = mock.patch.object(Gameday, 'get_gameday_html')
+        self.addCleanup(html_patch.stop)
+        self.get_gameday_html_ = html_patch.start()
+        self.get_gameday_html_.return_value = {}
+
+        write_patch = mock.patch.object(Gameday, '_write')
+        self.addCleanup(write_patch.stop)
+        self.write_ = write_patch.start()
+
     def init_mocks(self, data):
         pass
 
+    def create_gameday(self, data):
+        instance = Gameday(date=DATE_10260602, e=ENV)
+        instance.data = data
+        return instance
+
+    def render(self, nums):
+        for num in nums:
+            path = os.path.join(self.dirs['GAMEDAY_DIR'], num)
+            os.mkdir(path)
+            with open(os.path.join(path, 'index.html'), 'w') as f:
+                f.write('')
+
+    def assertRendered(self, datas, nums):
+        expected = [('gameday/index.html', '', 'gameday.html', {})]
+        self.assertEqual(datas, expected)
+
+        calls = []
+        for num in nums:
+            in_ = os.path.join(self.dirs['GAMES_DIR'], num + '.json')
+            url = 'gameday/{}/index.html'.format(num)
+            calls.append(
+                mock.call(ENV, url, num, 'livesim.html', {'in': in_},
+                          '06:02:30 PDT (1985-10-26)', None))
+        self.assertEqual(self.render_page_.call_args_list, calls)
+
+    def hashes(self):
+        return {
+            num: gameday._hash(
+                [os.path.join(self.dirs['GAMES_DIR'], num + '.json')])
+            for num in ['2449', '2469']
+        }
+
+    def test_cleanup(self):
+        self.render(['2449', '2469', '2476'])
+        instance = self.create_gameday(_data())
+
+        with mock.patch.object(gameday, 'check_output') as check_output_:
+            instance.cleanup()
+
+        path = os.path.join(self.dirs['GAMEDAY_DIR'], '2476')
+        check_output_.assert_called_once_with(['rm', '-rf', path])
+
+    def test_render_data__changed(self):
+        self.render(['2449', '2469'])
+        hashes = self.hashes()
+        instance = self.create_gameday(_data(dict(hashes, **{'2469': 'a'})))
+
+        actual = instance._render_data(date=DATE_10260602, processes=1)
+        self.assertRendered(actual, ['2469'])
+        self.assertEqual(instance.data, _data(hashes))
+        self.write_.assert_called_once_with()
+
+    def test_render_data__failed(self):
+        self.render_page_.side_effect = [Exception(), None]
+        instance = self.create_gameday(_data())
+
+        with mock.patch.object(gameday, '_logger') as logger_:
+            actual = instance._render_data(date=DATE_10260602, processes=1)
+        self.assertRendered(actual, ['2449', '2469'])
+        self.assertEqual(instance.data, _data({'2469': self.hashes()['2469']}))
+        self.write_.assert_called_once_with()
+
+        logger_.log.assert_called_once_with(logging.WARNING,
+                                            'Handled warning.',
+                                            exc_info=True)
+
+    def test_render_data__missing(self):
+        self.render(['2449'])
+        hashes = self.hashes()
+        instance = self.create_gameday(_data(hashes))
+
+        actual = instance._render_data(date=DATE_10260602, processes=1)
+        self.assertRendered(actual, ['2469'])
+        self.assertEqual(instance.data, _data(hashes))
+        self.assertNotCalled(self.write_)
+
+    def test_render_data__new(self):
+        instance = self.create_gameday(_data())
+
+        actual = instance._render_data(date=DATE_10260602, processes=1)
+        self.assertRendered(actual, ['2449', '2469'])
+        self.assertEqual(instance.data, _data(self.hashes()))
+        self.write_.assert_called_once_with()
+
+    @mock.patch.object(gameday, 'concurrent')
+    def test_render_data__pooled(self, concurrent_):
+        shutil.copy(os.path.join(TESTDATA_DIR, '2476.json'),
+                    self.dirs['GAMES_DIR'])
+        futures_ = concurrent_.futures
+        executor_ = futures_.ProcessPoolExecutor.return_value
+        results = {'2449': True, '2469': False, '2476': Exception()}
+
+        def submit(fn, num, date):
+            future = mock.Mock()
+            if isinstance(results[num], Exception):
+                future.result.side_effect = results[num]
+            else:
+                future.result.return_value = results[num]
+            return future
+
+        executor_.submit.side_effect = submit
+        futures_.as_completed.side_effect = lambda fs: list(fs)
+        hashes = self.hashes()
+        instance = self.create_gameday(_data())
+
+        with mock.patch.object(gameday, '_logger') as logger_:
+            actual = instance._render_data(date=DATE_10260602, processes=4)
+        self.assertRendered(actual, [])
+        self.assertEqual(instance.data, _data({'2449': hashes['2449']}))
+
+        futures_.ProcessPoolExecutor.assert_called_once_with(
+            3,
+            mp_context=mock.ANY,
+            initializer=_init_worker,
+            initargs=(DATE_10260602, ))
+        executor_.submit.assert_has_calls([
+            mock.call(_render_livesim_worker, num, '06:02:30 PDT (1985-10-26)')
+            for num in ['2449', '2469', '2476']
+        ])
+        logger_.log.assert_called_once_with(logging.WARNING,
+                                            'Handled warning.',
+                                            exc_info=True)
+        self.assertNotCalled(self.call_service_)
+
+    def test_render_data__unchanged(self):
+        self.render(['2449', '2469'])
+        hashes = self.hashes()
+        instance = self.create_gameday(_data(dict(hashes, **{'2476': 'b'})))
+
+        actual = instance._render_data(date=DATE_10260602, processes=1)
+        self.assertRendered(actual, [])
+        self.assertEqual(instance.data, _data(hashes))
+        self.write_.assert_called_once_with()
+
+    def test_render_data__versions(self):
+        self.render(['2449', '2469'])
+        hashes = self.hashes()
+        data = _data(hashes)
+        data['manifest']['templates'] = 'c'
+        instance = self.create_gameday(data)
+
+        actual = instance._render_data(date=DATE_10260602, processes=1)
+        self.assertRendered(actual, ['2449', '2469'])
+        self.assertEqual(instance.data, _data(hashes))
+        self.write_.assert_called_once_with()
+
+    @mock.patch.object(gameday, '_hash')
+    def test_get_versions(self, mock_hash):
+        mock_hash.side_effect = ['b', 'c']
+
+        actual = Gameday.get_versions()
+        expected = {'reference': 'a', 'sources': 'b', 'templates': 'c'}
+        self.assertEqual(actual, expected)
+
+        root = re.sub(r'/tasks/gameday', '', _path)
+        sources = mock_hash.call_args_list[0][0][0]
+        for source in [
+                'common/styles/styles.py', 'services/livesim/livesim.py',
+                'types_/event/event.py'
+        ]:
+            self.assertIn(os.path.join(root, source), sources)
+        for source in sources:
+            self.assertTrue(os.path.isfile(source))
+
+    def test_render_data__versions_reference(self):
+        self.render(['2449', '2469'])
+        hashes = self.hashes()
+        instance = self.create_gameday(_data(hashes))
+        self.get_digest_.return_value = 'b'
+
+        actual = instance._render_data(date=DATE_10260602, processes=1)
+        self.assertRendered(actual, ['2449', '2469'])
+        self.assertEqual(instance.data, _data(hashes))
+        self.assertEqual(instance.data['manifest']['reference'], 'b')
+        self.write_.assert_called_once_with()
+
 
 if __name__ in ['__main__', 'tasks.gameday.gameday_test']:
     main(GamedayTest,
@@ -39,6 +39,10 @@ class NewsTest(Test):
         self.addCleanup(open_patch.stop)
         self.open_ = open_patch.start()
 
+        replace_patch = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(replace_patch.stop)
+        self.replace_ = replace_patch.start()
+
     def init_mocks(self, read):
         mo = mock.mock_open(read_data=dumps(read))
         self.open_handle_ = mo()
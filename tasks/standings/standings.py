@@ -18,8 +18,8 @@ from common.datetime_.datetime_ import suffix  # noqa
 from common.dict_.dict_ import merge  # noqa
 from common.elements.elements import dialog  # noqa
 from common.elements.elements import topper  # noqa
+from common.games.games import get_games  # noqa
 from common.io_.io_ import read_data  # noqa
-from common.json_.json_ import loads  # noqa
 from common.re_.re_ import search  # noqa
 from common.record.record import add_records  # noqa
 from common.record.record import decode_record  # noqa
@@ -108,8 +108,7 @@ class Standings(Renderable, Runnable, Serializable):
     def handle_finish(self, **kwargs):
         self.data['finished'] = True
 
-        for name in os.listdir(GAMES_DIR):
-            data = loads(os.path.join(GAMES_DIR, name))
+        for data in get_games().values():
             for team in ['away', 'home']:
                 encoding = data[team + '_team']
 
@@ -99,6 +99,14 @@ class StandingsTest(Test):
         self.addCleanup(open_patch.stop)
         self.open_ = open_patch.start()
 
+        replace_patch = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(replace_patch.stop)
+        self.replace_ = replace_patch.start()
+
+        cache_patch = mock.patch('common.io_.io_._cache', {})
+        self.addCleanup(cache_patch.stop)
+        cache_patch.start()
+
     def init_mocks(self, data):
         mo = mock.mock_open(read_data=dumps(data))
         self.open_handle_ = mo()
@@ -248,16 +256,12 @@ class StandingsTest(Test):
         self.assertNotCalled(self.open_handle_.write)
 
     @mock.patch.object(Standings, '_render')
-    @mock.patch('common.json_.json_.open', create=True)
-    @mock.patch('tasks.standings.standings.os.listdir')
-    def test_handle_finish(self, listdir_, open_, _render_):
-        listdir_.return_value = ['2449.json', '2469.json', '2476.json']
-        suite = Suite(
-            RMock(GAMES_DIR, '2449.json', TESTDATA),
-            RMock(GAMES_DIR, '2469.json', TESTDATA),
-            RMock(GAMES_DIR, '2476.json', TESTDATA),
-        )
-        open_.side_effect = suite.values()
+    @mock.patch('tasks.standings.standings.get_games')
+    def test_handle_finish(self, get_games_, _render_):
+        get_games_.return_value = {
+            num: json.loads(TESTDATA[num + '.json'])
+            for num in ['2449', '2469', '2476']
+        }
 
         table_ = {'T40': '66-58', 'T47': '71-53'}
         standings = self.create_standings(_data(table_=table_))
@@ -1,10 +1,25 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Watches the statsplus channel for ongoing sims and saves their results."""
+"""Watches the statsplus channel for ongoing sims and saves their results.
 
+Extracted box scores can be parsed in a pool of worker processes. Each worker
+records the players that its games reference instead of writing to the
+reference, and the parent puts the merged players once all games are parsed.
+Each game is parsed with its own random number generator, seeded by the game,
+so that the parsed output is identical whether the games are parsed serially
+or in parallel, without reseeding the app's global random number generator.
+
+Scores are saved from the message thread and parsed on the background thread,
+while the data is flushed from the main thread, so every change to the data is
+made under the serializable lock.
+"""
+
+import concurrent.futures
 import datetime
 import logging
+import multiprocessing
 import os
+import random
 import re
 import sys
 import time
@@ -19,14 +34,17 @@ from api.serializable.serializable import Serializable  # noqa
 from common.datetime_.datetime_ import datetime_datetime_pst  # noqa
 from common.datetime_.datetime_ import decode_datetime  # noqa
 from common.datetime_.datetime_ import encode_datetime  # noqa
+from common.games.games import get_games  # noqa
 from common.io_.io_ import read_data  # noqa
 from common.json_.json_ import dumps  # noqa
-from common.json_.json_ import loads  # noqa
 from common.messageable.messageable import messageable  # noqa
 from common.re_.re_ import search  # noqae
 from common.record.record import decode_record  # noqa
 from common.record.record import encode_record  # noqa
+from common.reference.reference import put_players  # noqa
+from common.reference.reference import set_reference  # noqa
 from common.service.service import call_service  # noqa
+from common.service.service import reload_services  # noqa
 from common.slack.slack import channels_history  # noqa
 from common.slack.slack import chat_post_message  # noqa
 from common.subprocess_.subprocess_ import check_output  # noqa
@@ -48,6 +66,40 @@ STATSPLUS_LINK = 'https://statsplus.net/oblootp/reports/news/html'
 STATSPLUS_BOX_SCORES = os.path.join(STATSPLUS_LINK, 'box_scores')
 STATSPLUS_GAME_LOGS = os.path.join(STATSPLUS_LINK, 'game_logs')
 
+PROCESSES = os.cpu_count() or 1
+WRITE_INTERVAL = 30
+
+
+class _Players(object):
+    """Stand-in reference for worker processes, which records put players."""
+
+    def __init__(self):
+        self.encodings = set()
+
+    def put_players(self, encodings):
+        self.encodings.update(encodings)
+
+
+_players = None
+
+
+def _init_worker():
+    global _players
+    _players = _Players()
+    reload_services()
+    set_reference(_players)
+
+
+def _parse_game(fargs):
+    rng = random.Random(os.path.basename(fargs[2]))
+    return call_service('statslab', 'parse_game', fargs, rng=rng)
+
+
+def _parse_game_worker(fargs):
+    _players.encodings.clear()
+    data = _parse_game(fargs)
+    return data is not None, sorted(_players.encodings)
+
 
 class Statsplus(Messageable, Runnable, Serializable):
     def __init__(self, **kwargs):
@@ -55,6 +107,9 @@ class Statsplus(Messageable, Runnable, Serializable):
 
         self.download_end = None
 
+    def _write_interval(self):
+        return WRITE_INTERVAL
+
     def _notify_internal(self, **kwargs):
         # TODO: Fix this, it should be DOWNLOAD_FINISH that triggers updating
         # the download end value.
@@ -104,7 +159,8 @@ class Statsplus(Messageable, Runnable, Serializable):
         if not history['ok']:
             return Response(debug=[Debug(msg=history['error'])])
 
-        self.data['started'] = False
+        with self.lock:
+            self.data['started'] = False
 
         response = Response()
         for message in reversed(history['messages']):
@@ -119,8 +175,9 @@ class Statsplus(Messageable, Runnable, Serializable):
 
     @messageable
     def extract(self, *args, **kwargs):
-        self.data['started'] = False
-        self._write()
+        with self.lock:
+            self.data['started'] = False
+            self._write()
 
         return Response(thread_=[Thread(target='parse_extracted_scores')])
 
@@ -132,26 +189,43 @@ class Statsplus(Messageable, Runnable, Serializable):
         cw, cl = self.get_record(encoding, self.data['table'])
         return encode_record(cw + 1, cl) if win else encode_record(cw, cl + 1)
 
-    def parse_extracted_scores(self, *args, **kwargs):
-        self.data['scores'] = {}
-        self.data['table'] = {}
+    def get_score_fargs(self, num, date):
+        out = os.path.join(GAMES_DIR, num + '.json')
 
         if self.data['started']:
-            self.data['started'] = False
+            box = STATSPLUS_BOX_SCORES + '/game_box_{}.html'.format(num)
+            log = STATSPLUS_GAME_LOGS + '/log_{}.html'.format(num)
         else:
+            box = EXTRACT_BOX_SCORES + '/game_box_{}.html'.format(num)
+            log = EXTRACT_GAME_LOGS + '/log_{}.txt'.format(num)
+
+        return (box, log, out, date)
+
+    def parse_extracted_scores(self, *args, **kwargs):
+        with self.lock:
+            started = self.data['started']
+            self.data['scores'] = {}
+            self.data['started'] = False
+            self.data['table'] = {}
+
+        if not started:
             self.cleanup()
 
+        nums = []
         for name in os.listdir(EXTRACT_BOX_SCORES):
-            num = search(r'\D+(\d+)\.html', name)
-            self.parse_score(num, None)
+            nums.append(search(r'\D+(\d+)\.html', name))
+
+        processes = kwargs.get('processes', PROCESSES)
+        if processes > 1 and len(nums) > 1:
+            self.parse_pooled_scores(sorted(nums), processes)
+        else:
+            for num in nums:
+                self.parse_score(num, None)
 
-        for name in os.listdir(GAMES_DIR):
-            data = loads(os.path.join(GAMES_DIR, name))
-            for team, other in [('away', 'home'), ('home', 'away')]:
-                encoding = data[team + '_team']
-                win = int(data[team + '_runs']) > int(data[other + '_runs'])
-                self.data['table'][encoding] = self.get_next_record(
-                    data, encoding, win)
+        games = get_games()
+        with self.lock:
+            for data in games.values():
+                self.put_record(data)
 
         _logger.log(logging.INFO, 'Download complete.')
         chat_post_message('fairylab', 'Download complete.')
@@ -159,56 +233,76 @@ class Statsplus(Messageable, Runnable, Serializable):
         self._write()
         return Response(notify=[Notify.STATSPLUS_FINISH])
 
+    def parse_pooled_scores(self, nums, processes):
+        fargs = [self.get_score_fargs(num, None) for num in nums]
+        context = multiprocessing.get_context('spawn')
+        executor = concurrent.futures.ProcessPoolExecutor(
+            processes, mp_context=context, initializer=_init_worker)
+
+        encodings = set()
+        progress = 0
+        with executor:
+            results = executor.map(_parse_game_worker, fargs, chunksize=8)
+            for i, (_, players) in enumerate(results, 1):
+                encodings.update(players)
+                if i * 10 // len(fargs) > progress:
+                    progress = i * 10 // len(fargs)
+                    msg = 'Parsed {}/{} box scores.'.format(i, len(fargs))
+                    _logger.log(logging.INFO, msg)
+
+        put_players(sorted(encodings))
+
     def parse_saved_scores(self, date_, *args, **kwargs):
-        if date_ not in self.data['scores']:
-            return Response()
+        with self.lock:
+            if date_ not in self.data['scores']:
+                return Response()
+            scores = sorted(self.data['scores'][date_].items())
 
         unvisited = {}
-        for num, s in sorted(self.data['scores'][date_].items()):
+        for num, s in scores:
             data = self.parse_score(num, date_)
             if data is None:
                 unvisited[num] = s
                 continue
 
-            for team, other in [('away', 'home'), ('home', 'away')]:
-                encoding = data[team + '_team']
-                win = int(data[team + '_runs']) > int(data[other + '_runs'])
-                self.data['table'][encoding] = self.get_next_record(
-                    data, encoding, win)
+            with self.lock:
+                self.put_record(data)
 
         if unvisited:
             thread_ = Thread(target='parse_saved_scores', args=(date_, ))
 
-            if unvisited == self.data['scores'][date_]:
-                return Response(thread_=[thread_])
+            with self.lock:
+                if unvisited == self.data['scores'][date_]:
+                    return Response(thread_=[thread_])
 
-            self.data['scores'][date_] = unvisited
-            self._write()
+                self.data['scores'][date_] = unvisited
+                self._write()
 
             return Response(notify=[Notify.STATSPLUS_PARSE], thread_=[thread_])
 
-        self.data['scores'].pop(date_, None)
-        self._write()
+        with self.lock:
+            self.data['scores'].pop(date_, None)
+            self._write()
         return Response(notify=[Notify.STATSPLUS_PARSE])
 
     def parse_score(self, num, date):
-        out = os.path.join(GAMES_DIR, num + '.json')
+        fargs = self.get_score_fargs(num, date)
 
         # TODO: Remove date check after game log 404 error is fixed.
-        if date is not None and os.path.isfile(out):
+        if date is not None and os.path.isfile(fargs[2]):
             return True
 
-        if self.data['started']:
-            box = STATSPLUS_BOX_SCORES + '/game_box_{}.html'.format(num)
-            log = STATSPLUS_GAME_LOGS + '/log_{}.html'.format(num)
-        else:
-            box = EXTRACT_BOX_SCORES + '/game_box_{}.html'.format(num)
-            log = EXTRACT_GAME_LOGS + '/log_{}.txt'.format(num)
+        return _parse_game(fargs)
 
-        return call_service('statslab', 'parse_game', (box, log, out, date))
+    def put_record(self, data):
+        for team, other in [('away', 'home'), ('home', 'away')]:
+            encoding = data[team + '_team']
+            win = int(data[team + '_runs']) > int(data[other + '_runs'])
+            self.data['table'][encoding] = self.get_next_record(
+                data, encoding, win)
 
     def save_scores(self, date, text):
-        self.data['scores'][date] = {}
+        scores = {}
 
         text = precoding_to_encoding_sub(text)
         for line in text.splitlines():
@@ -216,16 +310,19 @@ class Statsplus(Messageable, Runnable, Serializable):
             if not num:
                 continue
 
-            self.data['scores'][date][num] = s
+            scores[num] = s
 
-        self._write()
+        with self.lock:
+            self.data['scores'][date] = scores
+            self._write()
         thread_ = Thread(target='parse_saved_scores', args=(date, ))
         return Response(notify=[Notify.STATSPLUS_SAVE], thread_=[thread_])
 
     def start(self):
-        self.data['scores'] = {}
-        self.data['started'] = True
-        self.data['table'] = {}
+        with self.lock:
+            self.data['scores'] = {}
+            self.data['started'] = True
+            self.data['table'] = {}
 
         self.cleanup()
 
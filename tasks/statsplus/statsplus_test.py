@@ -2,11 +2,14 @@
 # -*- coding: utf-8 -*-
 """Tests for statsplus.py."""
 
+import concurrent.futures
 import json
 import logging
 import os
+import random
 import re
 import sys
+import time
 import unittest
 import unittest.mock as mock
 
@@ -19,6 +22,8 @@ from common.json_.json_ import dumps  # noqa
 from common.test.test import Test  # noqa
 from common.test.test import get_testdata  # noqa
 from tasks.statsplus.statsplus import Statsplus  # noqa
+from tasks.statsplus.statsplus import _parse_game  # noqa
+from tasks.statsplus.statsplus import _parse_game_worker  # noqa
 from types_.notify.notify import Notify  # noqa
 from types_.response.response import Response  # noqa
 from types_.thread_.thread_ import Thread  # noqa
@@ -57,6 +62,10 @@ class StatsplusTest(Test):
         self.addCleanup(open_patch.stop)
         self.open_ = open_patch.start()
 
+        replace_patch = mock.patch('common.io_.io_.os.replace')
+        self.addCleanup(replace_patch.stop)
+        self.replace_ = replace_patch.start()
+
     def init_mocks(self, data):
         mo = mock.mock_open(read_data=dumps(data))
         self.open_handle_ = mo()
@@ -242,23 +251,22 @@ class StatsplusTest(Test):
                              self.open_handle_.write)
 
     @mock.patch.object(Statsplus, 'parse_score')
-    @mock.patch('tasks.statsplus.statsplus.loads')
+    @mock.patch('tasks.statsplus.statsplus.get_games')
     @mock.patch('tasks.statsplus.statsplus.os.listdir')
     @mock.patch.object(Statsplus, 'cleanup')
     def test_parse_extracted_scores__started_false(self, cleanup_, listdir_,
-                                                   loads_, parse_score_):
+                                                   get_games_, parse_score_):
         listdir_.side_effect = [
             ['game_box_2449.html', 'game_box_2469.html'],
-            ['2449.json', '2469.json'],
-        ]
-        loads_.side_effect = [
-            json.loads(TESTDATA['2449.json']),
-            json.loads(TESTDATA['2469.json'])
         ]
+        get_games_.return_value = {
+            '2449': json.loads(TESTDATA['2449.json']),
+            '2469': json.loads(TESTDATA['2469.json']),
+        }
 
         data = {'scores': {}, 'started': False, 'table': {}}
         statsplus = self.create_statsplus(data)
-        actual = statsplus.parse_extracted_scores()
+        actual = statsplus.parse_extracted_scores(processes=1)
         expected = Response(notify=[Notify.STATSPLUS_FINISH])
         self.assertEqual(actual, expected)
 
@@ -271,14 +279,8 @@ class StatsplusTest(Test):
             }
         }
         cleanup_.assert_called_once_with()
-        listdir_.assert_has_calls([
-            mock.call(EXTRACT_BOX_SCORES),
-            mock.call(GAMES_DIR),
-        ])
-        loads_.assert_has_calls([
-            mock.call(os.path.join(GAMES_DIR, '2449.json')),
-            mock.call(os.path.join(GAMES_DIR, '2469.json'))
-        ])
+        listdir_.assert_called_once_with(EXTRACT_BOX_SCORES)
+        get_games_.assert_called_once_with()
         parse_score_.assert_has_calls([
             mock.call('2449', None),
             mock.call('2469', None),
@@ -289,23 +291,22 @@ class StatsplusTest(Test):
         self.open_handle_.write.assert_called_once_with(dumps(write) + '\n')
 
     @mock.patch.object(Statsplus, 'parse_score')
-    @mock.patch('tasks.statsplus.statsplus.loads')
+    @mock.patch('tasks.statsplus.statsplus.get_games')
     @mock.patch('tasks.statsplus.statsplus.os.listdir')
     @mock.patch.object(Statsplus, 'cleanup')
     def test_parse_extracted_scores__started_true(self, cleanup_, listdir_,
-                                                  loads_, parse_score_):
+                                                  get_games_, parse_score_):
         listdir_.side_effect = [
             ['game_box_2449.html', 'game_box_2469.html'],
-            ['2449.json', '2469.json'],
-        ]
-        loads_.side_effect = [
-            json.loads(TESTDATA['2449.json']),
-            json.loads(TESTDATA['2469.json'])
         ]
+        get_games_.return_value = {
+            '2449': json.loads(TESTDATA['2449.json']),
+            '2469': json.loads(TESTDATA['2469.json']),
+        }
 
         data = {'scores': {}, 'started': True, 'table': {}}
         statsplus = self.create_statsplus(data)
-        actual = statsplus.parse_extracted_scores()
+        actual = statsplus.parse_extracted_scores(processes=1)
         expected = Response(notify=[Notify.STATSPLUS_FINISH])
         self.assertEqual(actual, expected)
 
@@ -317,14 +318,8 @@ class StatsplusTest(Test):
                 'T47': '2-0'
             }
         }
-        listdir_.assert_has_calls([
-            mock.call(EXTRACT_BOX_SCORES),
-            mock.call(GAMES_DIR),
-        ])
-        loads_.assert_has_calls([
-            mock.call(os.path.join(GAMES_DIR, '2449.json')),
-            mock.call(os.path.join(GAMES_DIR, '2469.json'))
-        ])
+        listdir_.assert_called_once_with(EXTRACT_BOX_SCORES)
+        get_games_.assert_called_once_with()
         parse_score_.assert_has_calls([
             mock.call('2449', None),
             mock.call('2469', None),
@@ -335,6 +330,108 @@ class StatsplusTest(Test):
         self.open_handle_.write.assert_called_once_with(dumps(write) + '\n')
         self.assertNotCalled(cleanup_)
 
+    @mock.patch('tasks.statsplus.statsplus.put_players')
+    @mock.patch('tasks.statsplus.statsplus.concurrent.futures')
+    @mock.patch('tasks.statsplus.statsplus.get_games')
+    @mock.patch('tasks.statsplus.statsplus.os.listdir')
+    @mock.patch.object(Statsplus, 'cleanup')
+    def test_parse_extracted_scores__pooled(self, cleanup_, listdir_,
+                                            get_games_, futures_,
+                                            put_players_):
+        listdir_.side_effect = [
+            ['game_box_2469.html', 'game_box_2449.html'],
+        ]
+        get_games_.return_value = {
+            '2449': json.loads(TESTDATA['2449.json']),
+            '2469': json.loads(TESTDATA['2469.json']),
+        }
+        executor_ = futures_.ProcessPoolExecutor.return_value
+        executor_.map.return_value = [
+            (True, ['P1', 'P2']),
+            (True, ['P2', 'P3']),
+        ]
+
+        data = {'scores': {}, 'started': False, 'table': {}}
+        statsplus = self.create_statsplus(data)
+        actual = statsplus.parse_extracted_scores(processes=2)
+        expected = Response(notify=[Notify.STATSPLUS_FINISH])
+        self.assertEqual(actual, expected)
+
+        write = {
+            'scores': {},
+            'started': False,
+            'table': {
+                'T40': '0-2',
+                'T47': '2-0'
+            }
+        }
+        box = os.path.join(EXTRACT_BOX_SCORES, 'game_box_{}.html')
+        log = os.path.join(EXTRACT_GAME_LOGS, 'log_{}.txt')
+        out = os.path.join(GAMES_DIR, '{}.json')
+        fargs = [(box.format(n), log.format(n), out.format(n), None)
+                 for n in ['2449', '2469']]
+        executor_.map.assert_called_once_with(
+            _parse_game_worker, fargs, chunksize=8)
+        put_players_.assert_called_once_with(['P1', 'P2', 'P3'])
+        self.chat_post_message_.assert_called_once_with(
+            'fairylab', 'Download complete.')
+        self.log_.assert_has_calls([
+            mock.call(logging.INFO, 'Parsed 1/2 box scores.'),
+            mock.call(logging.INFO, 'Parsed 2/2 box scores.'),
+            mock.call(logging.INFO, 'Download complete.'),
+        ])
+        self.open_handle_.write.assert_called_once_with(dumps(write) + '\n')
+
+    @mock.patch('tasks.statsplus.statsplus.call_service')
+    @mock.patch('tasks.statsplus.statsplus._players')
+    def test_parse_game_worker(self, players_, call_service_):
+        def fake_parse_game(*args, **kwargs):
+            players_.encodings.update(['P2', 'P1'])
+            return {}
+
+        players_.encodings = {'P3'}
+        call_service_.side_effect = fake_parse_game
+
+        box = os.path.join(EXTRACT_BOX_SCORES, 'game_box_2449.html')
+        log = os.path.join(EXTRACT_GAME_LOGS, 'log_2449.txt')
+        out = os.path.join(GAMES_DIR, '2449.json')
+        actual = _parse_game_worker((box, log, out, None))
+        self.assertEqual(actual, (True, ['P1', 'P2']))
+
+        call_service_.assert_called_once_with('statslab',
+                                              'parse_game',
+                                              (box, log, out, None),
+                                              rng=mock.ANY)
+        rng = call_service_.call_args[1]['rng']
+        self.assertEqual(rng.getstate(), random.Random('2449.json').getstate())
+
+    @mock.patch('tasks.statsplus.statsplus.call_service')
+    def test_parse_game__pooled(self, call_service_):
+        def fake_parse_game(service, method, fargs, rng=random):
+            time.sleep(rng.random() / 100)
+            return [rng.random() for _ in range(3)]
+
+        call_service_.side_effect = fake_parse_game
+
+        fargs = []
+        for num in ['2449', '2469', '2476', '23520', '23766', '23769']:
+            box = os.path.join(EXTRACT_BOX_SCORES, 'game_box_{}.html')
+            log = os.path.join(EXTRACT_GAME_LOGS, 'log_{}.txt')
+            out = os.path.join(GAMES_DIR, '{}.json')
+            fargs.append((box.format(num), log.format(num), out.format(num),
+                          None))
+
+        random.seed(0)
+        expected = random.random()
+
+        serial = [_parse_game(f) for f in fargs]
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            pooled = list(executor.map(_parse_game, reversed(fargs)))
+        self.assertEqual(serial, list(reversed(pooled)))
+
+        random.seed(0)
+        self.assertEqual(random.random(), expected)
+
     @mock.patch.object(Statsplus, 'parse_score')
     def test_parse_saved_scores__none(self, parse_score_):
         parse_score_.return_value = None
@@ -406,8 +503,10 @@ class StatsplusTest(Test):
         box = os.path.join(EXTRACT_BOX_SCORES, 'game_box_2449.html')
         log = os.path.join(EXTRACT_GAME_LOGS, 'log_2449.txt')
         out = os.path.join(GAMES_DIR, '2449.json')
-        call_service_.assert_called_once_with('statslab', 'parse_game',
-                                              (box, log, out, date))
+        call_service_.assert_called_once_with('statslab',
+                                              'parse_game',
+                                              (box, log, out, date),
+                                              rng=mock.ANY)
         isfile_.assert_called_once_with(out)
         self.assertNotCalled(self.chat_post_message_, self.log_,
                              self.open_handle_.write)
@@ -427,8 +526,10 @@ class StatsplusTest(Test):
         box = os.path.join(STATSPLUS_BOX_SCORES, 'game_box_2449.html')
         log = os.path.join(STATSPLUS_GAME_LOGS, 'log_2449.html')
         out = os.path.join(GAMES_DIR, '2449.json')
-        call_service_.assert_called_once_with('statslab', 'parse_game',
-                                              (box, log, out, date))
+        call_service_.assert_called_once_with('statslab',
+                                              'parse_game',
+                                              (box, log, out, date),
+                                              rng=mock.ANY)
         isfile_.assert_called_once_with(out)
         self.assertNotCalled(self.chat_post_message_, self.log_,
                              self.open_handle_.write)
@@ -448,8 +549,10 @@ class StatsplusTest(Test):
         box = os.path.join(EXTRACT_BOX_SCORES, 'game_box_2449.html')
         log = os.path.join(EXTRACT_GAME_LOGS, 'log_2449.txt')
         out = os.path.join(GAMES_DIR, '2449.json')
-        call_service_.assert_called_once_with('statslab', 'parse_game',
-                                              (box, log, out, date))
+        call_service_.assert_called_once_with('statslab',
+                                              'parse_game',
+                                              (box, log, out, date),
+                                              rng=mock.ANY)
         isfile_.assert_called_once_with(out)
         self.assertNotCalled(self.chat_post_message_, self.log_,
                              self.open_handle_.write)
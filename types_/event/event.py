@@ -1,13 +1,30 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Data (non-reloadable) object for game event codes."""
+"""Data (non-reloadable) object for game event codes.
 
+A game's events are stored either as a list of encoded strings, or packed. The
+packed form interns the event names and arguments into two space-separated
+tables. Each distinct event is stored once as an entry, which is a run of
+indices into those tables (the name, the argument count, then the arguments),
+and the game is stored as a run of indices into the entries. The runs are
+little-endian 16-bit arrays, base64 encoded. The packed form carries a version
+number, so that older game files can still be read if the layout changes.
+
+Unpacked events which are equal share the same argument list, which must
+therefore not be modified.
+"""
+
+import array
+import base64
 import logging
+import sys
 from enum import IntEnum
 from enum import auto
 
 _logger = logging.getLogger('filefairy')
 
+PACK_VERSION = 1
+
 
 def _transform(s):
     if s in ['first', 'First', '1st']:
@@ -22,6 +39,41 @@ def _transform(s):
     return s
 
 
+def _decode_codes(s):
+    codes = array.array('H')
+    codes.frombytes(base64.b64decode(s))
+    if sys.byteorder == 'big':
+        codes.byteswap()
+    return codes
+
+
+def _encode_codes(codes):
+    if sys.byteorder == 'big':
+        codes.byteswap()
+    return base64.b64encode(codes.tobytes()).decode('ascii')
+
+
+def _unpack(packed):
+    version = packed.get('version')
+    if version != PACK_VERSION:
+        msg = 'Unsupported packed events version {}.'.format(version)
+        _logger.log(logging.WARNING, msg)
+        return [], []
+
+    names = packed['names'].split(' ')
+    args = packed['args'].split(' ')
+
+    entries = []
+    codes = _decode_codes(packed['entries'])
+    i, n = 0, len(codes)
+    while i < n:
+        j = i + 2 + codes[i + 1]
+        entries.append((names[codes[i]], [args[k] for k in codes[i + 2:j]]))
+        i = j
+
+    return entries, _decode_codes(packed['codes'])
+
+
 class Event(IntEnum):
     """Describe a number of different types of events that happen in a game.
 
@@ -136,5 +188,84 @@ class Event(IntEnum):
             _logger.log(logging.WARNING, 'Handled warning.', exc_info=True)
             return (None, [])
 
+    @classmethod
+    def decode_all(cls, events):
+        """Decodes a game's events, whether packed or not.
+
+        Args:
+            events: The list of encoded events, or the packed events.
+
+        Returns:
+            The list of decoded (event, args) pairs.
+        """
+        if isinstance(events, dict):
+            return cls.unpack(events)
+        return [cls.decode(encoding) for encoding in events]
+
     def encode(self, *args):
         return ' '.join([self.name.lower()] + [_transform(s) for s in args])
+
+    @classmethod
+    def pack(cls, encodings):
+        """Packs a list of encoded events.
+
+        An empty list is returned as is, so that it remains falsy.
+
+        Args:
+            encodings: The list of encoded events.
+
+        Returns:
+            The packed events.
+        """
+        if not encodings:
+            return []
+
+        names, args, entries = {}, {}, {}
+        codes, entry_codes = array.array('H'), array.array('H')
+        for encoding in encodings:
+            if encoding not in entries:
+                entries[encoding] = len(entries)
+                name, *tokens = encoding.split(' ')
+                entry_codes.append(names.setdefault(name, len(names)))
+                entry_codes.append(len(tokens))
+                entry_codes.extend(
+                    args.setdefault(t, len(args)) for t in tokens)
+            codes.append(entries[encoding])
+
+        return {
+            'args': ' '.join(args),
+            'codes': _encode_codes(codes),
+            'entries': _encode_codes(entry_codes),
+            'names': ' '.join(names),
+            'version': PACK_VERSION,
+        }
+
+    @classmethod
+    def unpack(cls, packed):
+        """Unpacks packed events into decoded (event, args) pairs.
+
+        Args:
+            packed: The packed events.
+
+        Returns:
+            The list of decoded (event, args) pairs.
+        """
+        entries, codes = _unpack(packed)
+        names = set(name for name, _ in entries)
+        events = {name: cls.decode(name)[0] for name in names}
+        decoded = [(events[name], args) for name, args in entries]
+        return [decoded[i] for i in codes]
+
+    @classmethod
+    def unpack_encodings(cls, packed):
+        """Unpacks packed events into a list of encoded events.
+
+        Args:
+            packed: The packed events.
+
+        Returns:
+            The list of encoded events.
+        """
+        entries, codes = _unpack(packed)
+        encodings = [' '.join([name] + args) for name, args in entries]
+        return [encodings[i] for i in codes]
@@ -14,6 +14,14 @@ sys.path.append(re.sub(r'/types_/event', '', _path))
 
 from types_.event.event import Event  # noqa
 
+ENCODINGS = [
+    'change_batter P24322',
+    'pitcher_ball',
+    'batter_single F 7LD',
+    'pitcher_ball',
+    'change_inning 0 1',
+]
+
 
 class EventTest(unittest.TestCase):
     def setUp(self):
@@ -37,6 +45,23 @@ class EventTest(unittest.TestCase):
                                               'Handled warning.',
                                               exc_info=True)
 
+    def test_decode_all__encodings(self):
+        actual = Event.decode_all(ENCODINGS[:2])
+        expected = [
+            (Event.CHANGE_BATTER, ['P24322']),
+            (Event.PITCHER_BALL, []),
+        ]
+        self.assertEqual(actual, expected)
+
+        self.mock_log.assert_not_called()
+
+    def test_decode_all__packed(self):
+        actual = Event.decode_all(Event.pack(ENCODINGS))
+        expected = [Event.decode(e) for e in ENCODINGS]
+        self.assertEqual(actual, expected)
+
+        self.mock_log.assert_not_called()
+
     def test_decode__member(self):
         actual = Event.decode('change_inning')
         expected = (Event.CHANGE_INNING, [])
@@ -58,6 +83,42 @@ class EventTest(unittest.TestCase):
 
         self.mock_log.assert_not_called()
 
+    def test_pack(self):
+        actual = Event.pack(ENCODINGS)
+        expected = {
+            'args': 'P24322 F 7LD 0 1',
+            'codes': 'AAABAAIAAQADAA==',
+            'entries': 'AAABAAAAAQAAAAIAAgABAAIAAwACAAMABAA=',
+            'names': 'change_batter pitcher_ball batter_single change_inning',
+            'version': 1,
+        }
+        self.assertEqual(actual, expected)
+
+        self.mock_log.assert_not_called()
+
+    def test_pack__empty(self):
+        actual = Event.pack([])
+        expected = []
+        self.assertEqual(actual, expected)
+
+        self.mock_log.assert_not_called()
+
+    def test_unpack__version(self):
+        packed = dict(Event.pack(ENCODINGS), version=0)
+        actual = Event.unpack(packed)
+        expected = []
+        self.assertEqual(actual, expected)
+
+        self.mock_log.assert_called_once_with(
+            logging.WARNING, 'Unsupported packed events version 0.')
+
+    def test_unpack_encodings(self):
+        actual = Event.unpack_encodings(Event.pack(ENCODINGS))
+        expected = ENCODINGS
+        self.assertEqual(actual, expected)
+
+        self.mock_log.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()